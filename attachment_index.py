@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Indice degli allegati di Obsidian costruito con un'unica visita ricorsiva
+(os.scandir) della cartella degli allegati. Ogni nome di file è associato
+al suo percorso e al suo stat, così la ricerca degli embed non richiede
+un os.path.exists per immagine e trova anche gli allegati nelle sottocartelle.
+I link con percorso possono essere relativi alla cartella degli allegati,
+alla radice del vault (99 - Meta/Clipboard/...) o alla nota (../99 - Meta/...).
+"""
+
+import os
+import posixpath
+from collections import namedtuple
+
+# Allegato trovato: percorso assoluto, percorso relativo alla radice e stat
+Attachment = namedtuple("Attachment", ["path", "relpath", "stat"])
+
+def _shortest_first(attachment):
+    """Ordina come Obsidian: percorso più breve, poi ordine alfabetico."""
+    return attachment.relpath.count("/"), len(attachment.relpath), attachment.relpath
+
+def find_vault_dir(path):
+    """Radice del vault di Obsidian che contiene path (la cartella con .obsidian), o None."""
+    directory = os.path.abspath(path)
+    while True:
+        if os.path.isdir(os.path.join(directory, ".obsidian")):
+            return directory
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+class AttachmentIndex:
+    """Allegati indicizzati per nome del file."""
+
+    def __init__(self, root, vault_dir=None):
+        self.root = root
+        # Percorso della cartella degli allegati dalla radice del vault (es. "99 - Meta/Clipboard")
+        vault_dir = vault_dir or find_vault_dir(root)
+        self.vault_prefix = None
+        if vault_dir is not None:
+            prefix = os.path.relpath(os.path.abspath(root), os.path.abspath(vault_dir)).replace(os.sep, "/")
+            if prefix != "." and not prefix.startswith(".."):
+                self.vault_prefix = prefix
+        self.by_name = {}
+        self.scanned_dirs = 0
+        if os.path.isdir(root):
+            self._scan()
+        for candidates in self.by_name.values():
+            candidates.sort(key=_shortest_first)
+
+    def _scan(self):
+        """Visita ricorsiva della radice, ignorando file e cartelle nascosti."""
+        pending = [(self.root, "")]
+        while pending:
+            directory, prefix = pending.pop()
+            self.scanned_dirs += 1
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    relpath = prefix + entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, relpath + "/"))
+                    elif entry.is_file():
+                        attachment = Attachment(entry.path, relpath, entry.stat())
+                        self.by_name.setdefault(entry.name, []).append(attachment)
+
+    def resolve(self, link):
+        """
+        Risolve il link di un embed come Obsidian: un nome semplice indica
+        l'allegato con quel nome più vicino alla radice; un link con '/'
+        indica l'allegato il cui percorso termina con quel link.
+        Nei link con percorso './' e '../' vengono normalizzati e il percorso
+        della cartella degli allegati dalla radice del vault viene rimosso.
+        Restituisce un Attachment o None.
+        """
+        link = link.strip()
+        qualified = "/" in link
+        if qualified:
+            # I '..' iniziali risalgono dalla nota verso la radice del vault
+            parts = posixpath.normpath(link).split("/")
+            link = "/".join(part for part in parts if part not in ("", ".", ".."))
+            if self.vault_prefix and link.startswith(self.vault_prefix + "/"):
+                link = link[len(self.vault_prefix) + 1:]
+        candidates = self.by_name.get(os.path.basename(link))
+        if not candidates:
+            return None
+        if not qualified:
+            return candidates[0]
+        for attachment in candidates:
+            if attachment.relpath == link or attachment.relpath.endswith("/" + link):
+                return attachment
+        return None
+
+    def __len__(self):
+        return sum(len(candidates) for candidates in self.by_name.values())
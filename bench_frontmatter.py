@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark dei tre percorsi di analisi del front matter di frontmatter.py:
+parser veloce per mapping piatti, yaml.CSafeLoader e yaml.SafeLoader.
+Verifica anche che i tre percorsi producano risultati identici.
+
+Uso: python3 bench_frontmatter.py [cartella con file .md] [--repeat N]
+"""
+
+import argparse
+import os
+import time
+
+import yaml
+
+from frontmatter import CSafeLoader, parse_flat_yaml, read_front_matter_block
+
+# Front matter di esempio usati se non viene indicata una cartella
+SAMPLE_FRONT_MATTERS = [
+    'title: "BlogPost - 20250703"\ndate: 2025-07-03\ndraft: false\nlanguage: it\nimage: Pasted image 20250703225820.png\ntags: ["obsidian", "hugo"]\ncategories:\n  - Blog',
+    "title: First Post\ndate: 2025-06-13 12:00:00\ndraft: true\nlang: en\ntags:\n- test\n- blog",
+    "title: 'Note veloci'\ndescription: Appunti sparsi su Python e C#\nweight: 3\nmath: true",
+]
+
+def collect_front_matters(directory):
+    """Estrae i blocchi di front matter da tutti i file .md di una cartella."""
+    blocks = []
+    for root, _, files in os.walk(directory):
+        for filename in files:
+            if filename.endswith(".md"):
+                block = read_front_matter_block(os.path.join(root, filename))
+                if block is not None:
+                    blocks.append(block)
+    return blocks
+
+def time_path(name, parse, blocks, repeat):
+    """Esegue un percorso di analisi su tutti i blocchi e restituisce i secondi impiegati."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for block in blocks:
+            parse(block)
+    elapsed = time.perf_counter() - start
+    per_block = elapsed / (repeat * len(blocks)) * 1e6
+    print(f"   {name:<12} {elapsed:8.3f}s  ({per_block:7.1f} µs/front matter)")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del parser del front matter')
+    parser.add_argument('directory', nargs='?', help='Cartella con i file markdown da analizzare')
+    parser.add_argument('--repeat', type=int, default=2000, help='Numero di ripetizioni')
+    args = parser.parse_args()
+    
+    blocks = collect_front_matters(args.directory) if args.directory else SAMPLE_FRONT_MATTERS
+    if not blocks:
+        print("❌ No front matter found")
+        return False
+    
+    fast_blocks = [block for block in blocks if parse_flat_yaml(block) is not None]
+    print(f"📊 {len(blocks)} front matter, {len(fast_blocks)} handled by the fast parser")
+    
+    # I tre percorsi devono produrre lo stesso risultato
+    for block in blocks:
+        expected = yaml.safe_load(block)
+        fast = parse_flat_yaml(block)
+        if fast is not None and fast != expected:
+            print(f"❌ Fast parser mismatch:\n{block}")
+            return False
+        if CSafeLoader is not None and yaml.load(block, Loader=CSafeLoader) != expected:
+            print(f"❌ CSafeLoader mismatch:\n{block}")
+            return False
+    print("✅ Results identical across parsers")
+    
+    print(f"\n⏱️  {args.repeat} repetitions:")
+    if fast_blocks:
+        time_path("fast", parse_flat_yaml, fast_blocks, args.repeat)
+    if CSafeLoader is not None:
+        time_path("CSafeLoader", lambda block: yaml.load(block, Loader=CSafeLoader), fast_blocks or blocks, args.repeat)
+    else:
+        print("   CSafeLoader  not available (PyYAML built without libyaml)")
+    time_path("SafeLoader", yaml.safe_load, fast_blocks or blocks, args.repeat)
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
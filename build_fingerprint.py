@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Impronta degli input della generazione del sito.
+
+Calcola un hash unico sul contenuto di content/, della configurazione di Hugo,
+di assets/, static/, layouts/ (e delle altre cartelle che Hugo legge) e del
+tema. Dopo una generazione riuscita l'impronta viene salvata: se alla
+pubblicazione successiva non è cambiata, la pipeline non rigenera il sito e
+non crea un commit. Per non rileggere ogni volta tutti i file, l'hash di un
+file viene riusato finché la sua firma (dimensione, mtime) non cambia.
+"""
+
+import argparse
+import hashlib
+import os
+from datetime import datetime
+
+import site_gc
+from fileutils import file_digest, load_json, save_json, stat_signature
+
+# Percorsi
+HUGO_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog"
+BUILD_FINGERPRINT_FILE = "/Users/lorenzo/Documents/GitHub/LolloBlog/.buildfingerprint.json"
+
+BUILD_FINGERPRINT_VERSION = 1
+
+# Cartelle e file letti da Hugo (quelli assenti vengono ignorati)
+INPUT_DIRS = ("content", "assets", "static", "layouts", "i18n", "data", "config")
+CONFIG_FILES = ("hugo.yaml", "hugo.yml", "hugo.toml", "hugo.json", "config.yaml", "config.yml",
+                "config.toml", "config.json")
+
+# Percorsi riportati nel motivo di una nuova generazione
+REASON_EXAMPLES = 3
+
+def theme_dirs(hugo_dir, config=None):
+    """Cartelle dei temi usati dal sito (themesDir/<tema>), relative a hugo_dir."""
+    config = site_gc.load_site_config(hugo_dir) if config is None else config
+    themes = site_gc.config_value(config, "theme") or []
+    if isinstance(themes, str):
+        themes = [themes]
+    themes_dir = str(site_gc.config_value(config, "themesDir") or "themes")
+    return [os.path.join(themes_dir, str(theme)) for theme in themes]
+
+def input_roots(hugo_dir, config=None):
+    """File e cartelle da includere nell'impronta, relativi a hugo_dir."""
+    return list(CONFIG_FILES) + list(INPUT_DIRS) + theme_dirs(hugo_dir, config)
+
+def hash_tree(root_dir, roots, previous=None):
+    """
+    Hash dei file sotto i percorsi indicati (relativi a root_dir), esclusi i
+    file e le cartelle nascosti (.git, .DS_Store, ...). previous è il risultato
+    di una scansione precedente: i file con la stessa firma non vengono riletti.
+    Restituisce {percorso relativo: {size, mtime_ns, hash}}.
+    """
+    previous = previous or {}
+    files = {}
+
+    def add(path, st):
+        rel = os.path.relpath(path, root_dir).replace(os.sep, "/")
+        entry = previous.get(rel)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            files[rel] = entry
+        else:
+            files[rel] = {**stat_signature(st), "hash": file_digest(path)}
+
+    for root in roots:
+        path = os.path.join(root_dir, root)
+        if os.path.isfile(path):
+            add(path, os.stat(path))
+            continue
+        for directory, dirs, names in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for name in sorted(names):
+                if not name.startswith("."):
+                    file_path = os.path.join(directory, name)
+                    add(file_path, os.stat(file_path))
+    return files
+
+def fingerprint(files):
+    """Hash unico dei percorsi e dei contenuti di una scansione."""
+    digest = hashlib.sha256()
+    for rel in sorted(files):
+        digest.update(f"{rel}\0{files[rel]['hash']}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+def diff_files(old, new):
+    """Percorsi aggiunti, modificati e rimossi tra due scansioni."""
+    added = sorted(new.keys() - old.keys())
+    removed = sorted(old.keys() - new.keys())
+    modified = sorted(rel for rel in new.keys() & old.keys() if new[rel]["hash"] != old[rel]["hash"])
+    return added, modified, removed
+
+def load_state(path=None):
+    """Ultima generazione riuscita: {version, fingerprint, built_at, files}, o None."""
+    data = load_json(path or BUILD_FINGERPRINT_FILE)
+    if not isinstance(data, dict) or data.get("version") != BUILD_FINGERPRINT_VERSION:
+        return None
+    return data
+
+def save_state(state, path=None):
+    """Registra una generazione riuscita."""
+    save_json(path or BUILD_FINGERPRINT_FILE, state)
+
+def _describe(label, paths):
+    """Es. '2 modified (content/it/post/a/index.md, hugo.yaml)'."""
+    examples = ", ".join(paths[:REASON_EXAMPLES]) + (", ..." if len(paths) > REASON_EXAMPLES else "")
+    return f"{len(paths)} {label} ({examples})"
+
+def check_build(hugo_dir=None, state_path=None):
+    """
+    Confronta gli input attuali con l'ultima generazione riuscita.
+    Restituisce (serve una nuova generazione, motivo, nuovo stato da salvare a generazione riuscita).
+    """
+    hugo_dir = hugo_dir or HUGO_DIR
+    previous = load_state(state_path)
+    files = hash_tree(hugo_dir, input_roots(hugo_dir), previous["files"] if previous else None)
+    state = {
+        "version": BUILD_FINGERPRINT_VERSION,
+        "fingerprint": fingerprint(files),
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "files": files,
+    }
+
+    if previous is None:
+        return True, "no previous successful build recorded", state
+    if not os.path.isdir(os.path.join(hugo_dir, "public")):
+        return True, "public/ is missing", state
+    if previous["fingerprint"] == state["fingerprint"]:
+        return False, (f"inputs unchanged since the build of {previous['built_at']} "
+                       f"(fingerprint {state['fingerprint'][:12]}, {len(files)} files)"), state
+
+    added, modified, removed = diff_files(previous["files"], files)
+    changes = [_describe(label, paths) for label, paths in
+               (("added", added), ("modified", modified), ("removed", removed)) if paths]
+    return True, "inputs changed: " + "; ".join(changes), state
+
+def main():
+    parser = argparse.ArgumentParser(description="Controlla se gli input del sito sono cambiati dall'ultima generazione")
+    parser.parse_args()
+
+    needed, reason, _ = check_build()
+    print(f"{'🔨 Build needed' if needed else '⏭️  Build not needed'}: {reason}")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
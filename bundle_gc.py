@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Rimozione delle immagini rimaste nei page bundle ma non più referenziate
+da index.md (embed eliminati o rinominati nella nota). I riferimenti sono
+quelli raccolti dalla riscrittura degli embed, le immagini del front matter e
+ogni altro riferimento locale del corpo: link e immagini markdown, definizioni
+di riferimento ([ref]: file.png), link di Obsidian [[file.png]] e attributi
+src/href. Nel dubbio un file viene tenuto.
+In modalità dry-run i file vengono solo elencati con lo spazio recuperabile.
+"""
+
+import os
+import re
+import threading
+from urllib.parse import unquote
+
+from embeds import CODE_REGEX, IMAGE_EXTENSION_REGEX, REMOTE_REGEX, bundle_name
+from fileutils import format_bytes
+
+# Destinazioni locali nel corpo di un post
+REFERENCE_REGEXES = (
+    # Link e immagini inline: [testo](file) e ![alt](file "titolo")
+    re.compile(r'\]\(\s*(?:<([^>\n]+)>|([^)\s]+))'),
+    # Definizioni dei riferimenti: [ref]: file "titolo"
+    re.compile(r'^[ \t]{0,3}\[[^\]\n]+\]:[ \t]*(?:<([^>\n]+)>|(\S+))', re.MULTILINE),
+    # Link e embed di Obsidian: [[file]], ![[file|400]], [[file#sezione]]
+    re.compile(r'\[\[([^\]|#\n]+)'),
+    # Attributi HTML e parametri degli shortcode
+    re.compile(r'\b(?:src|href)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE),
+)
+# srcset: più file separati da virgole, ognuno con il suo descrittore (480w, 2x)
+SRCSET_REGEX = re.compile(r'\bsrcset\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+SRCSET_SEPARATOR_REGEX = re.compile(r'\s+\S+\s*(?:,\s*|$)')
+
+def _local_names(link):
+    """Nome del file referenziato (come scritto e come nome nel bundle), o nessuno se remoto."""
+    link = unquote(link.strip().split("#")[0].split("?")[0])
+    if not link or REMOTE_REGEX.match(link):
+        return set()
+    return {os.path.basename(link), bundle_name(link)} - {""}
+
+def local_references(body):
+    """
+    Nomi dei file locali referenziati dal corpo di un post (codice escluso),
+    sia come scritti sia come nome nel bundle (spazi sostituiti da trattini).
+    """
+    text = CODE_REGEX.sub("", body)
+    names = set()
+    for regex in REFERENCE_REGEXES:
+        for match in regex.finditer(text):
+            for link in filter(None, match.groups()):
+                names.update(_local_names(link))
+    for match in SRCSET_REGEX.finditer(text):
+        for link in SRCSET_SEPARATOR_REGEX.split(match.group(1) or match.group(2) or ""):
+            names.update(_local_names(link))
+    return names
+
+class AssetGC:
+    """Raccolta delle immagini orfane nei bundle, condivisibile tra thread."""
+
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.removed_files = 0
+        self.removed_bytes = 0
+        self._lock = threading.Lock()
+
+    def orphaned_assets(self, bundle_dir, referenced):
+        """
+        Elenca le immagini del bundle (nome, dimensione) non presenti in referenced.
+        Il confronto ignora maiuscole e minuscole, come il filesystem di macOS.
+        """
+        keep = {name.casefold() for name in referenced}
+        orphans = []
+        with os.scandir(bundle_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_file(follow_symlinks=False):
+                    continue
+                if not IMAGE_EXTENSION_REGEX.search(entry.name) or entry.name.casefold() in keep:
+                    continue
+                orphans.append((entry.name, entry.stat().st_size))
+        return sorted(orphans)
+
+    def sweep(self, bundle_dir, referenced, log=print):
+        """Rimuove (o in dry-run elenca) le immagini orfane di un bundle; restituisce i nomi."""
+        orphans = self.orphaned_assets(bundle_dir, referenced)
+        for name, size in orphans:
+            if self.dry_run:
+                log(f"  🧹 Would remove orphaned image: {name} ({format_bytes(size)})")
+            else:
+                os.remove(os.path.join(bundle_dir, name))
+                log(f"  🧹 Removed orphaned image: {name} ({format_bytes(size)})")
+        with self._lock:
+            self.removed_files += len(orphans)
+            self.removed_bytes += sum(size for _, size in orphans)
+        return [name for name, _ in orphans]
+
+    def report(self):
+        """Stampa il riepilogo dello spazio recuperato (o recuperabile in dry-run)."""
+        verb = "would be reclaimed" if self.dry_run else "reclaimed"
+        print(f"🧹 Orphaned images: {self.removed_files}, {format_bytes(self.removed_bytes)} {verb}")
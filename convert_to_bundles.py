@@ -9,6 +9,9 @@ import shutil
 import yaml
 import re
 
+import vault_catalog
+from frontmatter import load_yaml
+
 # Percorsi
 HUGO_POSTS_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog/content/posts"
 
@@ -20,50 +23,41 @@ def parse_front_matter(content):
     match = re.match(FRONT_MATTER_REGEX, content, re.DOTALL)
     if match:
         try:
-            front_matter = yaml.safe_load(match.group(1)) or {}
+            front_matter = load_yaml(match.group(1)) or {}
             return front_matter
         except yaml.YAMLError as e:
             print(f"❌ Error parsing YAML front matter: {e}")
             return {}
     return {}
 
-def convert_to_page_bundles():
+def convert_to_page_bundles(catalog=None):
     """Converte i file markdown singoli in page bundles."""
     if not os.path.exists(HUGO_POSTS_DIR):
         print(f"⚠️  Directory not found: {HUGO_POSTS_DIR}")
         return False
     
+    catalog = catalog or vault_catalog.get_catalog()
     converted_count = 0
     
     print(f"🔄 Converting markdown files to page bundles in: {HUGO_POSTS_DIR}")
     
-    for filename in os.listdir(HUGO_POSTS_DIR):
-        if not filename.endswith(".md"):
-            continue
-            
-        if filename.startswith('.'):
+    for record in catalog.posts_in(HUGO_POSTS_DIR):
+        # Salta i bundle già convertiti
+        if record.is_bundle:
             continue
         
-        file_path = os.path.join(HUGO_POSTS_DIR, filename)
-        
-        # Skip se non è un file
-        if not os.path.isfile(file_path):
-            continue
+        filename = os.path.basename(record.path)
+        file_path = record.path
         
         print(f"📝 Converting: {filename}")
         
-        # Leggi il contenuto del file
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        
         # Controlla se è draft
-        front_matter = parse_front_matter(content)
-        if front_matter.get('draft', False):
+        if record.draft:
             print(f"  ⏭️  Skipping draft: {filename}")
             continue
         
         # Nome del bundle (rimuove .md)
-        bundle_name = os.path.splitext(filename)[0]
+        bundle_name = record.bundle_name
         bundle_dir = os.path.join(HUGO_POSTS_DIR, bundle_name)
         
         # Se la cartella bundle esiste già, saltala
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Manifest delle differenze (delta) di content/ e public/ tra due pubblicazioni.
+
+Dopo la generazione del sito confronta l'hash di ogni file di content/ e
+public/ con quelli registrati all'ultima pubblicazione e scrive l'elenco dei
+file aggiunti, modificati e rimossi in .deltamanifest.json. La pipeline
+aggiunge al commit solo questi percorsi invece di eseguire 'git add .' su
+tutto il repository. Gli hash vengono registrati in .deltastate.json solo a
+commit riuscito; i file con la stessa firma (dimensione, mtime) non vengono riletti.
+
+Ogni cartella di deploy ha un proprio manifest in .deploystate.json, con gli
+hash dei file di public/ copiati nell'ultimo deploy riuscito in quella cartella:
+il deploy copia solo le differenze rispetto a quel manifest (più i file
+mancanti nella destinazione), così una cartella nuova, rimasta indietro o con
+un deploy interrotto torna allineata. Senza manifest la copia è completa.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+from datetime import datetime
+
+import build_fingerprint
+from fileutils import load_json, save_json
+
+# Percorsi
+HUGO_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog"
+DELTA_MANIFEST_FILE = "/Users/lorenzo/Documents/GitHub/LolloBlog/.deltamanifest.json"
+DELTA_STATE_FILE = "/Users/lorenzo/Documents/GitHub/LolloBlog/.deltastate.json"
+DEPLOY_STATE_FILE = "/Users/lorenzo/Documents/GitHub/LolloBlog/.deploystate.json"
+
+DELTA_MANIFEST_VERSION = 1
+
+# Cartelle confrontate e cartella pubblicata
+DELTA_ROOTS = ("content", "public")
+PUBLIC_DIR = "public"
+
+def load_state(path=None):
+    """Hash dei file all'ultima pubblicazione: {version, files}, o None."""
+    data = load_json(path or DELTA_STATE_FILE)
+    if not isinstance(data, dict) or data.get("version") != DELTA_MANIFEST_VERSION:
+        return None
+    return data
+
+def save_state(state, path=None):
+    """Registra gli hash dei file della pubblicazione appena eseguita."""
+    save_json(path or DELTA_STATE_FILE, state)
+
+def compute_delta(hugo_dir=None, state_path=None):
+    """
+    Confronta content/ e public/ con l'ultima pubblicazione.
+    Restituisce (delta {version, created_at, added, modified, deleted}, nuovo stato).
+    """
+    hugo_dir = hugo_dir or HUGO_DIR
+    previous = load_state(state_path)
+    old_files = previous["files"] if previous else {}
+    files = build_fingerprint.hash_tree(hugo_dir, DELTA_ROOTS, old_files)
+    added, modified, deleted = build_fingerprint.diff_files(old_files, files)
+    delta = {
+        "version": DELTA_MANIFEST_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "added": added,
+        "modified": modified,
+        "deleted": deleted,
+    }
+    return delta, {"version": DELTA_MANIFEST_VERSION, "files": files}
+
+def save_delta(delta, path=None):
+    """Scrive il manifest del delta."""
+    save_json(path or DELTA_MANIFEST_FILE, delta)
+
+def delta_paths(delta):
+    """Tutti i percorsi del delta, in ordine."""
+    return sorted(delta["added"] + delta["modified"] + delta["deleted"])
+
+def _git(args, paths, cwd):
+    """Esegue un comando git passando i percorsi su stdin (nessun limite di lunghezza)."""
+    result = subprocess.run(["git", "--literal-pathspecs", *args, "--pathspec-from-file=-", "--pathspec-file-nul"],
+                            input="\0".join(paths).encode("utf-8"), cwd=cwd)
+    return result.returncode == 0
+
+def stage_delta(delta, hugo_dir=None):
+    """Aggiunge all'indice di git solo i file del delta (rimozioni comprese)."""
+    hugo_dir = hugo_dir or HUGO_DIR
+    changed = sorted(delta["added"] + delta["modified"])
+    if changed and not _git(["add"], changed, hugo_dir):
+        return False
+    if delta["deleted"] and not _git(["rm", "--cached", "--quiet", "--ignore-unmatch"], delta["deleted"], hugo_dir):
+        return False
+    return True
+
+def _load_deploy_state(path=None):
+    """Manifest di tutte le cartelle di deploy: {version, targets}."""
+    data = load_json(path or DEPLOY_STATE_FILE)
+    if not isinstance(data, dict) or data.get("version") != DELTA_MANIFEST_VERSION:
+        return {"version": DELTA_MANIFEST_VERSION, "targets": {}}
+    return data
+
+def load_deploy_manifest(deploy_dir, path=None):
+    """File di public/ dell'ultimo deploy riuscito in una cartella ({percorso: {size, mtime_ns, hash}}), o None."""
+    return _load_deploy_state(path)["targets"].get(os.path.abspath(deploy_dir))
+
+def save_deploy_manifest(deploy_dir, files, path=None):
+    """Registra i file di public/ appena copiati in una cartella di deploy."""
+    data = _load_deploy_state(path)
+    data["targets"][os.path.abspath(deploy_dir)] = files
+    save_json(path or DEPLOY_STATE_FILE, data)
+
+def deploy_public(deploy_dir, hugo_dir=None, files=None, state_path=None):
+    """
+    Allinea una cartella di deploy a public/: copia i file aggiunti o
+    modificati rispetto al suo manifest e quelli mancanti nella destinazione,
+    rimuove quelli cancellati. Senza manifest (o senza la cartella) copia
+    tutto. files sono gli hash già calcolati (lo stato di compute_delta);
+    se mancano public/ viene riletto. Il manifest viene aggiornato solo a
+    copia completata. Restituisce (file copiati, file rimossi).
+    """
+    hugo_dir = hugo_dir or HUGO_DIR
+    prefix = PUBLIC_DIR + "/"
+    deployed = load_deploy_manifest(deploy_dir, state_path) if os.path.isdir(deploy_dir) else None
+    if files is None:
+        files = build_fingerprint.hash_tree(hugo_dir, (PUBLIC_DIR,), deployed)
+    current = {rel: entry for rel, entry in files.items() if rel.startswith(prefix)}
+
+    def target(rel):
+        return os.path.join(deploy_dir, rel[len(prefix):])
+
+    if deployed is None:
+        # Cartella nuova o mai allineata: copia completa
+        to_copy, to_remove = sorted(current), []
+    else:
+        added, modified, deleted = build_fingerprint.diff_files(deployed, current)
+        changed = set(added) | set(modified)
+        # File rimossi o mai arrivati nella destinazione
+        missing = [rel for rel in current if rel not in changed and not os.path.isfile(target(rel))]
+        to_copy, to_remove = sorted(changed.union(missing)), deleted
+
+    for rel in to_copy:
+        path = target(rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copy2(os.path.join(hugo_dir, rel), path)
+    removed = 0
+    for rel in to_remove:
+        path = target(rel)
+        if os.path.isfile(path):
+            os.remove(path)
+            removed += 1
+            # Rimuove le cartelle rimaste vuote fino alla radice del deploy
+            directory = os.path.dirname(path)
+            while os.path.abspath(directory) != os.path.abspath(deploy_dir) and not os.listdir(directory):
+                os.rmdir(directory)
+                directory = os.path.dirname(directory)
+    save_deploy_manifest(deploy_dir, current, state_path)
+    return len(to_copy), removed
+
+def print_delta(delta):
+    """Stampa il riepilogo del delta per cartella."""
+    for root in DELTA_ROOTS:
+        counts = [sum(1 for rel in delta[kind] if rel.startswith(root + "/"))
+                  for kind in ("added", "modified", "deleted")]
+        print(f"📦 Delta {root}/: {counts[0]} added, {counts[1]} modified, {counts[2]} deleted")
+
+def main():
+    parser = argparse.ArgumentParser(description="Mostra i file di content/ e public/ cambiati dall'ultima pubblicazione")
+    parser.add_argument('--deploy-dir', help="Copia in questa cartella solo i file di public/ cambiati dall'ultimo deploy in essa")
+    parser.add_argument('--record', action='store_true',
+                        help="Registra lo stato attuale come ultima pubblicazione")
+    args = parser.parse_args()
+
+    delta, state = compute_delta()
+    print_delta(delta)
+    save_delta(delta)
+    if args.deploy_dir:
+        copied, removed = deploy_public(args.deploy_dir, files=state["files"])
+        print(f"🚚 Deployed to {args.deploy_dir}: {copied} file(s) copied, {removed} removed")
+    if args.record:
+        save_state(state)
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Riscrittura in un solo passaggio delle immagini nel corpo dei post:
+- embed di Obsidian ![[immagine.ext]] per tutte le estensioni di immagine,
+  con larghezza opzionale ![[immagine.png|400]] o ![[immagine.png|400x300]]
+  (riportata nel testo alternativo come in Obsidian, ![immagine.png|400](immagine.png))
+  o testo alternativo ![[immagine.png|didascalia]],
+- immagini markdown standard ![alt](percorso) con percorso locale.
+Le immagini già referenziate da shortcode ({{< figure src="..." >}}) o tag
+<img src="..."> vengono lasciate invariate ma incluse tra gli allegati.
+I blocchi di codice e il codice inline vengono lasciati invariati.
+Il risultato resta sempre un'immagine markdown; se i metadati dell'allegato
+sono noti, dimensioni e colore dominante vengono aggiunti al testo alternativo:
+![alt|400|1600x900|#d0d4da](immagine.png). L'hook render-image
+(layouts/_default/_markup) li usa per width/height, lazy loading e segnaposto
+senza far decodificare l'immagine a Hugo.
+La riscrittura restituisce anche l'elenco degli allegati referenziati,
+così la copia può essere fatta in blocco.
+"""
+
+import os
+import re
+from collections import namedtuple
+from urllib.parse import unquote
+
+# Estensioni delle immagini gestite
+IMAGE_EXTENSIONS = ("png", "jpg", "jpeg", "gif", "webp", "svg", "avif", "bmp")
+
+_EXTENSIONS = "|".join(IMAGE_EXTENSIONS)
+
+# Blocchi di codice e codice inline
+CODE_PATTERN = r'```[\s\S]*?(?:```|\Z)|`[^`\n]*`'
+CODE_REGEX = re.compile(CODE_PATTERN)
+
+# Un'unica regex precompilata: codice (lasciato invariato), shortcode e tag <img>
+# (lasciati invariati), embed Obsidian, immagini markdown
+EMBED_REGEX = re.compile(
+    r'(?P<code>' + CODE_PATTERN + r')'
+    r'|(?P<tag>\{\{[<%][\s\S]*?[>%]\}\}|<img\b[^>]*>)'
+    r'|!\[\[(?P<wiki>[^\]|#\n]+?\.(?:' + _EXTENSIONS + r'))(?:#[^\]|\n]*)?(?:\|(?P<hint>[^\]\n]*))?\]\]'
+    r'|!\[(?P<alt>[^\]\n]*)\]\(\s*(?:<(?P<angle>[^>\n]+)>|(?P<src>[^)\s]+))(?P<title>\s+"[^"\n]*")?\s*\)',
+    re.IGNORECASE,
+)
+
+# Dimensioni nel formato di Obsidian: 400 oppure 400x300
+SIZE_HINT_REGEX = re.compile(r'^\s*(\d+)(?:\s*x\s*(\d+))?\s*$')
+IMAGE_EXTENSION_REGEX = re.compile(r'\.(?:' + _EXTENSIONS + r')$', re.IGNORECASE)
+REMOTE_REGEX = re.compile(r'^(?:[a-z][a-z0-9+.-]*:|//|#)', re.IGNORECASE)
+TAG_SRC_REGEX = re.compile(r'\bsrc\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+
+# Allegato referenziato: link come scritto nel post e nome del file nel bundle
+Asset = namedtuple("Asset", ["link", "name"])
+
+def bundle_name(link):
+    """Nome del file nel bundle: solo il nome base, con gli spazi sostituiti da trattini."""
+    return os.path.basename(link).replace(" ", "-")
+
+def image_hints(display_width, info):
+    """
+    Indicazioni per l'hook render-image da aggiungere al testo alternativo:
+    larghezza richiesta (solo numero), dimensioni reali (LxA) e colore (#rrggbb).
+    """
+    hints = [display_width] if display_width else []
+    if info:
+        hints.append(f"{info['width']}x{info['height']}")
+        if info.get("color"):
+            hints.append(info["color"])
+    return "".join("|" + str(hint) for hint in hints)
+
+def rewrite_embeds(body, image_info=None):
+    """
+    Riscrive le immagini del corpo di un post con una sola scansione.
+    image_info(link), se indicata, restituisce {width, height, color} dell'allegato o None.
+    Restituisce (nuovo corpo, lista di Asset nell'ordine di prima comparsa, senza duplicati).
+    """
+    assets = {}
+
+    def replace(match):
+        if match.group("code"):
+            return match.group(0)
+
+        tag = match.group("tag")
+        if tag:
+            # Riferimento già nel formato finale: nessuna riscrittura
+            src = TAG_SRC_REGEX.search(tag)
+            link = unquote((src.group(1) or src.group(2)).strip()) if src else ""
+            if link and not REMOTE_REGEX.match(link) and IMAGE_EXTENSION_REGEX.search(link):
+                assets.setdefault(link, Asset(link, os.path.basename(link)))
+            return tag
+
+        wiki = match.group("wiki")
+        if wiki:
+            link = wiki.strip()
+            name = bundle_name(link)
+            assets.setdefault(link, Asset(link, name))
+            hint = match.group("hint")
+            size = SIZE_HINT_REGEX.match(hint) if hint else None
+            info = image_info(link) if image_info is not None else None
+            if size:
+                width, height = size.group(1), size.group(2)
+                if height and not info:
+                    # Proporzioni richieste al posto di quelle (ignote) dell'immagine
+                    info = {"width": width, "height": height}
+                return f"![{name}{image_hints(width, info)}]({name})"
+            alt = hint.strip() if hint and hint.strip() else name
+            return f"![{alt}{image_hints(None, info)}]({name})"
+
+        # Immagine markdown: solo percorsi locali di immagini
+        src = match.group("angle") or match.group("src")
+        link = unquote(src.strip())
+        if REMOTE_REGEX.match(link) or not IMAGE_EXTENSION_REGEX.search(link):
+            return match.group(0)
+        name = bundle_name(link)
+        assets.setdefault(link, Asset(link, name))
+        if name == src:
+            return match.group(0)
+        return f"![{match.group('alt')}]({name}{match.group('title') or ''})"
+
+    new_body = EMBED_REGEX.sub(replace, body)
+    return new_body, list(assets.values())
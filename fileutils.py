@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Funzioni di utilità condivise dagli script di sincronizzazione:
+hash dei file, lettura/scrittura atomica dei file di stato JSON
+e riscrittura dei file di testo solo quando il contenuto cambia.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+# Dimensione dei blocchi letti durante il calcolo dell'hash
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def file_digest(path):
+    """Calcola l'hash SHA-256 di un file leggendolo a blocchi."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def bytes_digest(data):
+    """Calcola l'hash SHA-256 di un contenuto già in memoria."""
+    return hashlib.sha256(data).hexdigest()
+
+def stat_signature(st):
+    """Restituisce la firma (dimensione, mtime in ns) di un os.stat_result."""
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def load_json(path, default=None):
+    """Carica un file di stato JSON; restituisce default se manca o è corrotto."""
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable state file {path}: {e}")
+        return default
+
+def save_json(path, data):
+    """Salva un file di stato JSON in modo atomico (file temporaneo + rename)."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def atomic_write_bytes(path, data):
+    """
+    Scrive un file in modo atomico (file temporaneo nella stessa cartella + rename),
+    mantenendo i permessi del file esistente.
+    """
+    directory = os.path.dirname(path) or "."
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def write_text_if_changed(path, text, old_text=None):
+    """
+    Scrive text in path solo se il contenuto è diverso da quello attuale
+    (old_text se già letto). Restituisce True se il file è stato scritto.
+    """
+    data = text.encode("utf-8")
+    if old_text is not None:
+        if old_text == text:
+            return False
+    elif os.path.exists(path):
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    atomic_write_bytes(path, data)
+    return True
+
+def format_bytes(size):
+    """Formatta una dimensione in byte in forma leggibile (es. '1.5 MB')."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Lettura e analisi del front matter YAML dei post markdown.
+Il blocco viene letto riga per riga fino al delimitatore di chiusura '---',
+con un limite in byte: il corpo della nota non viene mai caricato.
+
+L'analisi prova nell'ordine:
+1. un parser veloce per mapping piatti (chiave: scalare, liste brevi),
+2. yaml.CSafeLoader se PyYAML è compilato con libyaml,
+3. yaml.SafeLoader in puro Python.
+Il parser veloce rinuncia (restituendo None) a qualsiasi costrutto che non
+sa interpretare esattamente come PyYAML, quindi il risultato è sempre identico.
+
+patch_front_matter_value modifica il valore di una sola chiave lasciando
+il resto del documento invariato byte per byte.
+"""
+
+import json
+import re
+import yaml
+
+try:
+    from yaml import CSafeLoader
+except ImportError:
+    CSafeLoader = None
+
+# Limite in byte per il blocco di front matter (delimitatori inclusi)
+MAX_FRONT_MATTER_BYTES = 64 * 1024
+
+# Righe "chiave: valore" e "- elemento" gestite dal parser veloce
+FLAT_KEY_REGEX = re.compile(r'^([A-Za-z_][A-Za-z0-9_-]*):(?: +(.*))?$')
+FLAT_ITEM_REGEX = re.compile(r'^( *)- +(.*)$')
+DOUBLE_QUOTED_REGEX = re.compile(r'^"([^"\\]*)"$')
+SINGLE_QUOTED_REGEX = re.compile(r"^'((?:[^']|'')*)'$")
+FLOW_SEQUENCE_REGEX = re.compile(r'^\[(.*)\]$')
+
+# Caratteri che il parser veloce non gestisce (tab, interruzioni di riga non standard, BOM)
+UNSUPPORTED_CHARS_REGEX = re.compile('[\r\t\x85\u2028\u2029\ufeff]')
+
+# Caratteri con cui uno scalare non quotato non può iniziare
+PLAIN_INDICATORS = frozenset("-?:,[]{}#&*!|>'\"%@`")
+
+# Tag YAML che il parser veloce costruisce con i costruttori di PyYAML
+FLAT_SCALAR_TAGS = frozenset(
+    "tag:yaml.org,2002:" + name for name in ("str", "bool", "int", "float", "null", "timestamp")
+)
+
+_resolver = yaml.resolver.Resolver()
+_constructor = yaml.constructor.SafeConstructor()
+
+# Chiavi già verificate come stringhe semplici (es. 'title', 'draft')
+_string_keys = set()
+
+def _plain_scalar(value, flow=False):
+    """
+    Interpreta uno scalare non quotato con le stesse regole implicite di
+    PyYAML (bool, int, float, null, date). Restituisce (True, valore) oppure
+    (False, None) se lo scalare non è sicuramente interpretabile.
+    """
+    if not value or value[0] in PLAIN_INDICATORS or value.endswith(":"):
+        return False, None
+    if ": " in value or " #" in value or "\t" in value:
+        return False, None
+    if flow and any(char in value for char in ",[]{}:#"):
+        return False, None
+    tag = _resolver.resolve(yaml.ScalarNode, value, (True, False))
+    if tag not in FLAT_SCALAR_TAGS:
+        return False, None
+    return True, _constructor.yaml_constructors[tag](_constructor, yaml.ScalarNode(tag, value))
+
+def _scalar(value, flow=False):
+    """Interpreta uno scalare quotato semplice o non quotato."""
+    match = DOUBLE_QUOTED_REGEX.match(value)
+    if match:
+        return True, match.group(1)
+    match = SINGLE_QUOTED_REGEX.match(value)
+    if match:
+        return True, match.group(1).replace("''", "'")
+    return _plain_scalar(value, flow)
+
+def _flow_sequence(value):
+    """Interpreta una lista breve in stile flow, es. [a, "b", 3]."""
+    inner = FLOW_SEQUENCE_REGEX.match(value).group(1).strip()
+    if not inner:
+        return True, []
+    items = []
+    for item in inner.split(","):
+        ok, parsed = _scalar(item.strip(), flow=True)
+        if not ok:
+            return False, None
+        items.append(parsed)
+    return True, items
+
+def parse_flat_yaml(text):
+    """
+    Parser veloce per front matter piatti: chiavi semplici con scalari
+    (anche su più righe, come li scrive yaml.dump), liste flow brevi o liste
+    a blocchi di scalari. Restituisce None per qualsiasi altro costrutto,
+    lasciando la decisione ai loader di PyYAML.
+    """
+    text = text.replace("\r\n", "\n")
+    if UNSUPPORTED_CHARS_REGEX.search(text) or yaml.reader.Reader.NON_PRINTABLE.search(text):
+        return None
+
+    lines = text.split("\n")
+    result = {}
+    current_key = None  # chiave senza valore che può essere seguita da una lista a blocchi
+    item_indent = None
+    index = 0
+    while index < len(lines):
+        stripped = lines[index].rstrip(" ")
+        index += 1
+        if not stripped or stripped.startswith("#"):
+            continue
+
+        item = FLAT_ITEM_REGEX.match(stripped)
+        if item and current_key is not None:
+            indent = len(item.group(1))
+            if item_indent is not None and indent != item_indent:
+                return None
+            ok, parsed = _scalar(item.group(2).strip())
+            if not ok:
+                return None
+            if result[current_key] is None:
+                result[current_key] = []
+            result[current_key].append(parsed)
+            item_indent = indent
+            continue
+
+        match = FLAT_KEY_REGEX.match(stripped)
+        if not match:
+            return None
+        key = match.group(1)
+        if key not in _string_keys:
+            if _resolver.resolve(yaml.ScalarNode, key, (True, False)) != "tag:yaml.org,2002:str":
+                return None
+            _string_keys.add(key)
+        value = (match.group(2) or "").strip()
+
+        if not value:
+            result[key] = None
+            current_key, item_indent = key, None
+            continue
+        current_key = None
+
+        # Righe indentate successive: continuazione dello scalare, unite con uno spazio
+        continuation = []
+        while index < len(lines) and lines[index].startswith(" ") and lines[index].strip():
+            continuation.append(lines[index].strip(" "))
+            index += 1
+        if continuation:
+            if value[0] != "'" and any(part[0] in PLAIN_INDICATORS for part in continuation):
+                return None
+            value = " ".join([value] + continuation)
+
+        if FLOW_SEQUENCE_REGEX.match(value):
+            ok, parsed = _flow_sequence(value)
+        else:
+            ok, parsed = _scalar(value)
+        if not ok:
+            return None
+        result[key] = parsed
+
+    return result or None
+
+def load_yaml(text):
+    """
+    Analizza il testo YAML del front matter con la catena parser veloce ->
+    CSafeLoader -> SafeLoader. Solleva yaml.YAMLError come yaml.safe_load.
+    """
+    result = parse_flat_yaml(text)
+    if result is not None:
+        return result
+    if CSafeLoader is not None:
+        return yaml.load(text, Loader=CSafeLoader)
+    return yaml.safe_load(text)
+
+def _is_delimiter(line):
+    """Controlla se una riga (bytes) è un delimitatore '---' seguito da newline."""
+    return line.endswith(b"\n") and line.rstrip() == b"---"
+
+def read_front_matter_block(path, max_bytes=MAX_FRONT_MATTER_BYTES):
+    """
+    Restituisce il testo YAML tra i delimitatori '---' senza leggere il corpo.
+    Restituisce None se il file non inizia con '---' (controllato sulla prima
+    riga), se il blocco non viene chiuso o se supera max_bytes.
+    """
+    with open(path, "rb") as f:
+        first_line = f.readline(max_bytes)
+        if not _is_delimiter(first_line):
+            return None
+
+        lines = []
+        total = len(first_line)
+        while total < max_bytes:
+            line = f.readline(max_bytes - total)
+            if not line:
+                return None
+            total += len(line)
+            if _is_delimiter(line):
+                return b"".join(lines).decode("utf-8")
+            lines.append(line)
+
+    print(f"⚠️  Front matter larger than {max_bytes} bytes, ignored: {path}")
+    return None
+
+def parse_front_matter_yaml(text):
+    """Analizza il testo YAML del front matter; restituisce {} in caso di errore."""
+    try:
+        front_matter = load_yaml(text) or {}
+    except yaml.YAMLError as e:
+        print(f"❌ Error parsing YAML front matter: {e}")
+        return {}
+    return front_matter if isinstance(front_matter, dict) else {}
+
+def load_front_matter(path, max_bytes=MAX_FRONT_MATTER_BYTES):
+    """Legge e analizza solo il front matter di un file markdown."""
+    text = read_front_matter_block(path, max_bytes)
+    if text is None:
+        return {}
+    return parse_front_matter_yaml(text)
+
+def format_scalar(value, quote=None):
+    """
+    Formatta una stringa (o un intero) come scalare YAML. quote ("'" o '"')
+    mantiene lo stile del valore originale; senza quote si usa uno scalare non
+    quotato se viene riletto identico, altrimenti uno scalare tra doppi apici.
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    if quote == "'":
+        return "'" + value.replace("'", "''") + "'"
+    if quote is None:
+        ok, parsed = _plain_scalar(value)
+        if ok and parsed == value:
+            return value
+    return json.dumps(value, ensure_ascii=False)
+
+def patch_front_matter_value(content, key, value):
+    """
+    Sostituisce il valore scalare (stringa o intero) di una chiave di primo livello nel
+    front matter di content, senza toccare le altre righe né l'ordine dei campi.
+    Restituisce il nuovo contenuto, o None se la chiave non esiste o non può
+    essere modificata in sicurezza (valore a blocchi, commenti, chiave ripetuta).
+    """
+    lines = content.split("\n")
+    if not lines or lines[0].rstrip() != "---":
+        return None
+    try:
+        end = next(index for index in range(1, len(lines)) if lines[index].rstrip() == "---")
+    except StopIteration:
+        return None
+
+    key_regex = re.compile(r'^' + re.escape(key) + r':(?:[ \t]+(.*?))?[ \t]*$')
+    matches = [index for index in range(1, end) if key_regex.match(lines[index])]
+    if len(matches) != 1:
+        return None
+    start = matches[0]
+    old_value = key_regex.match(lines[start]).group(1)
+    if not old_value or old_value[0] in "|>[{&*!#" or " #" in old_value:
+        return None
+
+    # Righe indentate successive: continuazione del valore originale
+    stop = start + 1
+    while stop < end and lines[stop].startswith((" ", "\t")) and lines[stop].strip():
+        stop += 1
+
+    quote = old_value[0] if old_value[0] in "'\"" else None
+    new_lines = lines[:start] + [f"{key}: {format_scalar(value, quote)}"] + lines[stop:]
+    new_end = end - (stop - start - 1)
+
+    # Verifica: la chiave ha il nuovo valore e gli altri campi sono invariati
+    try:
+        old_data = load_yaml("\n".join(lines[1:end]))
+        new_data = load_yaml("\n".join(new_lines[1:new_end]))
+    except yaml.YAMLError:
+        return None
+    if not isinstance(old_data, dict) or not isinstance(new_data, dict):
+        return None
+    old_data[key] = value
+    if new_data != old_data:
+        return None
+    return "\n".join(new_lines)
+
+def set_front_matter_value(content, key, value):
+    """
+    Come patch_front_matter_value, ma se la chiave non esiste la aggiunge
+    come ultima riga del front matter. Restituisce None se content non ha un
+    front matter o se la modifica non è sicura.
+    """
+    if value is None:
+        return None
+    lines = content.split("\n")
+    if not lines or lines[0].rstrip() != "---":
+        return None
+    end = next((index for index in range(1, len(lines)) if lines[index].rstrip() == "---"), None)
+    if end is None:
+        return None
+    key_regex = re.compile(r'^' + re.escape(key) + r':')
+    if any(key_regex.match(line) for line in lines[1:end]):
+        return patch_front_matter_value(content, key, value)
+
+    new_lines = lines[:end] + [f"{key}: {format_scalar(value)}"] + lines[end:]
+    try:
+        old_data = load_yaml("\n".join(lines[1:end])) if end > 1 else {}
+        new_data = load_yaml("\n".join(new_lines[1:end + 1]))
+    except yaml.YAMLError:
+        return None
+    if not isinstance(old_data, dict) or not isinstance(new_data, dict):
+        return None
+    old_data[key] = value
+    if new_data != old_data:
+        return None
+    return "\n".join(new_lines)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Cache persistente degli hash delle immagini copiate nei page bundle.
+Per ogni file (allegato in Obsidian o copia nel bundle) registra dimensione,
+mtime e hash del contenuto: un file con la stessa firma non viene riletto.
+Le immagini vengono copiate solo se la destinazione ha un contenuto diverso.
+La cache ricorda anche i nomi normalizzati (spazi -> trattini) usati nei
+bundle, così l'allegato originale si ritrova anche da un index.md già elaborato.
+La cache può essere condivisa da più thread.
+"""
+
+import os
+import shutil
+import threading
+
+from fileutils import file_digest, load_json, save_json, stat_signature
+
+# Percorsi
+IMAGE_CACHE_FILE = "/Users/lorenzo/Documents/GitHub/LolloBlog/.imagecache.json"
+
+IMAGE_CACHE_VERSION = 1
+
+class ImageCache:
+    """Hash dei file indicizzati per percorso e firma (dimensione, mtime)."""
+
+    def __init__(self, path=None):
+        self.path = path or IMAGE_CACHE_FILE
+        self.hashed_count = 0
+        self._lock = threading.Lock()
+        data = load_json(self.path)
+        if not isinstance(data, dict) or data.get("version") != IMAGE_CACHE_VERSION:
+            data = {"version": IMAGE_CACHE_VERSION, "files": {}}
+        self.files = data.setdefault("files", {})
+        self.renames = data.setdefault("renames", {})
+
+    def digest(self, path, st=None):
+        """Restituisce l'hash di un file, leggendolo solo se la firma è cambiata."""
+        st = st or os.stat(path)
+        with self._lock:
+            entry = self.files.get(path)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["hash"]
+        digest = file_digest(path)
+        with self._lock:
+            self.hashed_count += 1
+        self.record(path, st, digest)
+        return digest
+
+    def record(self, path, st, digest):
+        """Registra l'hash di un file di cui il contenuto è già noto."""
+        with self._lock:
+            self.files[path] = {**stat_signature(st), "hash": digest}
+
+    def remember_rename(self, original, normalized):
+        """Registra il nome originale di un'immagine rinominata nel bundle."""
+        with self._lock:
+            self.renames[normalized] = original
+
+    def original_name(self, normalized):
+        """Restituisce il nome originale di un'immagine rinominata, o None."""
+        with self._lock:
+            return self.renames.get(normalized)
+
+    def save(self):
+        """Salva la cache, dimenticando i file che non esistono più."""
+        for path in [path for path in self.files if not os.path.exists(path)]:
+            del self.files[path]
+        save_json(self.path, {"version": IMAGE_CACHE_VERSION, "files": self.files, "renames": self.renames})
+
+def new_copy_stats():
+    """Contatori di file e byte copiati o già presenti a destinazione."""
+    return {"copied": 0, "copied_bytes": 0, "skipped": 0, "skipped_bytes": 0}
+
+def merge_copy_stats(total, stats):
+    """Somma i contatori di stats in total."""
+    for key, value in stats.items():
+        total[key] += value
+
+def place_file(src_path, dst_path, cache=None, stats=None, src_st=None):
+    """
+    Copia src_path in dst_path solo se la destinazione non ha già lo stesso
+    contenuto (stessa dimensione e stesso hash). Restituisce True se ha copiato.
+    src_st evita un nuovo stat della sorgente se è già noto (es. dall'indice degli allegati).
+    """
+    src_st = src_st or os.stat(src_path)
+    digest = cache.digest(src_path, src_st) if cache is not None else None
+
+    try:
+        dst_st = os.stat(dst_path)
+    except FileNotFoundError:
+        dst_st = None
+
+    if dst_st is not None and dst_st.st_size == src_st.st_size:
+        if cache is not None:
+            identical = cache.digest(dst_path, dst_st) == digest
+        else:
+            identical = file_digest(dst_path) == file_digest(src_path)
+        if identical:
+            if stats is not None:
+                stats["skipped"] += 1
+                stats["skipped_bytes"] += src_st.st_size
+            return False
+
+    shutil.copy2(src_path, dst_path)
+    if cache is not None:
+        cache.record(dst_path, os.stat(dst_path), digest)
+    if stats is not None:
+        stats["copied"] += 1
+        stats["copied_bytes"] += src_st.st_size
+    return True
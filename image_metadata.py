@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Metadati delle immagini (dimensioni, peso e colore dominante) calcolati una
+sola volta per hash del contenuto e salvati in una cache persistente.
+Le dimensioni vengono lette dall'intestazione dei file PNG, GIF, JPEG e WebP
+in puro Python, senza decodificare l'immagine; il colore dominante viene
+calcolato solo se Pillow è installato.
+"""
+
+import os
+import struct
+import threading
+
+from fileutils import load_json, save_json
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Percorsi
+IMAGE_METADATA_FILE = "/Users/lorenzo/Documents/GitHub/LolloBlog/.imagemeta.json"
+
+IMAGE_METADATA_VERSION = 1
+
+# Byte letti per le intestazioni di PNG, GIF e WebP
+HEADER_BYTES = 32
+
+# Marker JPEG "Start Of Frame" che contengono le dimensioni
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def _jpeg_dimensions(f):
+    """Scorre i segmenti JPEG fino al primo SOF e ne legge le dimensioni."""
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b"\xff":
+            byte = f.read(1)
+        while byte == b"\xff":
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) != 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+        if marker in JPEG_SOF_MARKERS:
+            data = f.read(5)
+            if len(data) != 5:
+                return None
+            height, width = struct.unpack(">HH", data[1:5])
+            return width, height
+        f.seek(length - 2, os.SEEK_CUR)
+
+def read_dimensions(path):
+    """
+    Legge larghezza e altezza dall'intestazione di un'immagine PNG, GIF,
+    JPEG o WebP. Restituisce (larghezza, altezza) o None se il formato non è riconosciuto.
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER_BYTES)
+        if header.startswith(b"\x89PNG\r\n\x1a\n") and header[12:16] == b"IHDR":
+            return struct.unpack(">II", header[16:24])
+        if header[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", header[6:10])
+        if header.startswith(b"\xff\xd8"):
+            return _jpeg_dimensions(f)
+        if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+            chunk = header[12:16]
+            if chunk == b"VP8 ":
+                width, height = struct.unpack("<HH", header[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b"VP8L":
+                b0, b1, b2, b3 = header[21:25]
+                return 1 + (b0 | (b1 & 0x3F) << 8), 1 + (b1 >> 6 | b2 << 2 | (b3 & 0x0F) << 10)
+            if chunk == b"VP8X":
+                return (1 + int.from_bytes(header[24:27], "little"),
+                        1 + int.from_bytes(header[27:30], "little"))
+    return None
+
+def dominant_color(path):
+    """Colore medio dell'immagine in formato #rrggbb; None senza Pillow o per formati non supportati."""
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as img:
+            img.draft("RGB", (64, 64))
+            red, green, blue = img.convert("RGB").resize((1, 1), Image.BOX).getpixel((0, 0))
+    except Exception:
+        return None
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+def compute_metadata(path):
+    """Calcola i metadati di un'immagine: dimensioni, peso in byte e colore dominante."""
+    try:
+        dimensions = read_dimensions(path)
+    except (OSError, struct.error, ValueError):
+        dimensions = None
+    width, height = dimensions if dimensions else (None, None)
+    return {
+        "width": width,
+        "height": height,
+        "size": os.path.getsize(path),
+        "color": dominant_color(path),
+    }
+
+class ImageMetadataCache:
+    """Metadati delle immagini indicizzati per hash del contenuto."""
+
+    def __init__(self, path=None):
+        self.path = path or IMAGE_METADATA_FILE
+        self.computed_count = 0
+        self._lock = threading.Lock()
+        data = load_json(self.path)
+        if not isinstance(data, dict) or data.get("version") != IMAGE_METADATA_VERSION:
+            data = {"version": IMAGE_METADATA_VERSION, "images": {}}
+        self.images = data.setdefault("images", {})
+
+    def get(self, path, digest):
+        """Restituisce i metadati di un'immagine, calcolandoli solo per un hash nuovo."""
+        with self._lock:
+            metadata = self.images.get(digest)
+        if metadata is not None:
+            return metadata
+        metadata = compute_metadata(path)
+        with self._lock:
+            self.images[digest] = metadata
+            self.computed_count += 1
+        return metadata
+
+    def save(self):
+        """Salva la cache sul disco."""
+        with self._lock:
+            save_json(self.path, {"version": IMAGE_METADATA_VERSION, "images": self.images})
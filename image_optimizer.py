@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Ottimizzazione degli screenshot PNG copiati nei page bundle.
+Le immagini più larghe di MAX_WIDTH vengono ridimensionate e tutte vengono
+ricompresse; il risultato viene salvato in una cache indicizzata per hash
+del sorgente, così ogni allegato viene ottimizzato una sola volta.
+Le ottimizzazioni nuove vengono eseguite su un pool di processi.
+Richiede Pillow: se non è installato lo stage viene disattivato.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from fileutils import load_json, save_json
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Percorsi
+OPTIMIZED_CACHE_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog/.optimized_cache"
+
+OPTIMIZED_CACHE_VERSION = 1
+
+# Larghezza massima delle immagini nei bundle (2x la colonna dei contenuti del tema)
+MAX_WIDTH = 1600
+
+def optimize_png(src_path, dst_path, max_width=MAX_WIDTH):
+    """
+    Ridimensiona (se più larga di max_width) e ricomprime una PNG.
+    Scrive dst_path solo se il risultato è più piccolo dell'originale.
+    Restituisce (dimensione originale, dimensione ottimizzata o None).
+    """
+    original_size = os.path.getsize(src_path)
+    tmp_path = dst_path + ".tmp"
+    with Image.open(src_path) as img:
+        img.load()
+        if img.width > max_width:
+            if img.mode == "P":
+                img = img.convert("RGBA")
+            height = max(1, round(img.height * max_width / img.width))
+            img = img.resize((max_width, height), Image.LANCZOS)
+        img.save(tmp_path, format="PNG", optimize=True)
+    optimized_size = os.path.getsize(tmp_path)
+    if optimized_size >= original_size:
+        os.remove(tmp_path)
+        return original_size, None
+    os.replace(tmp_path, dst_path)
+    return original_size, optimized_size
+
+def _optimize_job(job):
+    """Esegue optimize_png in un processo del pool; gli errori vengono restituiti come testo."""
+    digest, src_path, dst_path, max_width = job
+    try:
+        return digest, optimize_png(src_path, dst_path, max_width), None
+    except Exception as e:
+        if os.path.exists(dst_path + ".tmp"):
+            os.remove(dst_path + ".tmp")
+        return digest, None, str(e)
+
+class ImageOptimizer:
+    """Cache delle PNG ottimizzate, indicizzate per hash del sorgente."""
+
+    def __init__(self, cache_dir=None, max_width=MAX_WIDTH, enabled=True):
+        self.cache_dir = cache_dir or OPTIMIZED_CACHE_DIR
+        self.max_width = max_width
+        self.enabled = enabled and Image is not None
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._deferred = []
+        self.index = {}
+        if self.enabled:
+            data = load_json(os.path.join(self.cache_dir, "index.json"))
+            if isinstance(data, dict) and data.get("version") == OPTIMIZED_CACHE_VERSION:
+                self.index = data.get("images", {})
+
+    def handles(self, path):
+        """True se il file è una PNG da ottimizzare."""
+        return self.enabled and path.lower().endswith(".png")
+
+    def lookup(self, digest):
+        """
+        Cerca un sorgente nella cache. Restituisce (True, percorso della versione
+        ottimizzata) o (True, None) se conviene usare l'originale;
+        (False, None) se il sorgente non è ancora stato elaborato.
+        """
+        with self._lock:
+            entry = self.index.get(digest)
+        if entry is None:
+            return False, None
+        if entry["file"] is None:
+            return True, None
+        path = os.path.join(self.cache_dir, entry["file"])
+        if not os.path.exists(path):
+            return False, None
+        return True, path
+
+    def defer(self, src_path, digest, dst_path):
+        """Rimanda la copia di un'immagine non ancora ottimizzata a dopo run()."""
+        with self._lock:
+            self._pending.setdefault(digest, src_path)
+            self._deferred.append((dst_path, src_path, digest))
+
+    def run(self, workers=None):
+        """
+        Ottimizza le immagini in attesa su un pool di processi e aggiorna la cache.
+        Restituisce (immagini elaborate, byte originali, byte dopo l'ottimizzazione).
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0, 0, 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        jobs = [(digest, src_path, os.path.join(self.cache_dir, digest + ".png"), self.max_width)
+                for digest, src_path in sorted(pending.items())]
+        if len(jobs) > 1 and (workers is None or workers > 1):
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_optimize_job, jobs))
+        else:
+            results = [_optimize_job(job) for job in jobs]
+
+        count = before = after = 0
+        for digest, sizes, error in results:
+            if error is not None:
+                print(f"⚠️  Optimisation failed for {pending[digest]}: {error}")
+                continue
+            count += 1
+            original_size, optimized_size = sizes
+            before += original_size
+            after += optimized_size if optimized_size is not None else original_size
+            with self._lock:
+                self.index[digest] = {
+                    "file": digest + ".png" if optimized_size is not None else None,
+                    "size": original_size,
+                    "optimized_size": optimized_size,
+                }
+        save_json(os.path.join(self.cache_dir, "index.json"),
+                  {"version": OPTIMIZED_CACHE_VERSION, "images": self.index})
+        return count, before, after
+
+    def deferred(self):
+        """Restituisce le copie rimandate (destinazione, sorgente, hash) in ordine di destinazione."""
+        with self._lock:
+            deferred, self._deferred = sorted(self._deferred), []
+        return deferred
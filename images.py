@@ -1,7 +1,20 @@
+import argparse
 import os
 import re
-import shutil
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import bundle_gc
+import embeds
+import image_cache
+import image_metadata
+import image_optimizer
+import sync_manifest
+from attachment_index import AttachmentIndex
+import vault_catalog
+from fileutils import file_digest, format_bytes, write_text_if_changed
+from frontmatter import load_front_matter, load_yaml, patch_front_matter_value, set_front_matter_value
 
 # Percorsi
 OBSIDIAN_POST_DIR = "/Users/lorenzo/Library/Mobile Documents/iCloud~md~obsidian/Documents/Ken vault/08 - Blog/"  # Cartella dei post in Obsidian
@@ -12,9 +25,6 @@ HUGO_EN_POST_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog/content/en/post"
 # Lista di tutte le directory dei post Hugo per il multilingua
 HUGO_POST_DIRS = [HUGO_IT_POST_DIR, HUGO_EN_POST_DIR]
 
-# Regex per trovare i link delle immagini in formato Obsidian (con singolo !)
-IMAGE_REGEX = r'!\[\[([^]]*\.png)\]\]'
-
 # Regex per estrarre il front matter YAML
 FRONT_MATTER_REGEX = r'^---\s*\n(.*?)\n---\s*\n'
 
@@ -23,7 +33,7 @@ def parse_front_matter(content):
     match = re.match(FRONT_MATTER_REGEX, content, re.DOTALL)
     if match:
         try:
-            front_matter = yaml.safe_load(match.group(1)) or {}
+            front_matter = load_yaml(match.group(1)) or {}
             return front_matter, match.group(0)
         except yaml.YAMLError as e:
             print(f"Error parsing YAML front matter: {e}")
@@ -33,10 +43,8 @@ def parse_front_matter(content):
 def is_draft_post(file_path):
     """Controlla se un post è marcato come draft."""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        
-        front_matter, _ = parse_front_matter(content)
+        # Legge solo il blocco di front matter, non l'intera nota
+        front_matter = load_front_matter(file_path)
         return front_matter.get('draft', False)
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
@@ -56,86 +64,286 @@ def update_front_matter(content, front_matter, original_front_matter):
             return content.replace(original_front_matter, new_front_matter)
     return content
 
-def process_multilingual_posts():
-    """Processa i post nelle cartelle multilingua."""
+def process_multilingual_posts(catalog=None, workers=1, optimize=True, gc=None, bundles=None):
+    """
+    Processa i post nelle cartelle multilingua.
+    Gli index.md vengono riscritti solo se il contenuto cambia.
+    Con workers > 1 i bundle vengono elaborati su un pool di thread; l'output
+    di ogni bundle viene raccolto e stampato nello stesso ordine della
+    modalità seriale, quindi log e conteggi sono identici.
+    Con optimize (e Pillow installato) le PNG vengono ottimizzate prima della
+    copia: quelle non ancora in cache vengono elaborate su un pool di processi
+    dopo la scansione dei bundle e copiate alla fine.
+    Dimensioni e colore dominante delle immagini vengono calcolati una volta
+    per hash (image_metadata.py) e scritti negli embed e nel front matter.
+    gc (un bundle_gc.AssetGC) rimuove, o elenca in dry-run, le immagini orfane dei bundle.
+    bundles, se indicato, limita l'elaborazione a questi percorsi di bundle
+    (usato dalla modalità watch per i soli post toccati).
+    """
+    catalog = catalog or vault_catalog.get_catalog()
+    cache = image_cache.ImageCache()
+    stats = image_cache.new_copy_stats()
     processed_count = 0
+    modified_files = []
     
-    # Processa i post in entrambe le cartelle lingua
-    for hugo_dir in HUGO_POST_DIRS:
-        if not os.path.exists(hugo_dir):
-            print(f"Directory not found: {hugo_dir}")
-            continue
-            
-        print(f"\n📁 Processing posts in: {hugo_dir}")
-        
-        for bundle_name in os.listdir(hugo_dir):
-            bundle_path = os.path.join(hugo_dir, bundle_name)
-            
-            # Salta file che non sono cartelle
-            if not os.path.isdir(bundle_path):
+    # Un'unica visita della cartella degli allegati per tutta l'esecuzione
+    attachments = AttachmentIndex(ATTACHMENTS_DIR)
+    print(f"📎 Indexed {len(attachments)} attachment(s) in {attachments.scanned_dirs} folder(s)")
+    optimizer = image_optimizer.ImageOptimizer(enabled=optimize)
+    if optimize and not optimizer.enabled:
+        print("ℹ️  Pillow not installed: PNG optimisation disabled")
+    metadata = image_metadata.ImageMetadataCache()
+    run_bundle = partial(process_bundle, cache=cache, attachments=attachments,
+                         optimizer=optimizer, metadata=metadata, gc=gc)
+    
+    pool = ThreadPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+    try:
+        # Processa i post in entrambe le cartelle lingua
+        for hugo_dir in HUGO_POST_DIRS:
+            if not os.path.exists(hugo_dir):
+                print(f"Directory not found: {hugo_dir}")
                 continue
                 
-            # Salta cartelle che iniziano con punto
-            if bundle_name.startswith('.'):
-                continue
+            print(f"\n📁 Processing posts in: {hugo_dir}")
             
-            markdown_file = os.path.join(bundle_path, "index.md")
-            if not os.path.exists(markdown_file):
-                print(f"⚠️  No index.md found in {bundle_path}")
-                continue
+            jobs = []
+            for bundle_name in sorted(os.listdir(hugo_dir)):
+                bundle_path = os.path.join(hugo_dir, bundle_name)
                 
-            print(f"📝 Processing bundle: {bundle_name}")
-            processed_count += 1
+                # Salta file che non sono cartelle
+                if not os.path.isdir(bundle_path):
+                    continue
+                    
+                # Salta cartelle che iniziano con punto
+                if bundle_name.startswith('.'):
+                    continue
+                
+                if bundles is not None and bundle_path not in bundles:
+                    continue
+                
+                markdown_file = os.path.join(bundle_path, "index.md")
+                if not os.path.exists(markdown_file):
+                    jobs.append((bundle_name, bundle_path, None, None))
+                    continue
+                
+                # Il catalogo viene interrogato solo dal thread principale
+                record = catalog.record_for(markdown_file, bundle_name)
+                jobs.append((bundle_name, bundle_path, markdown_file, record))
             
-            # Processa le immagini per questo post
-            process_images_for_post(bundle_path, markdown_file)
+            results = pool.map(run_bundle, jobs) if pool else map(run_bundle, jobs)
+            for job, (lines, bundle_stats, modified) in zip(jobs, results):
+                for line in lines:
+                    print(line)
+                if bundle_stats is not None:
+                    processed_count += 1
+                    if modified:
+                        modified_files.append(job[2])
+                    image_cache.merge_copy_stats(stats, bundle_stats)
+    finally:
+        if pool:
+            pool.shutdown()
     
+    place_optimized_images(optimizer, cache, stats)
+    cache.save()
+    metadata.save()
+    if metadata.computed_count:
+        print(f"📐 Image metadata computed for {metadata.computed_count} new image(s)")
+    if modified_files:
+        # Gli index.md riscritti qui non devono risultare modificati alla prossima sincronizzazione
+        manifest = sync_manifest.load_manifest()
+        if sync_manifest.refresh_targets(manifest, modified_files):
+            sync_manifest.save_manifest(manifest)
+    print_copy_stats(stats)
+    if gc is not None:
+        gc.report()
+    print(f"✏️  Bundles modified: {len(modified_files)} of {processed_count}")
     return processed_count
 
-def process_images_for_post(bundle_dir, markdown_file):
-    """Processa le immagini per un singolo post."""
+def process_bundle(job, cache=None, attachments=None, optimizer=None, metadata=None, gc=None):
+    """
+    Elabora un bundle raccogliendo i messaggi invece di stamparli.
+    Restituisce (righe di log, contatori delle immagini, index.md modificato);
+    i contatori sono None se il bundle non ha un index.md.
+    """
+    bundle_name, bundle_path, markdown_file, record = job
+    lines = []
+    if markdown_file is None:
+        lines.append(f"⚠️  No index.md found in {bundle_path}")
+        return lines, None, False
+    
+    lines.append(f"📝 Processing bundle: {bundle_name}")
+    stats = image_cache.new_copy_stats()
+    # Processa le immagini per questo post
+    modified = process_images_for_post(bundle_path, markdown_file, record, cache, stats,
+                                       attachments=attachments, optimizer=optimizer,
+                                       metadata=metadata, gc=gc, log=lines.append)
+    return lines, stats, modified
+
+def place_optimized_images(optimizer, cache, stats):
+    """Ottimizza le PNG in attesa e le copia nei bundle in cui erano referenziate."""
+    if not optimizer.enabled:
+        return
+    count, before, after = optimizer.run()
+    if count:
+        print(f"\n🗜️  Optimised {count} PNG(s): {format_bytes(before)} -> {format_bytes(after)}")
+    for dst_path, src_path, digest in optimizer.deferred():
+        _, optimized = optimizer.lookup(digest)
+        if image_cache.place_file(optimized or src_path, dst_path, cache, stats):
+            print(f"  ✅ Copied optimised image: {dst_path}")
+
+def resolve_attachment(attachments, cache, image_name):
+    """
+    Cerca un allegato per nome; se non c'è, prova il nome originale di
+    un'immagine già rinominata in un'esecuzione precedente.
+    """
+    attachment = attachments.resolve(image_name)
+    if attachment is None and cache is not None:
+        original = cache.original_name(image_name)
+        if original:
+            attachment = attachments.resolve(original)
+    return attachment
+
+def print_copy_stats(stats):
+    """Stampa il riepilogo delle immagini copiate e di quelle già presenti nei bundle."""
+    print(f"\n📦 Images copied: {stats['copied']} ({format_bytes(stats['copied_bytes'])}), "
+          f"unchanged: {stats['skipped']} ({format_bytes(stats['skipped_bytes'])})")
+
+def process_images_for_post(bundle_dir, markdown_file, record=None, cache=None, stats=None,
+                            attachments=None, optimizer=None, metadata=None, gc=None, log=print):
+    """
+    Processa le immagini per un singolo post.
+    Gli allegati vengono cercati nell'indice (costruito qui se non passato),
+    anche nelle sottocartelle; le immagini già presenti nel bundle con lo
+    stesso contenuto non vengono ricopiate. Con un optimizer le PNG vengono
+    copiate nella versione ottimizzata (o messe in coda se non ancora elaborate).
+    Con una cache dei metadati gli embed ricevono dimensioni e colore nel testo
+    alternativo (letti dall'hook render-image, così Hugo non decodifica
+    l'immagine) e l'immagine in evidenza imageWidth/imageHeight nel front matter.
+    Con un AssetGC le immagini del bundle non più referenziate vengono rimosse.
+    I messaggi vengono passati a log (print di default).
+    Restituisce True se index.md è stato riscritto.
+    """
+    if attachments is None:
+        attachments = AttachmentIndex(ATTACHMENTS_DIR)
+
     # Leggi il contenuto del file markdown
     with open(markdown_file, "r", encoding="utf-8") as f:
         content = f.read()
+    original_content = content
 
-    # Estrai il front matter
-    front_matter, original_front_matter = parse_front_matter(content)
+    # Immagine in evidenza: dal catalogo se disponibile, altrimenti dal front matter
+    if record is not None:
+        image_name = record.images.get('image')
+        cover_name = record.images.get('cover')
+    else:
+        front_matter, _ = parse_front_matter(content)
+        image_name = front_matter.get('image')
+        cover_name = front_matter.get('cover')
     
-    # Gestisci l'immagine specificata nel parametro 'image' del front matter
-    if 'image' in front_matter and front_matter['image']:
-        image_name = front_matter['image']
-        new_image_name = image_name.replace(" ", "-")
-        src_path = os.path.join(ATTACHMENTS_DIR, image_name)
+    def place_image(link, new_image_name, kind):
+        """Copia un allegato nel bundle (se cambiato) e registra l'eventuale rinomina."""
+        attachment = resolve_attachment(attachments, cache, link)
         dst_path = os.path.join(bundle_dir, new_image_name)
-        if os.path.exists(src_path):
-            shutil.copy2(src_path, dst_path)
-            print(f"  ✅ Copied featured image: {new_image_name}")
-        else:
-            print(f"  ❌ Featured image {image_name} not found")
-
-    # Aggiorna il front matter con il nome dell'immagine modificato
-    content = update_front_matter(content, front_matter, original_front_matter)
-
-    # Trova e sostituisci i link delle immagini nel contenuto
-    def replace_image(match):
-        image_name = match.group(1)
-        new_image_name = image_name.replace(" ", "-")
-        src_path = os.path.join(ATTACHMENTS_DIR, image_name)
-        dst_path = os.path.join(bundle_dir, new_image_name)
-        if os.path.exists(src_path):
-            shutil.copy2(src_path, dst_path)
-            print(f"  ✅ Copied content image: {new_image_name}")
-        else:
-            print(f"  ❌ Content image {image_name} not found")
-        return f"![{new_image_name}]({new_image_name})"
+        if cache is not None and link != new_image_name:
+            cache.remember_rename(link, new_image_name)
+        if attachment is not None:
+            src_path, src_st = attachment.path, attachment.stat
+            if optimizer is not None and optimizer.handles(src_path):
+                digest = cache.digest(src_path, src_st) if cache is not None else file_digest(src_path)
+                known, optimized = optimizer.lookup(digest)
+                if not known:
+                    optimizer.defer(src_path, digest, dst_path)
+                    log(f"  🗜️  {kind.capitalize()} image queued for optimisation: {new_image_name}")
+                    return
+                if optimized:
+                    src_path, src_st = optimized, None
+            if image_cache.place_file(src_path, dst_path, cache, stats, src_st):
+                log(f"  ✅ Copied {kind} image: {new_image_name}")
+            else:
+                log(f"  ⏭️  {kind.capitalize()} image unchanged: {new_image_name}")
+        elif not os.path.exists(dst_path):
+            # Le immagini già presenti solo nel bundle non sono un errore
+            log(f"  ❌ {kind.capitalize()} image {link} not found")
 
-    new_content = re.sub(IMAGE_REGEX, replace_image, content)
+    def image_info(link):
+        """
+        Dimensioni e colore dominante dell'immagine come verrà pubblicata
+        (dopo l'eventuale ridimensionamento): {width, height, color} o None.
+        """
+        if metadata is None:
+            return None
+        attachment = resolve_attachment(attachments, cache, link)
+        if attachment is None:
+            return None
+        digest = cache.digest(attachment.path, attachment.stat) if cache is not None else file_digest(attachment.path)
+        info = metadata.get(attachment.path, digest)
+        width, height = info["width"], info["height"]
+        if not width or not height:
+            return None
+        if optimizer is not None and optimizer.handles(attachment.path) and width > optimizer.max_width:
+            height = max(1, round(height * optimizer.max_width / width))
+            width = optimizer.max_width
+        return {"width": width, "height": height, "color": info.get("color")}
+
+    # Gestisci l'immagine specificata nel parametro 'image' del front matter
+    if image_name:
+        # Nel bundle l'immagine finisce sempre accanto a index.md
+        new_image_name = embeds.bundle_name(image_name)
+        place_image(image_name, new_image_name, "featured")
 
-    # Salva il file modificato
-    with open(markdown_file, "w", encoding="utf-8") as f:
-        f.write(new_content)
+        # Aggiorna il front matter solo se il nome dell'immagine va modificato
+        if image_name != new_image_name:
+            # Modifica solo la riga 'image', il resto del front matter resta invariato
+            patched = patch_front_matter_value(content, 'image', new_image_name)
+            if patched is not None:
+                content = patched
+            else:
+                front_matter, original_front_matter = parse_front_matter(content)
+                content = update_front_matter(content, front_matter, original_front_matter)
+
+        # Dimensioni dell'immagine in evidenza nel front matter (og:image:width/height)
+        info = image_info(image_name)
+        if info:
+            for key in ("width", "height"):
+                content = set_front_matter_value(content, "image" + key.capitalize(), info[key]) or content
+
+    # Riscrive embed e immagini del corpo in un solo passaggio, poi copia gli allegati referenziati
+    match = re.match(FRONT_MATTER_REGEX, content, re.DOTALL)
+    body_start = match.end() if match else 0
+    body, assets = embeds.rewrite_embeds(content[body_start:], image_info)
+    new_content = content[:body_start] + body
+    for asset in assets:
+        place_image(asset.link, asset.name, "content")
+
+    # Immagini del bundle non più referenziate da index.md
+    if gc is not None:
+        referenced = {asset.name for asset in assets}
+        referenced.update(bundle_gc.local_references(body))
+        referenced.update(embeds.bundle_name(name) for name in (image_name, cover_name) if isinstance(name, str))
+        referenced.update(os.path.basename(name) for name in (image_name, cover_name) if isinstance(name, str))
+        gc.sweep(bundle_dir, referenced, log)
+
+    # Salva il file solo se è cambiato, così mtime e git vedono solo modifiche reali
+    modified = write_text_if_changed(markdown_file, new_content, old_text=original_content)
+    if modified:
+        log(f"  ✏️  Updated {os.path.basename(markdown_file)}")
+    return modified
+
+def main():
+    parser = argparse.ArgumentParser(description='Copia le immagini nei page bundle multilingua')
+    parser.add_argument('--workers', type=int, default=1, help='Thread per elaborare i bundle in parallelo (default: 1, seriale)')
+    parser.add_argument('--no-optimize', action='store_true', help='Copia le PNG senza ottimizzarle')
+    parser.add_argument('--gc', action='store_true', help='Rimuovi le immagini dei bundle non più referenziate')
+    parser.add_argument('--gc-dry-run', action='store_true', help='Elenca le immagini orfane e lo spazio recuperabile senza rimuoverle')
+    args = parser.parse_args()
+    
+    gc = bundle_gc.AssetGC(dry_run=args.gc_dry_run) if args.gc or args.gc_dry_run else None
+    print("🖼️  Starting multilingual image processing...")
+    processed = process_multilingual_posts(workers=args.workers, optimize=not args.no_optimize, gc=gc)
+    print(f"\n✅ Processing completed! Processed {processed} post bundles.")
+    return True
 
 # Processo principale
-print("🖼️  Starting multilingual image processing...")
-processed = process_multilingual_posts()
-print(f"\n✅ Processing completed! Processed {processed} post bundles.")
\ No newline at end of file
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Rilevamento della lingua dei post per la sincronizzazione multilingua.
+Il testo viene ripulito (codice, link, immagini) su una finestra limitata
+con regex precompilate e langdetect lavora su un campione di lunghezza fissa
+con seed fissato, così lo stesso post finisce sempre nella stessa lingua.
+Per vault grandi il rilevamento può essere distribuito su un pool di processi.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+# Lingua di default, come DefaultContentLanguage in hugo.yaml
+DEFAULT_LANGUAGE = "it"
+
+# Lunghezza massima del campione passato a langdetect
+SAMPLE_CHARS = 2000
+# Porzione del corpo ripulita per ottenere il campione
+RAW_WINDOW_CHARS = SAMPLE_CHARS * 4
+# Sotto questa lunghezza il testo è troppo breve per essere affidabile
+MIN_SAMPLE_CHARS = 50
+# Sotto questa confidenza si usa la lingua di default
+MIN_CONFIDENCE = 0.80
+# Seed fisso per rendere langdetect deterministico
+DETECTOR_SEED = 0
+# Numero minimo di post per usare il pool di processi
+PARALLEL_THRESHOLD = 32
+
+# Regex precompilate per ripulire il markdown
+FRONT_MATTER_REGEX = re.compile(r'^---\s*\n.*?\n---\s*\n', re.DOTALL)
+CODE_BLOCK_REGEX = re.compile(r'```.*?```', re.DOTALL)
+INLINE_CODE_REGEX = re.compile(r'`[^`]*`')
+IMAGE_REGEX = re.compile(r'!\[.*?\]\(.*?\)')
+LINK_REGEX = re.compile(r'\[.*?\]\(.*?\)')
+EMBED_REGEX = re.compile(r'!?\[\[.*?\]\]')
+WHITESPACE_REGEX = re.compile(r'\s+')
+
+def build_sample(content):
+    """
+    Estrae dal post un campione di testo pulito e di lunghezza limitata:
+    rimuove front matter, blocchi di codice, codice inline, immagini, link
+    ed embed di Obsidian lavorando solo sulla parte iniziale del corpo.
+    """
+    match = FRONT_MATTER_REGEX.match(content)
+    body = content[match.end():] if match else content
+    window = body[:RAW_WINDOW_CHARS]
+
+    window = CODE_BLOCK_REGEX.sub(' ', window)
+    # Un blocco di codice aperto e tagliato dalla finestra viene scartato
+    unterminated = window.find('```')
+    if unterminated != -1:
+        window = window[:unterminated]
+
+    window = INLINE_CODE_REGEX.sub(' ', window)
+    window = IMAGE_REGEX.sub(' ', window)
+    window = EMBED_REGEX.sub(' ', window)
+    window = LINK_REGEX.sub(' ', window)
+    return WHITESPACE_REGEX.sub(' ', window).strip()[:SAMPLE_CHARS]
+
+def language_from_front_matter(front_matter):
+    """Restituisce la lingua dichiarata nel front matter ('lang' o 'language'), se presente."""
+    lang = front_matter.get('lang') or front_matter.get('language')
+    return str(lang).lower() if lang else None
+
+def _init_detector():
+    """Imposta il seed di langdetect nel processo corrente."""
+    from langdetect import DetectorFactory
+    DetectorFactory.seed = DETECTOR_SEED
+
+def detect_sample(sample, default=DEFAULT_LANGUAGE):
+    """
+    Rileva la lingua di un campione già ripulito.
+    Restituisce (lingua, confidenza); per campioni troppo brevi, errori
+    o confidenza insufficiente restituisce la lingua di default.
+    """
+    if len(sample) < MIN_SAMPLE_CHARS:
+        return default, 0.0
+    try:
+        from langdetect import detect_langs
+        _init_detector()
+        best = detect_langs(sample)[0]
+    except Exception as e:
+        print(f"⚠️  Errore nella rilevazione della lingua: {e}, assumo {default}")
+        return default, 0.0
+    if best.prob < MIN_CONFIDENCE:
+        return default, best.prob
+    return best.lang, best.prob
+
+def detect_language(content, front_matter, default=DEFAULT_LANGUAGE):
+    """Rileva la lingua di un singolo post; restituisce (lingua, confidenza)."""
+    declared = language_from_front_matter(front_matter)
+    if declared:
+        return declared, 1.0
+    return detect_sample(build_sample(content), default)
+
+def detect_samples(samples, workers=None, default=DEFAULT_LANGUAGE):
+    """
+    Rileva la lingua di campioni già estratti con build_sample (nome -> campione);
+    restituisce nome -> (lingua, confidenza). Con almeno PARALLEL_THRESHOLD
+    campioni il rilevamento viene eseguito su un pool di processi.
+    """
+    results = {}
+    names = sorted(samples)
+    if len(names) >= PARALLEL_THRESHOLD and (workers is None or workers > 1):
+        max_workers = workers or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            detected = pool.map(detect_sample, [samples[name] for name in names],
+                                [default] * len(names), chunksize=8)
+            results.update(zip(names, detected))
+    else:
+        for name in names:
+            results[name] = detect_sample(samples[name], default)
+    return results
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Cache persistente (SQLite) dei metadati analizzati dei post:
+front matter e lingua rilevata, indicizzati per percorso, dimensione,
+mtime e hash del contenuto. Una voce vale finché la firma del file non
+cambia; se cambia solo la firma ma l'hash è lo stesso viene rivalidata.
+Le esecuzioni successive non rianalizzano i file non modificati.
+"""
+
+import atexit
+import os
+import pickle
+import sqlite3
+import threading
+
+# Percorsi
+METADATA_CACHE_FILE = "/Users/lorenzo/Documents/GitHub/LolloBlog/.metadata_cache.sqlite"
+
+SCHEMA_VERSION = 1
+
+class MetadataCache:
+    """Cache dei metadati dei post su SQLite."""
+
+    def __init__(self, path=None):
+        self.path = path or METADATA_CACHE_FILE
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS posts")
+            self._conn.execute("PRAGMA user_version=%d" % SCHEMA_VERSION)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS posts (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                hash TEXT,
+                front_matter BLOB NOT NULL,
+                language TEXT,
+                confidence REAL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, path, st, digest=None):
+        """
+        Restituisce la voce in cache per un file, o None se non è valida.
+        Con digest la voce viene rivalidata anche se è cambiato solo l'mtime.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, hash, front_matter, language, confidence FROM posts WHERE path = ?",
+                (path,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            size, mtime_ns, cached_hash, front_matter, language, confidence = row
+            if (size, mtime_ns) != (st.st_size, st.st_mtime_ns):
+                if digest is None or digest != cached_hash:
+                    self.misses += 1
+                    return None
+                self._conn.execute("UPDATE posts SET size = ?, mtime_ns = ? WHERE path = ?",
+                                   (st.st_size, st.st_mtime_ns, path))
+            elif digest is not None and cached_hash is None:
+                self._conn.execute("UPDATE posts SET hash = ? WHERE path = ?", (digest, path))
+            self.hits += 1
+        return {
+            "hash": cached_hash or digest,
+            "front_matter": pickle.loads(front_matter),
+            "language": language,
+            "confidence": confidence,
+        }
+
+    def put(self, path, st, front_matter, digest=None, language=None, confidence=None):
+        """Salva il front matter analizzato (e opzionalmente la lingua) di un file."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO posts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path, st.st_size, st.st_mtime_ns, digest,
+                 pickle.dumps(front_matter, protocol=pickle.HIGHEST_PROTOCOL), language, confidence))
+
+    def prune(self, directory, keep_paths):
+        """Rimuove le voci dei file di una cartella che non esistono più."""
+        prefix = os.path.join(directory, "")
+        with self._lock:
+            paths = [row[0] for row in self._conn.execute("SELECT path FROM posts")]
+            stale = [(path,) for path in paths if path.startswith(prefix) and path not in keep_paths]
+            self._conn.executemany("DELETE FROM posts WHERE path = ?", stale)
+        return len(stale)
+
+    def commit(self):
+        """Scrive su disco le modifiche in sospeso."""
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        """Scrive le modifiche e chiude il database."""
+        self.commit()
+        self._conn.close()
+
+def cached_front_matter(cache, path, parse):
+    """
+    Restituisce il front matter di un file usando la cache se valida,
+    altrimenti lo analizza con parse(path) e lo salva.
+    """
+    st = os.stat(path)
+    if cache is not None:
+        entry = cache.get(path, st)
+        if entry is not None:
+            return entry["front_matter"]
+    front_matter = parse(path)
+    if cache is not None:
+        cache.put(path, st, front_matter)
+    return front_matter
+
+# Cache condivisa dagli stage eseguiti nello stesso processo
+_shared_cache = None
+
+def get_cache():
+    """Restituisce la cache condivisa; None se il database non è utilizzabile."""
+    global _shared_cache
+    if _shared_cache is None:
+        try:
+            _shared_cache = MetadataCache()
+        except sqlite3.Error as e:
+            print(f"⚠️  Metadata cache disabled: {e}")
+            return None
+        atexit.register(_shared_cache.close)
+    return _shared_cache
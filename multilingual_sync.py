@@ -5,17 +5,21 @@ Rileva automaticamente la lingua dei post e li sincronizza nelle cartelle corret
 """
 
 import os
-import shutil
 import re
 import yaml
 from pathlib import Path
-from langdetect import detect
 import argparse
 
+import language_detect
+import metadata_cache
+import sync_manifest
+from frontmatter import load_front_matter, load_yaml
+from fileutils import bytes_digest
+
 # Percorsi
 OBSIDIAN_POST_DIR = "/Users/lorenzo/Library/Mobile Documents/iCloud~md~obsidian/Documents/Ken vault/08 - Blog/"
-HUGO_IT_POST_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog/content/it/posts"
-HUGO_EN_POST_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog/content/en/posts"
+HUGO_IT_POST_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog/content/it/post"
+HUGO_EN_POST_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog/content/en/post"
 EXCLUDE_FILE = "/Users/lorenzo/Documents/GitHub/LolloBlog/.rsyncexclude"
 
 # Regex per estrarre il front matter YAML
@@ -26,7 +30,7 @@ def parse_front_matter(content):
     match = re.match(FRONT_MATTER_REGEX, content, re.DOTALL)
     if match:
         try:
-            front_matter = yaml.safe_load(match.group(1)) or {}
+            front_matter = load_yaml(match.group(1)) or {}
             return front_matter, match.end()
         except yaml.YAMLError as e:
             print(f"❌ Error parsing YAML front matter: {e}")
@@ -39,32 +43,18 @@ def detect_language(content, front_matter):
     Controlla prima il front matter per un campo 'lang' o 'language',
     poi cerca di rilevare automaticamente dalla lingua del contenuto.
     """
-    # Controllo esplicito nel front matter
-    lang = front_matter.get('lang') or front_matter.get('language')
-    if lang:
-        return lang.lower()
-    
-    # Rilevazione automatica dal contenuto
-    try:
-        # Rimuovi il front matter e codice per migliorare la rilevazione
-        content_without_fm = content[content.find('---', 3) + 3:] if '---' in content else content
-        # Rimuovi blocchi di codice
-        content_clean = re.sub(r'```.*?```', '', content_without_fm, flags=re.DOTALL)
-        content_clean = re.sub(r'`[^`]*`', '', content_clean)
-        # Rimuovi link e immagini
-        content_clean = re.sub(r'!\[.*?\]\(.*?\)', '', content_clean)
-        content_clean = re.sub(r'\[.*?\]\(.*?\)', '', content_clean)
-        
-        if len(content_clean.strip()) < 50:
-            print("⚠️  Contenuto troppo breve per rilevare la lingua, assumo italiano")
-            return 'it'
-            
-        detected = detect(content_clean)
-        print(f"🔍 Lingua rilevata automaticamente: {detected}")
-        return detected
-    except Exception as e:
-        print(f"⚠️  Errore nella rilevazione della lingua: {e}, assumo italiano")
-        return 'it'
+    language, confidence = language_detect.detect_language(content, front_matter)
+    report_language("post", front_matter, language, confidence)
+    return language
+
+def report_language(filename, front_matter, language, confidence):
+    """Stampa la lingua rilevata automaticamente e la sua confidenza."""
+    if language_detect.language_from_front_matter(front_matter):
+        return
+    if confidence >= language_detect.MIN_CONFIDENCE:
+        print(f"🔍 Lingua rilevata automaticamente per {filename}: {language} (confidenza {confidence:.2f})")
+    else:
+        print(f"⚠️  Lingua incerta per {filename} (confidenza {confidence:.2f}), assumo {language}")
 
 def is_draft_post(front_matter):
     """Controlla se un post è marcato come draft."""
@@ -87,15 +77,14 @@ def create_exclude_file():
     
     print(f"🔍 Scanning for draft posts in: {OBSIDIAN_POST_DIR}")
     
+    cache = metadata_cache.get_cache()
     for filename in os.listdir(OBSIDIAN_POST_DIR):
         if filename.endswith(".md"):
             file_path = os.path.join(OBSIDIAN_POST_DIR, filename)
             
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                
-                front_matter, _ = parse_front_matter(content)
+                # Front matter dalla cache o dal solo blocco iniziale della nota
+                front_matter = metadata_cache.cached_front_matter(cache, file_path, load_front_matter)
                 
                 # Controlla se il post è in draft
                 if is_draft_post(front_matter):
@@ -122,8 +111,19 @@ def create_exclude_file():
         print(f"❌ Error creating exclude file: {e}")
         return False
 
-def sync_posts():
-    """Sincronizza i post da Obsidian a Hugo con supporto multilingua."""
+def sync_posts(force=False, workers=None, catalog=None):
+    """
+    Sincronizza i post da Obsidian a Hugo con supporto multilingua.
+    Ogni nota viene scritta direttamente in content/<lingua>/post/<bundle>/index.md,
+    senza passare da content/posts: una lettura e una scrittura per nota cambiata.
+    Usa il manifest persistente per copiare solo le note cambiate
+    e rimuovere i bundle delle note eliminate o tornate in draft.
+    Con un catalogo i draft vengono presi dal catalogo invece che dal file di esclusione.
+    Con force tutte le note vengono ricopiate; i bundle delle note rimosse
+    vengono eliminati anche in questo caso.
+    Le note con lingua dichiarata o già in cache vengono scritte man mano;
+    per le altre viene tenuto in memoria solo il campione per il rilevamento.
+    """
     if not os.path.exists(OBSIDIAN_POST_DIR):
         print(f"❌ Error: Obsidian directory not found: {OBSIDIAN_POST_DIR}")
         return False
@@ -134,17 +134,63 @@ def sync_posts():
     
     # Leggi il file di esclusione
     excluded_files = set()
-    if os.path.exists(EXCLUDE_FILE):
+    if catalog is not None:
+        excluded_files = set(os.path.basename(record.path) for record in catalog.vault_drafts())
+    elif os.path.exists(EXCLUDE_FILE):
         with open(EXCLUDE_FILE, "r", encoding="utf-8") as f:
             excluded_files = set(line.strip() for line in f if line.strip())
     
-    posts_processed = 0
-    posts_it = 0
-    posts_en = 0
+    # Manifest della sincronizzazione precedente: con force le note vengono
+    # ricopiate tutte, ma le voci servono comunque per rimuovere i bundle
+    # delle note eliminate o tornate in draft
+    manifest = sync_manifest.load_manifest()
+    entries = manifest["posts"]
+    seen_files = set()
+    
+    counts = {"copied": 0, "it": 0, "en": 0}
+    posts_skipped = 0
+    posts_removed = 0
     
     print(f"🔄 Sincronizzazione post da Obsidian...")
     
-    for filename in os.listdir(OBSIDIAN_POST_DIR):
+    cache = metadata_cache.get_cache()
+    
+    def place_note(filename, source_st, digest, raw, language):
+        """Scrive la nota nel bundle della sua lingua e aggiorna il manifest."""
+        target_dir = get_target_directory(language)
+        
+        # Crea directory bundle
+        bundle_name = filename[:-3]  # Rimuovi .md
+        bundle_dir = os.path.join(target_dir, bundle_name)
+        os.makedirs(bundle_dir, exist_ok=True)
+        
+        # Copia il file markdown come index.md
+        dest_path = os.path.join(bundle_dir, "index.md")
+        
+        # Se la lingua è cambiata, rimuovi il bundle nella vecchia cartella
+        entry = entries.get(filename)
+        if entry and entry["target"]["path"] != dest_path:
+            sync_manifest.remove_target_bundle(entry)
+        
+        # Scrive il contenuto già letto, mantenendo l'mtime della nota come copy2
+        with open(dest_path, "wb") as f:
+            f.write(raw)
+        os.utime(dest_path, ns=(source_st.st_atime_ns, source_st.st_mtime_ns))
+        sync_manifest.record_post(manifest, filename, source_st, digest, language, dest_path)
+        
+        if language == 'en':
+            counts["en"] += 1
+            print(f"🇺🇸 English post: {filename} -> {target_dir}/{bundle_name}/")
+        else:
+            counts["it"] += 1
+            print(f"🇮🇹 Italian post: {filename} -> {target_dir}/{bundle_name}/")
+        counts["copied"] += 1
+    
+    # Note cambiate senza lingua nota: solo il campione per il rilevamento,
+    # il contenuto viene riletto al momento della scrittura
+    pending = {}
+    
+    for filename in sorted(os.listdir(OBSIDIAN_POST_DIR)):
         if not filename.endswith(".md"):
             continue
             
@@ -153,49 +199,108 @@ def sync_posts():
             continue
         
         source_path = os.path.join(OBSIDIAN_POST_DIR, filename)
+        seen_files.add(filename)
+        entry = entries.get(filename)
         
         try:
-            with open(source_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            source_st = os.stat(source_path)
             
-            front_matter, _ = parse_front_matter(content)
+            # Nota e bundle identici all'ultima esecuzione: nessuna lettura necessaria
+            if not force and sync_manifest.source_unchanged(entry, source_st) and sync_manifest.target_unchanged(entry):
+                posts_skipped += 1
+                continue
             
-            # Rileva la lingua
-            language = detect_language(content, front_matter)
-            target_dir = get_target_directory(language)
+            with open(source_path, "rb") as f:
+                raw = f.read()
+            digest = bytes_digest(raw)
             
-            # Crea directory bundle
-            bundle_name = filename[:-3]  # Rimuovi .md
-            bundle_dir = os.path.join(target_dir, bundle_name)
-            os.makedirs(bundle_dir, exist_ok=True)
+            # Solo mtime cambiato (es. "touch" o sync iCloud): aggiorna il manifest senza copiare
+            if not force and entry and entry["source"]["hash"] == digest and sync_manifest.target_matches_hash(entry):
+                sync_manifest.record_post(manifest, filename, source_st, digest, entry["language"],
+                                          entry["target"]["path"], entry["target"]["hash"])
+                posts_skipped += 1
+                continue
             
-            # Copia il file markdown come index.md
-            dest_path = os.path.join(bundle_dir, "index.md")
-            shutil.copy2(source_path, dest_path)
+            # Front matter e lingua già noti per questo contenuto: niente analisi
+            cached = cache.get(source_path, source_st, digest) if cache is not None else None
+            if cached is not None and cached["language"]:
+                report_language(filename, cached["front_matter"], cached["language"], cached["confidence"])
+                place_note(filename, source_st, digest, raw, cached["language"])
+                continue
             
-            if language == 'en':
-                posts_en += 1
-                print(f"🇺🇸 English post: {filename} -> {target_dir}/{bundle_name}/")
-            else:
-                posts_it += 1
-                print(f"🇮🇹 Italian post: {filename} -> {target_dir}/{bundle_name}/")
+            content = raw.decode("utf-8")
+            front_matter, _ = parse_front_matter(content)
+            declared = language_detect.language_from_front_matter(front_matter)
+            if declared:
+                # Lingua dichiarata: la nota viene scritta subito
+                report_language(filename, front_matter, declared, 1.0)
+                if cache is not None:
+                    cache.put(source_path, source_st, front_matter, digest, declared, 1.0)
+                place_note(filename, source_st, digest, raw, declared)
+                continue
             
-            posts_processed += 1
+            pending[filename] = (source_st, digest, front_matter, language_detect.build_sample(content))
+            
+        except Exception as e:
+            print(f"❌ Error processing {filename}: {e}")
+            continue
+    
+    # Rileva la lingua delle note rimaste (su più processi per vault grandi)
+    languages = language_detect.detect_samples(
+        {filename: item[3] for filename, item in pending.items()}, workers=workers)
+    
+    for filename in sorted(pending):
+        source_st, digest, front_matter, _ = pending.pop(filename)
+        source_path = os.path.join(OBSIDIAN_POST_DIR, filename)
+        
+        try:
+            language, confidence = languages[filename]
+            report_language(filename, front_matter, language, confidence)
+            if cache is not None:
+                cache.put(source_path, source_st, front_matter, digest, language, confidence)
+            with open(source_path, "rb") as f:
+                raw = f.read()
+                current_st = os.fstat(f.fileno())
+            if (current_st.st_size, current_st.st_mtime_ns) != (source_st.st_size, source_st.st_mtime_ns):
+                # Nota modificata durante la sincronizzazione: registra il contenuto scritto
+                source_st, digest = current_st, bytes_digest(raw)
+            place_note(filename, source_st, digest, raw, language)
             
         except Exception as e:
             print(f"❌ Error processing {filename}: {e}")
             continue
     
+    # Rimuovi i bundle delle note eliminate o tornate in draft
+    for filename in sorted(set(entries) - seen_files):
+        try:
+            sync_manifest.remove_target_bundle(entries[filename])
+            del entries[filename]
+            posts_removed += 1
+            print(f"🗑️  Removed post no longer published: {filename}")
+        except Exception as e:
+            print(f"❌ Error removing {filename}: {e}")
+    
+    sync_manifest.save_manifest(manifest)
+    if cache is not None:
+        # Dimentica le note non più presenti nel vault
+        listed_paths = {os.path.join(OBSIDIAN_POST_DIR, filename) for filename in os.listdir(OBSIDIAN_POST_DIR)}
+        cache.prune(OBSIDIAN_POST_DIR, listed_paths)
+        cache.commit()
+    
     print(f"\n✅ Sincronizzazione completata:")
-    print(f"   📊 Post processati: {posts_processed}")
-    print(f"   🇮🇹 Post italiani: {posts_it}")
-    print(f"   🇺🇸 Post inglesi: {posts_en}")
+    print(f"   📥 Post copiati: {counts['copied']}")
+    print(f"   ⏭️  Post invariati (saltati): {posts_skipped}")
+    print(f"   🗑️  Post rimossi: {posts_removed}")
+    print(f"   🇮🇹 Post italiani copiati: {counts['it']}")
+    print(f"   🇺🇸 Post inglesi copiati: {counts['en']}")
     
     return True
 
 def main():
     parser = argparse.ArgumentParser(description='Sincronizza post multilingua da Obsidian a Hugo')
     parser.add_argument('--dry-run', action='store_true', help='Mostra cosa verrebbe fatto senza eseguire')
+    parser.add_argument('--full', action='store_true', help='Ricopia tutti i post anche se invariati (i bundle delle note rimosse vengono comunque eliminati)')
+    parser.add_argument('--workers', type=int, default=None, help='Processi per il rilevamento della lingua (default: numero di CPU)')
     args = parser.parse_args()
     
     if args.dry_run:
@@ -209,7 +314,7 @@ def main():
     
     # Step 2: Sincronizza post
     print("\nStep 2: Sincronizzazione post multilingua...")
-    if not sync_posts():
+    if not sync_posts(force=args.full, workers=args.workers):
         return False
     
     print("\n🎉 Sincronizzazione multilingua completata con successo!")
@@ -13,6 +13,9 @@ import re
 import yaml
 from pathlib import Path
 
+import vault_catalog
+from frontmatter import load_yaml
+
 # Percorsi
 HUGO_POSTS_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog/content/posts"
 HUGO_IT_POSTS_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog/content/it/post"
@@ -26,14 +29,14 @@ def parse_front_matter(content):
     match = re.match(FRONT_MATTER_REGEX, content, re.DOTALL)
     if match:
         try:
-            front_matter = yaml.safe_load(match.group(1)) or {}
+            front_matter = load_yaml(match.group(1)) or {}
             return front_matter
         except yaml.YAMLError as e:
             print(f"❌ Error parsing YAML front matter: {e}")
             return {}
     return {}
 
-def get_language_from_post(post_path):
+def get_language_from_post(post_path, catalog=None):
     """Estrae la lingua dal front matter del post."""
     index_file = os.path.join(post_path, "index.md")
     if not os.path.exists(index_file):
@@ -41,20 +44,15 @@ def get_language_from_post(post_path):
         return None
     
     try:
-        with open(index_file, "r", encoding="utf-8") as f:
-            content = f.read()
-        
-        front_matter = parse_front_matter(content)
-        
-        # Cerca il campo language o lang
-        language = front_matter.get('language') or front_matter.get('lang')
-        return language
+        # Campo language o lang già estratto dal catalogo
+        catalog = catalog or vault_catalog.get_catalog()
+        return catalog.record_for(index_file, os.path.basename(post_path)).language
         
     except Exception as e:
         print(f"❌ Error reading {index_file}: {e}")
         return None
 
-def organize_posts():
+def organize_posts(catalog=None):
     """Organizza i post nelle cartelle per lingua."""
     if not os.path.exists(HUGO_POSTS_DIR):
         print(f"⚠️  Source directory not found: {HUGO_POSTS_DIR}")
@@ -68,21 +66,19 @@ def organize_posts():
     
     print(f"🔍 Scanning posts in: {HUGO_POSTS_DIR}")
     
-    for item in os.listdir(HUGO_POSTS_DIR):
-        item_path = os.path.join(HUGO_POSTS_DIR, item)
-        
-        # Salta file che non sono cartelle
-        if not os.path.isdir(item_path):
-            continue
-            
-        # Salta cartelle che iniziano con punto
-        if item.startswith('.'):
+    catalog = catalog or vault_catalog.get_catalog()
+    for record in catalog.posts_in(HUGO_POSTS_DIR):
+        # Salta i file .md non ancora convertiti in page bundle
+        if not record.is_bundle:
             continue
         
+        item = record.bundle_name
+        item_path = os.path.dirname(record.path)
+        
         print(f"\n� Processing post: {item}")
         
-        # Determina la lingua del post
-        language = get_language_from_post(item_path)
+        # Lingua del post dal catalogo
+        language = record.language
         
         if language == "it":
             # Sposta in cartella italiana
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Indice inverso dai bundle di content/ ai file generati da Hugo.
+
+Per ogni bundle (o file markdown) registra:
+- html: gli output della pagina per la sua lingua (index.html, index.json, ...),
+- images: le risorse copiate nella cartella della pagina e le varianti _hu_,
+- generated: la cache delle immagini elaborate in resources/_gen/images,
+- feeds: i feed index.xml e le sitemap che contengono la pagina,
+- search: gli indici di ricerca (index.json) che contengono la pagina.
+L'indice viene ricostruito dopo ogni generazione del sito e salvato su disco;
+remove_posts.py e remove_drafts.py lo usano per invalidare solo gli output
+del post rimosso invece di indovinarne la cartella in public/. Il post viene
+tolto anche dagli shard di search_index.py, e le copie .gz/.br dei file
+riscritti o rimossi vengono riallineate (precompress.py).
+"""
+
+import json
+import os
+import re
+from urllib.parse import unquote, urlparse
+
+import precompress
+import search_index
+import site_gc
+from fileutils import load_json, save_json, write_text_if_changed
+
+# Percorsi
+HUGO_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog"
+OUTPUT_INDEX_FILE = "/Users/lorenzo/Documents/GitHub/LolloBlog/.outputindex.json"
+
+OUTPUT_INDEX_VERSION = 1
+
+# Voci dei feed RSS (<item>) e delle sitemap (<url>) con il loro link
+LISTING_FILES = ("index.xml", "sitemap.xml")
+LISTING_ENTRY_REGEX = re.compile(r'[ \t]*<(item|url)>.*?</\1>[ \t]*\n?', re.DOTALL)
+LISTING_LINK_REGEX = re.compile(r'<(?:link|loc)>\s*(.*?)\s*</(?:link|loc)>', re.DOTALL)
+
+# Indici di ricerca del tema: lista JSON di voci con "permalink"
+SEARCH_INDEX_FILE = "index.json"
+
+def _link_path(link, base_path):
+    """Percorso relativo a public/ di un permalink (senza barre e senza il percorso del baseURL)."""
+    path = unquote(urlparse(link.strip()).path).strip("/")
+    if base_path and (path == base_path or path.startswith(base_path + "/")):
+        path = path[len(base_path):].strip("/")
+    return path
+
+def site_base_path(config):
+    """Percorso del baseURL (es. "blog" per https://example.org/blog/)."""
+    return urlparse(str(site_gc.config_value(config, "baseURL", "") or "")).path.strip("/")
+
+def load_search_index(path):
+    """Voci di un indice di ricerca, o None se il file non è un indice del tema."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, list) or not all(isinstance(item, dict) and "permalink" in item for item in data):
+        return None
+    return data
+
+def _scan_listings(public_dir, base_path):
+    """Associa ogni pagina ai feed/sitemap e agli indici di ricerca che la elencano."""
+    feeds, search = {}, {}
+    for root, _, files in os.walk(public_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, os.path.dirname(public_dir)).replace(os.sep, "/")
+            if name in LISTING_FILES:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    text = f.read()
+                for match in LISTING_ENTRY_REGEX.finditer(text):
+                    link = LISTING_LINK_REGEX.search(match.group(0))
+                    if link:
+                        feeds.setdefault(_link_path(link.group(1), base_path), set()).add(rel)
+            elif name == SEARCH_INDEX_FILE:
+                for item in load_search_index(path) or []:
+                    search.setdefault(_link_path(str(item["permalink"]), base_path), set()).add(rel)
+    return feeds, search
+
+def _page_files(directory, rel, site):
+    """File di una cartella di output, escluse le sottocartelle di altre pagine o liste."""
+    files = []
+    for root, dirs, names in os.walk(directory):
+        sub = os.path.relpath(root, directory).replace(os.sep, "/")
+        dirs[:] = sorted(d for d in dirs if not site.is_live_dir(site_gc.join_path(rel, "" if sub == "." else sub, d)))
+        files.extend(os.path.join(root, name) for name in sorted(names))
+    return files
+
+def build_output_index(hugo_dir=None, include_drafts=False):
+    """
+    Costruisce l'indice inverso dal content tree e dagli output presenti.
+    Va eseguito dopo la generazione del sito.
+    """
+    hugo_dir = hugo_dir or HUGO_DIR
+    config = site_gc.load_site_config(hugo_dir)
+    site = site_gc.live_outputs(hugo_dir, config, include_drafts)
+    public_dir = os.path.join(hugo_dir, "public")
+    images_dir = os.path.join(hugo_dir, "resources", "_gen", "images")
+    base_path = site_base_path(config)
+    feeds, search = _scan_listings(public_dir, base_path) if os.path.isdir(public_dir) else ({}, {})
+
+    def relative(path):
+        return os.path.relpath(path, hugo_dir).replace(os.sep, "/")
+
+    bundles = {}
+    for page, (language, source) in sorted(site.sources.items()):
+        page_dir = os.path.join(public_dir, page)
+        if not os.path.isdir(page_dir):
+            # Pagina non (ancora) generata
+            continue
+        entry = bundles.setdefault(relative(source), {
+            "language": language, "pages": [], "html": [], "images": [],
+            "generated": [], "feeds": [], "search": [],
+        })
+        entry["pages"].append(page)
+        for path in _page_files(page_dir, page, site):
+            entry["html" if os.path.basename(path).startswith("index.") else "images"].append(relative(path))
+        gen_dir = os.path.join(images_dir, page)
+        if os.path.isdir(gen_dir):
+            entry["generated"].extend(relative(path) for path in _page_files(gen_dir, page, site))
+        entry["feeds"] = sorted(set(entry["feeds"]) | feeds.get(page, set()))
+        entry["search"] = sorted(set(entry["search"]) | search.get(page, set()))
+
+    return {"version": OUTPUT_INDEX_VERSION, "base_path": base_path, "bundles": bundles}
+
+def load_output_index(path=None):
+    """Carica l'indice salvato; restituisce un indice vuoto se manca o è di un'altra versione."""
+    data = load_json(path or OUTPUT_INDEX_FILE)
+    if not isinstance(data, dict) or data.get("version") != OUTPUT_INDEX_VERSION:
+        return {"version": OUTPUT_INDEX_VERSION, "base_path": "", "bundles": {}}
+    return data
+
+def save_output_index(index, path=None):
+    """Salva l'indice sul disco."""
+    save_json(path or OUTPUT_INDEX_FILE, index)
+
+def find_bundles(index, bundle_name, language=None):
+    """Chiavi dell'indice di un bundle (o file markdown) con questo nome, per tutte le lingue o una."""
+    keys = []
+    for key, entry in index["bundles"].items():
+        name = os.path.basename(key)
+        if name.endswith(".md"):
+            name = name[:-3]
+        if name == bundle_name and (language is None or entry["language"] == language):
+            keys.append(key)
+    return sorted(keys)
+
+def _drop_listing_entries(path, pages, base_path):
+    """Rimuove da un feed o da una sitemap le voci che puntano alle pagine indicate."""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    dropped = 0
+
+    def drop(match):
+        nonlocal dropped
+        link = LISTING_LINK_REGEX.search(match.group(0))
+        if link and _link_path(link.group(1), base_path) in pages:
+            dropped += 1
+            return ""
+        return match.group(0)
+
+    write_text_if_changed(path, LISTING_ENTRY_REGEX.sub(drop, text), text)
+    return dropped
+
+def _drop_search_entries(path, pages, base_path):
+    """Rimuove da un indice di ricerca le voci che puntano alle pagine indicate."""
+    data = load_search_index(path)
+    if data is None:
+        return 0
+    kept = [item for item in data if _link_path(str(item["permalink"]), base_path) not in pages]
+    if len(kept) != len(data):
+        write_text_if_changed(path, json.dumps(kept, ensure_ascii=False, separators=(",", ":")))
+    return len(data) - len(kept)
+
+def invalidate_bundle(index, key, hugo_dir=None):
+    """
+    Invalida gli output di un bundle: cancella i file generati per la pagina e
+    rimuove le sue voci da feed, sitemap e indici di ricerca (index.json del tema
+    e shard di search_index.py), poi la toglie dall'indice. Le copie compresse
+    dei file toccati vengono ricompresse o rimosse.
+    Restituisce (file rimossi, voci rimosse).
+    """
+    hugo_dir = hugo_dir or HUGO_DIR
+    entry = index["bundles"].pop(key)
+    pages = set(entry["pages"])
+
+    removed = 0
+    for rel in entry["html"] + entry["images"] + entry["generated"]:
+        path = os.path.join(hugo_dir, rel)
+        if os.path.isfile(path):
+            os.remove(path)
+            removed += 1
+        precompress.refresh_compressed(path)
+    for page in entry["pages"]:
+        for root in ("public", os.path.join("resources", "_gen", "images")):
+            page_dir = os.path.join(hugo_dir, root, page)
+            for directory, _, _ in sorted(os.walk(page_dir), reverse=True):
+                if not os.listdir(directory):
+                    os.rmdir(directory)
+
+    dropped = 0
+    for rel in entry["feeds"] + entry["search"]:
+        path = os.path.join(hugo_dir, rel)
+        if not os.path.isfile(path):
+            continue
+        drop = _drop_listing_entries if rel in entry["feeds"] else _drop_search_entries
+        count = drop(path, pages, index.get("base_path", ""))
+        if count:
+            precompress.refresh_compressed(path)
+            dropped += count
+    count, rewritten = search_index.drop_pages(pages, hugo_dir)
+    for path in rewritten:
+        precompress.refresh_compressed(path)
+    return removed, dropped + count
+
+def main():
+    index = build_output_index()
+    save_output_index(index)
+    files = sum(len(entry["html"]) + len(entry["images"]) + len(entry["generated"])
+                for entry in index["bundles"].values())
+    print(f"🗂️  Output index: {len(index['bundles'])} bundle(s), {files} generated file(s)")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
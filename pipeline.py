@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Pipeline di pubblicazione del blog in un unico processo Python.
+Esegue gli stessi step di updateblog.sh, con la stessa numerazione e
+interrompendosi al primo errore, ma importa gli script come moduli:
+yaml viene importato una sola volta e il catalogo dei post viene
+condiviso tra gli stage invece di riscansionare il vault ogni volta.
+
+Con --direct le note vengono scritte direttamente nei bundle finali
+content/<lingua>/post/<bundle>/index.md (multilingual_sync.py): lo step 2
+sostituisce rsync e gli step 3, 4 e 7 non servono più.
+
+Se gli input di Hugo non sono cambiati dall'ultima pubblicazione
+(build_fingerprint.py) la generazione del sito e il commit vengono saltati;
+--force-build li esegue comunque. Il commit include solo i file di content/
+e public/ cambiati (delta_manifest.py); --deploy-dir copia i file di public/
+cambiati dall'ultimo deploy riuscito in quella cartella.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+import build_fingerprint
+import cleanup
+import convert_to_bundles
+import delta_manifest
+import image_cache
+import image_optimizer
+import images
+import metadata_cache
+import multilingual_sync
+import organize_multilang
+import output_index
+import precompress
+import remove_drafts
+import search_index
+import site_gc
+import sync_exclude_drafts
+import sync_manifest
+import vault_catalog
+
+# Percorsi (come in updateblog.sh)
+OBSIDIAN_POST_DIR = "/Users/lorenzo/Library/Mobile Documents/iCloud~md~obsidian/Documents/Ken vault/08 - Blog"
+HUGO_POST_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog/content/posts"
+EXCLUDE_FILE = "/Users/lorenzo/Documents/GitHub/LolloBlog/.rsyncexclude"
+HUGO_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog"
+
+# Script lanciati da updateblog.sh, usati per il confronto dei tempi
+SHELL_STAGE_SCRIPTS = {
+    1: "sync_exclude_drafts.py",
+    3: "convert_to_bundles.py",
+    4: "organize_multilang.py",
+    5: "remove_drafts.py",
+    6: "images.py",
+    7: "cleanup.py",
+}
+
+def run_command(args):
+    """Esegue un comando esterno mostrando l'output; True se termina con successo."""
+    return subprocess.run(args).returncode == 0
+
+def step_exclude_drafts(context):
+    return sync_exclude_drafts.create_exclude_file(context["catalog"])
+
+def step_rsync(context):
+    return run_command(["rsync", "-av", "--delete", f"--exclude-from={EXCLUDE_FILE}",
+                        f"{OBSIDIAN_POST_DIR}/", f"{HUGO_POST_DIR}/"])
+
+def step_direct_sync(context):
+    return multilingual_sync.sync_posts(catalog=context["catalog"])
+
+def step_convert_bundles(context):
+    return convert_to_bundles.convert_to_page_bundles(context["catalog"])
+
+def step_organize_multilang(context):
+    return organize_multilang.organize_posts(context["catalog"])
+
+def step_remove_drafts(context):
+    removed = remove_drafts.remove_draft_posts(context["catalog"])
+    print(f"🗑️  Removed {removed} draft post(s).")
+    return True
+
+def step_images(context):
+    processed = images.process_multilingual_posts(context["catalog"], workers=context.get("workers", 1))
+    print(f"✅ Processed {processed} post bundles.")
+    return True
+
+def step_cleanup(context):
+    return cleanup.cleanup_original_markdown_files()
+
+def step_chdir(context):
+    try:
+        os.chdir(HUGO_DIR)
+    except OSError:
+        return False
+    return True
+
+def step_hugo(context):
+    # Nessun input cambiato dall'ultima generazione riuscita: niente build né commit
+    needed, reason, state = build_fingerprint.check_build(HUGO_DIR)
+    if not needed and not context.get("force_build"):
+        print(f"⏭️  Hugo build skipped: {reason}")
+        context["build_skipped"] = True
+        return True
+    print(f"🔨 Building: {reason}" if needed else "🔨 Building: forced with --force-build")
+    if not run_command(["hugo", "--buildDrafts", "--buildFuture"]):
+        return False
+    # Hugo non rimuove gli output dei post eliminati: pulizia di public/ e resources/_gen
+    site_gc.sweep_outputs(HUGO_DIR, include_drafts=True)
+    # Indice di ricerca compatto per lingua, usato da layouts/page/search.html
+    search_index.build_search_index(HUGO_DIR, include_drafts=True)
+    # Copie .gz/.br dei file di testo cambiati
+    precompress.print_report(*precompress.precompress_public(HUGO_DIR))
+    # Indice inverso bundle -> output per le rimozioni mirate dei post
+    output_index.save_output_index(output_index.build_output_index(HUGO_DIR, include_drafts=True))
+    # File di content/ e public/ cambiati dall'ultima pubblicazione
+    delta, delta_state = delta_manifest.compute_delta(HUGO_DIR)
+    delta_manifest.save_delta(delta)
+    delta_manifest.print_delta(delta)
+    # Impronta e hash vengono registrati solo dopo il commit, così un commit fallito viene ritentato
+    context.update(build_state=state, delta=delta, delta_state=delta_state)
+    return True
+
+def record_publish(context):
+    """Registra l'impronta degli input e gli hash degli output appena pubblicati."""
+    build_fingerprint.save_state(context["build_state"])
+    delta_manifest.save_state(context["delta_state"])
+
+def step_commit(context):
+    if context.get("build_skipped"):
+        print("⏭️  Commit skipped: the site was not rebuilt")
+        return True
+    delta = context["delta"]
+    if not delta_manifest.delta_paths(delta):
+        print("⏭️  Commit skipped: no file changed in content/ or public/")
+        record_publish(context)
+        return True
+    # Solo i percorsi del delta invece di 'git add .' su tutto il repository
+    if not delta_manifest.stage_delta(delta, HUGO_DIR):
+        return False
+    if not run_command(["git", "commit", "-m", f"Aggiornamento blog multilingua {date.today().isoformat()}"]):
+        return False
+    record_publish(context)
+    return True
+
+def step_push(context):
+    if context.get("deploy_dir"):
+        # Confronto con il manifest della cartella di deploy, non con l'ultimo commit
+        files = context["delta_state"]["files"] if "delta_state" in context else None
+        copied, removed = delta_manifest.deploy_public(context["deploy_dir"], HUGO_DIR, files)
+        print(f"🚚 Deployed to {context['deploy_dir']}: {copied} file(s) copied, {removed} removed")
+    return run_command(["git", "push", "-u", "origin", "master"])
+
+# Step della pipeline: (numero, descrizione, funzione, messaggio di errore, messaggio di completamento)
+STEPS = [
+    (1, "Creazione file di esclusione per post draft...", step_exclude_drafts,
+     "Creazione file di esclusione fallita. Controlla il file sync_exclude_drafts.py.",
+     "File di esclusione creato."),
+    (2, "Sincronizzazione dei file markdown da Obsidian a Hugo (escludendo draft)...", step_rsync,
+     "Sincronizzazione con rsync fallita. Controlla i percorsi o installa rsync.",
+     "Sincronizzazione terminata."),
+    (3, "Conversione file markdown in page bundles...", step_convert_bundles,
+     "Conversione in page bundles fallita. Controlla il file convert_to_bundles.py.",
+     "Conversione page bundles terminata."),
+    (4, "Organizzazione post nelle cartelle multilingua...", step_organize_multilang,
+     "Organizzazione multilingua fallita. Controlla il file organize_multilang.py.",
+     "Post organizzati per lingua."),
+    (5, "Rimozione post draft dalle cartelle multilingua...", step_remove_drafts,
+     "Rimozione post draft fallita. Controlla il file remove_drafts.py.",
+     "Post draft rimossi."),
+    (6, "Elaborazione di markdown e immagini...", step_images,
+     "Elaborazione delle immagini fallita. Controlla il file images.py o i percorsi.",
+     "Elaborazione Python terminata."),
+    (7, "Pulizia file markdown duplicati...", step_cleanup,
+     "Pulizia file duplicati fallita. Controlla il file cleanup.py.",
+     "Pulizia terminata."),
+    (8, "Spostamento nella directory di Hugo...", step_chdir,
+     f"Impossibile cambiare directory in {HUGO_DIR}.",
+     f"Directory cambiata in {HUGO_DIR}."),
+    (9, "Generazione del sito con Hugo...", step_hugo,
+     "Generazione del sito con Hugo fallita. Controlla la configurazione.",
+     "Generazione del sito terminata."),
+    (10, "Aggiunta e commit dei file...", step_commit,
+     "Commit dei file fallito. Controlla lo stato del repository Git.",
+     "Commit eseguito."),
+    (11, "Push sul branch principale per Vercel...", step_push,
+     "Push sul branch principale fallito. Controlla la connessione SSH o il repository.",
+     "Push eseguito con successo."),
+]
+
+# Modalità diretta: step sostituiti e step non necessari (nessun passaggio da content/posts)
+DIRECT_STEPS = {
+    2: ("Sincronizzazione diretta delle note nei bundle multilingua (escludendo draft)...", step_direct_sync,
+        "Sincronizzazione diretta fallita. Controlla il file multilingual_sync.py.",
+        "Sincronizzazione terminata."),
+}
+DIRECT_SKIPPED_STEPS = (3, 4, 7)
+
+def run_pipeline(until=None, catalog=None, direct=False, workers=1, force_build=False, deploy_dir=None):
+    """
+    Esegue gli step in ordine fino a 'until' (incluso) e si ferma al primo errore.
+    Con direct=True usa la sincronizzazione diretta nei bundle e salta gli step
+    di conversione, organizzazione e pulizia. workers è il numero di thread
+    usati per le immagini. Con force_build=True il sito viene rigenerato anche
+    se gli input non sono cambiati. Con deploy_dir i file di public/ cambiati
+    dall'ultimo deploy in quella cartella vengono copiati prima del push.
+    Restituisce (successo, tempi per step in secondi).
+    """
+    context = {"catalog": catalog or vault_catalog.get_catalog(), "workers": workers,
+               "force_build": force_build, "deploy_dir": deploy_dir}
+    timings = {}
+
+    for number, description, step, error_message, done_message in STEPS:
+        if until is not None and number > until:
+            break
+        if direct and number in DIRECT_SKIPPED_STEPS:
+            print(f"Step {number}: saltato (sincronizzazione diretta nei bundle).")
+            continue
+        if direct and number in DIRECT_STEPS:
+            description, step, error_message, done_message = DIRECT_STEPS[number]
+        print(f"Step {number}: {description}")
+        start = time.perf_counter()
+        try:
+            success = step(context)
+        except Exception as e:
+            print(f"❌ {e}")
+            success = False
+        timings[number] = time.perf_counter() - start
+        if not success:
+            print(f"Errore: {error_message}")
+            return False, timings
+        print(f"Step {number} completato: {done_message}")
+
+    return True, timings
+
+def shell_comparison_paths():
+    """File e cartelle letti e scritti dagli step 1-7: contenuti, output e cache locali."""
+    return [os.path.join(HUGO_DIR, "content"), os.path.join(HUGO_DIR, "public"),
+            os.path.join(HUGO_DIR, "resources"), sync_manifest.SYNC_MANIFEST_FILE,
+            metadata_cache.METADATA_CACHE_FILE, metadata_cache.METADATA_CACHE_FILE + "-wal",
+            metadata_cache.METADATA_CACHE_FILE + "-shm", image_cache.IMAGE_CACHE_FILE,
+            image_optimizer.OPTIMIZED_CACHE_DIR, output_index.OUTPUT_INDEX_FILE]
+
+def snapshot_paths(paths, snapshot_dir):
+    """
+    Copia file e cartelle in snapshot_dir mantenendo gli mtime.
+    Restituisce {percorso: copia, o None se il percorso non esiste}.
+    """
+    saved = {}
+    for number, path in enumerate(paths):
+        copy = os.path.join(snapshot_dir, str(number))
+        if os.path.isdir(path):
+            shutil.copytree(path, copy, symlinks=True)
+        elif os.path.isfile(path):
+            shutil.copy2(path, copy)
+        else:
+            copy = None
+        saved[path] = copy
+    return saved
+
+def restore_paths(saved):
+    """Riporta i percorsi allo stato di snapshot_paths (anche rimuovendo quelli creati dopo)."""
+    for path, copy in saved.items():
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        elif os.path.lexists(path):
+            os.remove(path)
+        if copy is not None:
+            shutil.move(copy, path)
+
+def compare_shell_stages(until):
+    """
+    Cronometra gli step 1-7 come in updateblog.sh partendo dallo stesso stato
+    della pipeline: contenuti, output e cache vengono salvati prima e
+    ripristinati dopo, così gli step in un unico processo non trovano manifest,
+    cache e bundle già aggiornati dalla versione shell. Resta condivisa solo la
+    cache dei file del sistema operativo.
+    """
+    snapshot_dir = tempfile.mkdtemp(prefix="compare-shell-")
+    try:
+        saved = snapshot_paths(shell_comparison_paths(), snapshot_dir)
+        try:
+            return time_shell_stages(until)
+        finally:
+            restore_paths(saved)
+    finally:
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+def time_shell_stages(until):
+    """
+    Cronometra gli step 1-7 eseguiti come in updateblog.sh:
+    un nuovo interprete python3 per ogni script, più rsync.
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    start = time.perf_counter()
+    for number in range(1, min(until, 7) + 1):
+        if number == 2:
+            ok = run_command(["rsync", "-a", "--delete", f"--exclude-from={EXCLUDE_FILE}",
+                              f"{OBSIDIAN_POST_DIR}/", f"{HUGO_POST_DIR}/"])
+        else:
+            result = subprocess.run([sys.executable, os.path.join(script_dir, SHELL_STAGE_SCRIPTS[number])],
+                                    stdout=subprocess.DEVNULL)
+            ok = result.returncode == 0
+        if not ok:
+            print(f"❌ Shell-style step {number} failed")
+            return None
+    return time.perf_counter() - start
+
+def print_timings(timings, shell_seconds=None):
+    """Stampa i tempi per step e il totale, con il confronto rispetto alla versione shell."""
+    total = sum(timings.values())
+    print("\n⏱️  Tempi per step:")
+    for number, seconds in timings.items():
+        print(f"   Step {number:>2}: {seconds:8.3f}s")
+    print(f"   Totale:  {total:8.3f}s")
+
+    if shell_seconds is not None:
+        in_process = sum(seconds for number, seconds in timings.items() if number <= 7)
+        print(f"\n📊 Step 1-7 come updateblog.sh: {shell_seconds:.3f}s, in un unico processo: {in_process:.3f}s")
+        if in_process > 0:
+            print(f"   Speedup: {shell_seconds / in_process:.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description='Pubblica il blog eseguendo tutti gli step in un unico processo')
+    parser.add_argument('--until', type=int, default=len(STEPS), help='Esegui solo gli step fino a questo numero')
+    parser.add_argument('--compare-shell', action='store_true',
+                        help='Cronometra prima gli step 1-7 come li esegue updateblog.sh, poi ripristina lo stato iniziale')
+    parser.add_argument('--direct', action='store_true',
+                        help='Scrivi le note direttamente in content/<lingua>/post senza rsync né content/posts')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Thread per elaborare i bundle nello step delle immagini (default: 1, seriale)')
+    parser.add_argument('--force-build', action='store_true',
+                        help='Rigenera il sito e crea il commit anche se gli input non sono cambiati')
+    parser.add_argument('--deploy-dir',
+                        help="Cartella di deploy locale in cui copiare solo i file di public/ cambiati dall'ultimo deploy in essa")
+    args = parser.parse_args()
+
+    shell_seconds = compare_shell_stages(args.until) if args.compare_shell else None
+
+    print("🌐 Avvio sincronizzazione multilingua del blog...")
+    success, timings = run_pipeline(until=args.until, direct=args.direct, workers=args.workers,
+                                    force_build=args.force_build, deploy_dir=args.deploy_dir)
+    print_timings(timings, shell_seconds)
+
+    if not success:
+        return False
+
+    print("")
+    print("🎉 Aggiornamento blog multilingua completato con successo!")
+    print("🌐 Il blog è ora disponibile in italiano e inglese")
+    print("🇮🇹 Post italiani: content/it/post")
+    print("🇺🇸 Post inglesi: content/en/post")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
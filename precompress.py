@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Precompressione dei file di testo di public/ (.gz e, se disponibile, .br).
+
+Per ogni file HTML, XML, JSON, CSS, JS, SVG, ... più grande di MIN_SIZE scrive
+accanto all'originale una copia gzip (livello 9) e una brotli (qualità 11),
+così il server può inviarle senza comprimere a ogni richiesta. Le copie che
+non sono più piccole dell'originale non vengono scritte.
+Hugo riscrive tutti i file a ogni generazione: una cache registra l'hash del
+contenuto compresso l'ultima volta, così vengono ricompressi solo i file il
+cui contenuto è cambiato. Le compressioni nuove vengono eseguite su un pool
+di processi. brotli è opzionale: se non è installato vengono scritti solo i .gz.
+"""
+
+import argparse
+import gzip
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from fileutils import atomic_write_bytes, file_digest, format_bytes, load_json, save_json, stat_signature
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Percorsi
+HUGO_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog"
+PRECOMPRESS_CACHE_FILE = "/Users/lorenzo/Documents/GitHub/LolloBlog/.precompress.json"
+
+PRECOMPRESS_CACHE_VERSION = 1
+
+# File di testo da comprimere e dimensione minima (sotto non conviene)
+TEXT_SUFFIXES = (".html", ".xml", ".json", ".css", ".js", ".mjs", ".svg", ".txt", ".map",
+                 ".webmanifest")
+MIN_SIZE = 256
+
+# Estensioni delle copie compresse per formato
+COMPRESSED_SUFFIXES = {"gzip": ".gz", "brotli": ".br"}
+
+def available_formats():
+    """Formati di compressione disponibili."""
+    return ["gzip", "brotli"] if brotli is not None else ["gzip"]
+
+def compress(data, fmt):
+    """Comprime un contenuto al livello massimo; l'output è deterministico (nessun mtime nel .gz)."""
+    if fmt == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+def compress_file(path, formats):
+    """
+    Scrive le copie compresse di un file; rimuove quelle che non sarebbero più piccole.
+    Restituisce {formato: dimensione compressa o None}.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    sizes = {}
+    for fmt in formats:
+        target = path + COMPRESSED_SUFFIXES[fmt]
+        compressed = compress(data, fmt)
+        if len(compressed) < len(data):
+            atomic_write_bytes(target, compressed)
+            sizes[fmt] = len(compressed)
+        else:
+            if os.path.exists(target):
+                os.remove(target)
+            sizes[fmt] = None
+    return sizes
+
+def refresh_compressed(path):
+    """
+    Riallinea le copie compresse di un file riscritto o rimosso fuori dalla
+    generazione (es. da output_index.invalidate_bundle): quelle presenti vengono
+    ricompresse dal contenuto attuale, o rimosse se il file non c'è più o è
+    troppo piccolo. Restituisce il numero di copie toccate.
+    """
+    existing = [fmt for fmt, suffix in COMPRESSED_SUFFIXES.items() if os.path.exists(path + suffix)]
+    if not existing:
+        return 0
+    formats = [fmt for fmt in existing if fmt in available_formats()]
+    if formats and os.path.isfile(path) and os.path.getsize(path) >= MIN_SIZE:
+        compress_file(path, formats)
+    else:
+        formats = []
+    for fmt in existing:
+        if fmt not in formats:
+            os.remove(path + COMPRESSED_SUFFIXES[fmt])
+    return len(existing)
+
+def _compress_job(job):
+    """Esegue compress_file in un processo del pool; gli errori vengono restituiti come testo."""
+    rel, path, formats = job
+    try:
+        return rel, compress_file(path, formats), None
+    except Exception as e:
+        return rel, None, str(e)
+
+def is_compressible(name):
+    """True per i file di testo da precomprimere (non per le copie già compresse)."""
+    return name.lower().endswith(TEXT_SUFFIXES)
+
+def _scan(public_dir):
+    """File da comprimere e copie compresse presenti: ({percorso relativo: stat}, [copie])."""
+    sources, siblings = {}, []
+    for root, _, names in os.walk(public_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, public_dir).replace(os.sep, "/")
+            if name.endswith(tuple(COMPRESSED_SUFFIXES.values())):
+                if is_compressible(os.path.splitext(name)[0]):
+                    siblings.append(rel)
+            elif is_compressible(name):
+                st = os.stat(path)
+                if st.st_size >= MIN_SIZE:
+                    sources[rel] = st
+    return sources, siblings
+
+def _is_current(entry, path, formats):
+    """True se le copie compresse registrate in entry esistono per tutti i formati."""
+    for fmt in formats:
+        if fmt not in entry:
+            return False
+        if entry[fmt] is not None and not os.path.exists(path + COMPRESSED_SUFFIXES[fmt]):
+            return False
+    return True
+
+def precompress_public(hugo_dir=None, workers=None, cache_file=None):
+    """
+    Aggiorna le copie compresse di public/ e rimuove quelle dei file non più presenti.
+    Restituisce (rapporto {estensione: [file, byte originali, byte gzip, byte brotli]}
+    su tutti i file compressi, numero di file ricompressi in questa esecuzione).
+    """
+    hugo_dir = hugo_dir or HUGO_DIR
+    public_dir = os.path.join(hugo_dir, "public")
+    cache_file = cache_file or PRECOMPRESS_CACHE_FILE
+    formats = available_formats()
+    data = load_json(cache_file)
+    if not isinstance(data, dict) or data.get("version") != PRECOMPRESS_CACHE_VERSION:
+        data = {"version": PRECOMPRESS_CACHE_VERSION, "files": {}}
+    cache = data["files"]
+
+    sources, siblings = _scan(public_dir) if os.path.isdir(public_dir) else ({}, [])
+    files, jobs = {}, []
+    for rel, st in sorted(sources.items()):
+        path = os.path.join(public_dir, rel)
+        entry = cache.get(rel)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            digest = entry["hash"]
+        else:
+            digest = file_digest(path)
+        if entry and entry["hash"] == digest and _is_current(entry, path, formats):
+            files[rel] = {**entry, **stat_signature(st)}
+        else:
+            files[rel] = {**stat_signature(st), "hash": digest}
+            jobs.append((rel, path, formats))
+
+    if len(jobs) > 1 and (workers is None or workers > 1):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_compress_job, jobs))
+    else:
+        results = [_compress_job(job) for job in jobs]
+    for rel, sizes, error in results:
+        if error is not None:
+            print(f"⚠️  Compression failed for {rel}: {error}")
+            del files[rel]
+            continue
+        files[rel].update(sizes)
+
+    # Copie compresse di file rimossi, troppo piccoli o non più comprimibili
+    removed = 0
+    for rel in siblings:
+        source, suffix = os.path.splitext(rel)
+        fmt = next(fmt for fmt, value in COMPRESSED_SUFFIXES.items() if value == suffix)
+        if source not in files or files[source].get(fmt) is None:
+            os.remove(os.path.join(public_dir, rel))
+            removed += 1
+
+    save_json(cache_file, {"version": PRECOMPRESS_CACHE_VERSION, "files": files})
+
+    report = {}
+    for rel, entry in files.items():
+        suffix = os.path.splitext(rel)[1].lower()
+        totals = report.setdefault(suffix, [0, 0, 0, 0])
+        totals[0] += 1
+        totals[1] += entry["size"]
+        totals[2] += entry.get("gzip") or entry["size"]
+        totals[3] += entry.get("brotli") or entry["size"]
+    if removed:
+        print(f"🗑️  Removed {removed} stale compressed file(s)")
+    return report, len(jobs)
+
+def print_report(report, compressed):
+    """Stampa il rapporto di compressione per tipo di file."""
+    formats = available_formats()
+    print(f"🗜️  Precompressed {compressed} changed file(s) ({', '.join(formats)})")
+    for suffix, (count, size, gzip_size, brotli_size) in sorted(report.items()):
+        line = f"   {suffix:<8} {count:>4} file(s) {format_bytes(size):>10} -> gzip {format_bytes(gzip_size)} ({gzip_size / size:.0%})"
+        if "brotli" in formats:
+            line += f", brotli {format_bytes(brotli_size)} ({brotli_size / size:.0%})"
+        print(line)
+    if brotli is None:
+        print("ℹ️  brotli not installed: only .gz files were written (pip install brotli)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Scrive le copie .gz/.br dei file di testo di public/')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processi per la compressione (default: uno per core)')
+    args = parser.parse_args()
+
+    print_report(*precompress_public(workers=args.workers))
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -10,6 +10,11 @@ import yaml
 import shutil
 from pathlib import Path
 
+import output_index
+import site_gc
+import vault_catalog
+from frontmatter import load_yaml
+
 # Percorsi
 OBSIDIAN_POST_DIR = "/Users/lorenzo/Library/Mobile Documents/iCloud~md~obsidian/Documents/Ken vault/08 - Blog/"
 HUGO_IT_POST_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog/content/it/post"
@@ -26,39 +31,45 @@ def parse_front_matter(content):
     match = re.match(FRONT_MATTER_REGEX, content, re.DOTALL)
     if match:
         try:
-            front_matter = yaml.safe_load(match.group(1)) or {}
+            front_matter = load_yaml(match.group(1)) or {}
             return front_matter
         except yaml.YAMLError as e:
             print(f"❌ Error parsing YAML front matter: {e}")
             return {}
     return {}
 
-def is_draft_in_obsidian(post_name):
+def is_draft_in_obsidian(post_name, catalog=None):
     """Controlla se un post è draft in Obsidian."""
-    obsidian_file = os.path.join(OBSIDIAN_POST_DIR, f"{post_name}.md")
+    catalog = catalog or vault_catalog.get_catalog()
+    record = catalog.vault_post(post_name)
     
-    if not os.path.exists(obsidian_file):
+    if record is None:
         print(f"⚠️  Obsidian file not found: {post_name}.md")
         return False
     
-    try:
-        with open(obsidian_file, "r", encoding="utf-8") as f:
-            content = f.read()
-        
-        front_matter = parse_front_matter(content)
-        is_draft = front_matter.get('draft', False)
-        
-        if is_draft:
-            print(f"📝 Found draft in Obsidian: {post_name}")
-        
-        return is_draft
-        
-    except Exception as e:
-        print(f"❌ Error reading {obsidian_file}: {e}")
-        return False
+    if record.draft:
+        print(f"📝 Found draft in Obsidian: {post_name}")
+    
+    return record.draft
+
+def post_dir_language(post_dir, languages):
+    """
+    Codice della lingua di una cartella dei post (content/<lingua>/post),
+    ricavato dal contentDir delle lingue di hugo.yaml che la contiene;
+    in mancanza, il nome della cartella di content.
+    """
+    content_dir = os.path.dirname(os.path.normpath(post_dir))
+    for code, language_dir, _ in languages:
+        language_dir = os.path.normpath(language_dir)
+        if content_dir == language_dir or content_dir.endswith(os.sep + language_dir):
+            return code
+    return os.path.basename(content_dir).lower()
 
-def remove_draft_posts():
+def remove_draft_posts(catalog=None):
     """Rimuove i post draft dalle cartelle multilingua."""
+    catalog = catalog or vault_catalog.get_catalog()
+    index = output_index.load_output_index()
+    languages = site_gc.site_languages(site_gc.load_site_config())
     removed_count = 0
     
     print(f"🧹 Checking for draft posts to remove...")
@@ -68,8 +79,8 @@ def remove_draft_posts():
             print(f"Directory not found: {hugo_dir}")
             continue
             
-        lang = "IT" if "it" in hugo_dir else "EN"
-        print(f"\n📁 Checking {lang} posts in: {hugo_dir}")
+        lang = post_dir_language(hugo_dir, languages)
+        print(f"\n📁 Checking {lang.upper()} posts in: {hugo_dir}")
         
         for item in os.listdir(hugo_dir):
             item_path = os.path.join(hugo_dir, item)
@@ -85,16 +96,23 @@ def remove_draft_posts():
             print(f"📝 Checking post: {item}")
             
             # Controlla se il post è draft in Obsidian
-            if is_draft_in_obsidian(item):
+            if is_draft_in_obsidian(item, catalog):
                 try:
                     shutil.rmtree(item_path)
                     removed_count += 1
                     print(f"🗑️  Removed draft post: {item}")
                 except Exception as e:
                     print(f"❌ Error removing {item}: {e}")
+                    continue
+                # Invalida solo gli output generati per questo post e questa lingua
+                for key in output_index.find_bundles(index, item, lang):
+                    files, entries = output_index.invalidate_bundle(index, key)
+                    print(f"🗑️  Removed {files} generated file(s) and {entries} feed/search entries: {key}")
             else:
                 print(f"✅ Post still published: {item}")
     
+    if removed_count > 0:
+        output_index.save_output_index(index)
     return removed_count
 
 if __name__ == "__main__":
@@ -14,6 +14,10 @@ import shutil
 import yaml
 from pathlib import Path
 
+import output_index
+import vault_catalog
+from frontmatter import load_yaml
+
 # Percorsi
 OBSIDIAN_POST_DIR = "/Users/lorenzo/Library/Mobile Documents/iCloud~md~obsidian/Documents/Ken vault/08 - Blog/"
 HUGO_POST_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog/content/posts"
@@ -27,14 +31,14 @@ def parse_front_matter(content):
     match = re.match(FRONT_MATTER_REGEX, content, re.DOTALL)
     if match:
         try:
-            front_matter = yaml.safe_load(match.group(1)) or {}
+            front_matter = load_yaml(match.group(1)) or {}
             return front_matter
         except yaml.YAMLError as e:
             print(f"❌ Error parsing YAML front matter: {e}")
             return {}
     return {}
 
-def get_obsidian_posts():
+def get_obsidian_posts(catalog=None):
     """Ottiene l'elenco dei post presenti in Hugo (dopo rsync) escludendo quelli con draft: true."""
     obsidian_posts = set()
     draft_posts = set()
@@ -43,49 +47,15 @@ def get_obsidian_posts():
         print(f"⚠️  Warning: Hugo posts directory not found: {HUGO_POST_DIR}")
         return obsidian_posts, draft_posts
     
-    # Controlla i file .md nella directory Hugo (copiati da rsync)
-    for filename in os.listdir(HUGO_POST_DIR):
-        if filename.endswith(".md"):
-            bundle_name = os.path.splitext(filename)[0]
-            file_path = os.path.join(HUGO_POST_DIR, filename)
-            
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                
-                front_matter = parse_front_matter(content)
-                
-                # Controlla se il post è in draft
-                if front_matter.get('draft', False):
-                    draft_posts.add(bundle_name)
-                    print(f"📝 Found draft post: {bundle_name}")
-                else:
-                    obsidian_posts.add(bundle_name)
-                    
-            except Exception as e:
-                print(f"❌ Error reading {filename}: {e}")
-        
-        elif os.path.isdir(os.path.join(HUGO_POST_DIR, filename)) and not filename.startswith('.'):
-            # È una cartella page bundle - controlla il file index.md
-            bundle_name = filename
-            index_file = os.path.join(HUGO_POST_DIR, filename, "index.md")
-            
-            if os.path.exists(index_file):
-                try:
-                    with open(index_file, "r", encoding="utf-8") as f:
-                        content = f.read()
-                    
-                    front_matter = parse_front_matter(content)
-                    
-                    # Controlla se il post è in draft
-                    if front_matter.get('draft', False):
-                        draft_posts.add(bundle_name)
-                        print(f"📝 Found draft post: {bundle_name}")
-                    else:
-                        obsidian_posts.add(bundle_name)
-                        
-                except Exception as e:
-                    print(f"❌ Error reading {index_file}: {e}")
+    # File .md copiati da rsync e page bundle, analizzati tramite il catalogo condiviso
+    catalog = catalog or vault_catalog.get_catalog()
+    for record in catalog.posts_in(HUGO_POST_DIR):
+        # Controlla se il post è in draft
+        if record.draft:
+            draft_posts.add(record.bundle_name)
+            print(f"📝 Found draft post: {record.bundle_name}")
+        else:
+            obsidian_posts.add(record.bundle_name)
     
     return obsidian_posts, draft_posts
 
@@ -109,8 +79,22 @@ def get_hugo_posts():
     
     return hugo_posts
 
-def remove_hugo_post(bundle_name):
-    """Rimuove un post da Hugo (sia cartella che file markdown) e dai file generati."""
+def remove_generated_outputs(bundle_name, index, language=None):
+    """
+    Invalida i file generati da Hugo per un post usando l'indice inverso di
+    output_index.py. Restituisce False se l'indice non conosce il post.
+    """
+    keys = output_index.find_bundles(index, bundle_name, language)
+    for key in keys:
+        files, entries = output_index.invalidate_bundle(index, key)
+        print(f"🗑️  Removed {files} generated file(s) and {entries} feed/search entries: {key}")
+    return bool(keys)
+
+def remove_hugo_post(bundle_name, index=None):
+    """
+    Rimuove un post da Hugo (sia cartella che file markdown) e dai file generati.
+    index è l'indice degli output già caricato; se manca viene letto e salvato qui.
+    """
     removed = False
     
     # Rimuovi la cartella del page bundle
@@ -133,7 +117,16 @@ def remove_hugo_post(bundle_name):
         except Exception as e:
             print(f"❌ Error removing markdown file {bundle_name}.md: {e}")
     
-    # Rimuovi i file generati nella cartella public/ 
+    # Rimuovi i file generati: HTML, immagini, voci di feed e indici di ricerca
+    own_index = index is None
+    if own_index:
+        index = output_index.load_output_index()
+    if remove_generated_outputs(bundle_name, index):
+        if own_index:
+            output_index.save_output_index(index)
+        return True
+    
+    # Post non presente nell'indice: cartella in public/ ricavata dallo slug
     # Hugo genera slug normalizzati (spazi diventano trattini, tutto minuscolo)
     normalized_slug = bundle_name.lower().replace(" ", "-")
     public_dir = os.path.join(HUGO_PUBLIC_DIR, normalized_slug)
@@ -147,7 +140,7 @@ def remove_hugo_post(bundle_name):
     
     return removed
 
-def cleanup_posts():
+def cleanup_posts(catalog=None):
     """
     Rimuove i post che:
     1. Sono marcati come draft in Obsidian
@@ -156,7 +149,7 @@ def cleanup_posts():
     print("🧹 Starting post cleanup...")
     
     # Ottieni l'elenco dei post
-    obsidian_posts, draft_posts = get_obsidian_posts()
+    obsidian_posts, draft_posts = get_obsidian_posts(catalog)
     hugo_posts = get_hugo_posts()
     
     print(f"📊 Found {len(obsidian_posts)} active posts in Obsidian")
@@ -164,22 +157,24 @@ def cleanup_posts():
     print(f"📊 Found {len(hugo_posts)} posts in Hugo")
     
     removed_count = 0
+    index = output_index.load_output_index()
     
     # Rimuovi post marcati come draft
     for draft_post in draft_posts:
         if draft_post in hugo_posts:
-            if remove_hugo_post(draft_post):
+            if remove_hugo_post(draft_post, index):
                 removed_count += 1
                 print(f"✅ Removed draft post: {draft_post}")
     
     # Rimuovi post che non esistono più in Obsidian
     posts_to_remove = hugo_posts - obsidian_posts - draft_posts
     for post_name in posts_to_remove:
-        if remove_hugo_post(post_name):
+        if remove_hugo_post(post_name, index):
             removed_count += 1
             print(f"✅ Removed deleted post: {post_name}")
     
     if removed_count > 0:
+        output_index.save_output_index(index)
         print(f"🎉 Cleanup completed! Removed {removed_count} post(s).")
     else:
         print("ℹ️  No posts to remove.")
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Indice di ricerca compatto e suddiviso per prefisso, una copia per lingua.
+
+Il tema scarica page/search/index.json con il contenuto completo di ogni post
+prima di poter rispondere alla prima ricerca. Questo stage, eseguito dopo la
+generazione del sito, costruisce dai bundle di content/ un indice invertito:
+- i testi vengono ripuliti dalla sintassi markdown e divisi in parole,
+  in minuscolo e senza accenti (così "perche" trova "perché"),
+- le parole vuote più comuni (italiane e inglesi) non vengono indicizzate,
+- ogni parola punta ai post che la contengono con un peso (titolo e tag
+  contano più del testo),
+- le parole vengono divise in shard in base ai primi PREFIX_LENGTH caratteri.
+Il risultato va in public/<lingua>/search-index/: manifest.json (elenco dei
+post e degli shard) più un file JSON per shard. static/js/search-index.js
+scarica il manifest e solo gli shard dei prefissi digitati.
+
+Le parole di ogni post (segmento) vengono salvate in cache con l'hash del suo
+index.md: a ogni generazione vengono rilette solo i post cambiati e riscritti
+solo gli shard che contengono le loro parole. --full ricostruisce tutto.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import unicodedata
+
+import output_index
+import site_gc
+from fileutils import file_digest, format_bytes, load_json, save_json, write_text_if_changed
+from frontmatter import parse_front_matter_yaml
+
+# Percorsi
+HUGO_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog"
+SEARCH_INDEX_CACHE_FILE = "/Users/lorenzo/Documents/GitHub/LolloBlog/.searchindex.json"
+
+SEARCH_INDEX_DIR = "search-index"
+SEARCH_INDEX_VERSION = 1
+
+# Caratteri iniziali che identificano lo shard di una parola
+PREFIX_LENGTH = 2
+
+# Lunghezza delle parole indicizzate
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 32
+
+# Peso di una parola nel titolo e nei tag rispetto al testo
+TITLE_WEIGHT = 10
+TAG_WEIGHT = 5
+
+# Lunghezza del riassunto mostrato nei risultati se manca description
+SUMMARY_LENGTH = 160
+
+# Parole vuote (già senza accenti)
+STOPWORDS = frozenset("""
+    il lo la gli le un uno una di da in con su per tra fra ed ma che chi cui non si ci ne
+    del dello della dei degli delle al allo alla ai agli alle dal dallo dalla dai dagli dalle
+    nel nello nella nei negli nelle sul sullo sulla sui sugli sulle sono come anche piu
+    questo questa questi queste quello quella mi ti vi io tu lui lei noi voi loro mio mia
+    suo sua ha ho hanno essere stato era se perche quando dove poi gia ancora molto tutto tutti solo
+    the an and or but of to on at for with by from as is are was were be been it its this that
+    these those you he she we they my your his her our their not no so if then than there here
+    what which who how when where why all any can will just about into over also do does did
+    has have had me more most some such only own same very
+""".split())
+
+FRONT_MATTER_REGEX = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+
+# Pulizia del markdown per ottenere il testo
+CLEANUP_PATTERNS = [
+    (re.compile(r'<!--.*?-->', re.DOTALL), " "),
+    (re.compile(r'^\s*(?:```|~~~).*$', re.MULTILINE), " "),
+    (re.compile(r'\{\{[<%].*?[>%]\}\}', re.DOTALL), " "),
+    (re.compile(r'!\[\[[^\]]*\]\]'), " "),
+    (re.compile(r'!\[([^\]]*)\]\([^)]*\)'), r"\1"),
+    (re.compile(r'\[\[(?:[^\]|]*\|)?([^\]]*)\]\]'), r"\1"),
+    (re.compile(r'\[([^\]]*)\]\([^)]*\)'), r"\1"),
+    (re.compile(r'<[^>]+>'), " "),
+    (re.compile(r'https?://\S+'), " "),
+    (re.compile(r'[*_`~=]+'), ""),
+    (re.compile(r'[#>|]+'), " "),
+    (re.compile(r'\s+'), " "),
+]
+
+TERM_REGEX = re.compile(r'[^\W_]+')
+SHARD_KEY_REGEX = re.compile(r'^[a-z0-9]+$')
+
+def fold(text):
+    """Minuscolo e senza accenti."""
+    decomposed = unicodedata.normalize("NFD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def tokenize(text):
+    """Parole indicizzabili di un testo, nell'ordine in cui compaiono."""
+    return [term for term in TERM_REGEX.findall(fold(text))
+            if MIN_TERM_LENGTH <= len(term) <= MAX_TERM_LENGTH and term not in STOPWORDS]
+
+def shard_key(term):
+    """Shard di una parola: i primi caratteri, o "_" se non sono lettere/cifre ASCII."""
+    key = term[:PREFIX_LENGTH]
+    return key if SHARD_KEY_REGEX.match(key) else "_"
+
+def plain_text(body):
+    """Testo del corpo di un post senza sintassi markdown, link, immagini e shortcode."""
+    for pattern, replacement in CLEANUP_PATTERNS:
+        body = pattern.sub(replacement, body)
+    return body.strip()
+
+def summarize(text, length=SUMMARY_LENGTH):
+    """Inizio del testo, tagliato a fine parola."""
+    if len(text) <= length:
+        return text
+    return text[:length].rsplit(" ", 1)[0] + "…"
+
+def _tags(value):
+    """Tag del front matter come lista di stringhe."""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [str(tag) for tag in value if isinstance(tag, (str, int, float))]
+    return []
+
+def read_document(markdown_file, url):
+    """
+    Legge un post e restituisce (metadati per i risultati, pesi delle parole).
+    Restituisce None se il file non ha un titolo.
+    """
+    with open(markdown_file, "r", encoding="utf-8") as f:
+        content = f.read()
+    match = FRONT_MATTER_REGEX.match(content)
+    front_matter = parse_front_matter_yaml(match.group(1)) if match else {}
+    body = content[match.end():] if match else content
+    title = front_matter.get("title")
+    if not title:
+        return None
+    title = str(title)
+
+    text = plain_text(body)
+    terms = {}
+    for term in tokenize(text):
+        terms[term] = terms.get(term, 0) + 1
+    for term in tokenize(title):
+        terms[term] = terms.get(term, 0) + TITLE_WEIGHT
+    for tag in _tags(front_matter.get("tags")):
+        for term in tokenize(tag):
+            terms[term] = terms.get(term, 0) + TAG_WEIGHT
+
+    description = front_matter.get("description")
+    document = {
+        "title": title,
+        "url": url,
+        "summary": summarize(plain_text(str(description)) if description else text),
+        "date": str(front_matter.get("date") or ""),
+    }
+    image = front_matter.get("image")
+    if isinstance(image, str) and image and "://" not in image:
+        document["image"] = url + image
+    return document, terms
+
+def main_sections(config):
+    """Sezioni con i post (params.mainSections di Hugo, "post" se non indicato)."""
+    params = site_gc.config_value(config, "params") or {}
+    sections = site_gc.config_value(params, "mainSections") or ["post"]
+    return {site_gc.urlize(section) for section in sections}
+
+def collect_sources(hugo_dir=None, config=None, include_drafts=False):
+    """Post da indicizzare per lingua: {prefisso della lingua: [(file markdown, url)]}."""
+    hugo_dir = hugo_dir or HUGO_DIR
+    config = site_gc.load_site_config(hugo_dir) if config is None else config
+    site = site_gc.live_outputs(hugo_dir, config, include_drafts)
+    sections = main_sections(config)
+    base_path = output_index.site_base_path(config)
+    prefixes = {language: prefix for language, _, prefix in site_gc.site_languages(config)}
+
+    sources = {prefix: [] for prefix in prefixes.values()}
+    for page, (language, source) in sorted(site.sources.items()):
+        prefix = prefixes[language]
+        section = page[len(prefix):].strip("/").split("/", 1)[0]
+        if section not in sections:
+            continue
+        markdown_file = os.path.join(source, "index.md") if os.path.isdir(source) else source
+        sources[prefix].append((markdown_file, "/" + site_gc.join_path(base_path, page) + "/"))
+    return sources
+
+def index_settings():
+    """Parametri che determinano l'indice: se cambiano, i segmenti in cache non valgono più."""
+    return [SEARCH_INDEX_VERSION, PREFIX_LENGTH, MIN_TERM_LENGTH, MAX_TERM_LENGTH,
+            TITLE_WEIGHT, TAG_WEIGHT, SUMMARY_LENGTH, sorted(STOPWORDS)]
+
+def load_segments(path=None):
+    """Segmenti dei post salvati dall'ultima generazione: {url: {hash, document, terms}}."""
+    data = load_json(path or SEARCH_INDEX_CACHE_FILE)
+    if not isinstance(data, dict) or data.get("settings") != index_settings():
+        return {}
+    return data.get("segments", {})
+
+def save_segments(segments, path=None):
+    """Salva i segmenti dei post sul disco."""
+    save_json(path or SEARCH_INDEX_CACHE_FILE, {"settings": index_settings(), "segments": segments})
+
+def update_segments(sources, segments):
+    """
+    Aggiorna i segmenti dei post di una lingua: rilegge e suddivide in parole
+    solo i file il cui hash è cambiato. Restituisce (post dal più vecchio al più
+    recente come [(metadati, pesi)], url dei post riletti).
+    """
+    documents, changed = [], set()
+    for markdown_file, url in sources:
+        digest = file_digest(markdown_file)
+        segment = segments.get(url)
+        if segment is None or segment["hash"] != digest:
+            document = read_document(markdown_file, url)
+            segment = {"hash": digest, "document": None, "terms": {}}
+            if document is not None:
+                segment["document"], segment["terms"] = document
+            segments[url] = segment
+            changed.add(url)
+        if segment["document"] is not None:
+            documents.append((segment["document"], segment["terms"]))
+    # Ordine per data e url: un post più recente degli altri finisce in fondo e
+    # non cambia gli id esistenti; uno retrodatato (o una data modificata) sposta
+    # gli id successivi e affected_shards riscrive anche gli shard di quei post
+    documents.sort(key=lambda item: (item[0]["date"], item[0]["url"]))
+    return documents, changed
+
+def build_shards(documents, keys=None):
+    """
+    Costruisce l'indice invertito di una lingua (solo gli shard in keys, se indicati).
+    Restituisce (manifest, {chiave dello shard: {parola: [post, peso, post, peso, ...]}}).
+    """
+    shards = {}
+    for doc_id, (_, terms) in enumerate(documents):
+        for term, weight in terms.items():
+            key = shard_key(term)
+            if keys is None or key in keys:
+                shards.setdefault(key, {}).setdefault(term, []).extend((doc_id, weight))
+    manifest = {
+        "version": SEARCH_INDEX_VERSION,
+        "prefix": PREFIX_LENGTH,
+        "stopwords": sorted(STOPWORDS),
+        "docs": [document for document, _ in documents],
+        "shards": sorted(shards),
+    }
+    return manifest, shards
+
+def _dump(data):
+    """JSON compatto e deterministico."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+def write_index(output_dir, manifest, shards):
+    """Scrive manifest e shard (solo i file cambiati) e rimuove gli shard non più usati."""
+    os.makedirs(output_dir, exist_ok=True)
+    files = {"manifest.json": _dump(manifest)}
+    for key, terms in shards.items():
+        files[f"{key}.json"] = _dump(terms)
+    for name, text in files.items():
+        write_text_if_changed(os.path.join(output_dir, name), text)
+    for name in os.listdir(output_dir):
+        if name.endswith(".json") and name not in files:
+            os.remove(os.path.join(output_dir, name))
+
+def load_manifest(output_dir):
+    """
+    Manifest della generazione precedente, o None se manca, è di un'altra
+    versione o mancano alcuni dei suoi shard.
+    """
+    manifest = load_json(os.path.join(output_dir, "manifest.json"))
+    if not isinstance(manifest, dict) or manifest.get("version") != SEARCH_INDEX_VERSION \
+            or manifest.get("prefix") != PREFIX_LENGTH or manifest.get("stopwords") != sorted(STOPWORDS):
+        return None
+    if not all(os.path.isfile(os.path.join(output_dir, f"{key}.json")) for key in manifest.get("shards", [])):
+        return None
+    return manifest
+
+def affected_shards(documents, previous, changed, old_segments):
+    """
+    Shard da riscrivere rispetto alla generazione precedente: quelli delle parole
+    (vecchie e nuove) dei post riletti o rimossi e dei post che hanno cambiato id.
+    Restituisce None se i segmenti in cache non bastano a ricostruirli.
+    """
+    previous_ids = {document["url"]: doc_id for doc_id, document in enumerate(previous["docs"])}
+    current_ids = {document["url"]: doc_id for doc_id, (document, _) in enumerate(documents)}
+    keys = set()
+    for doc_id, (document, terms) in enumerate(documents):
+        url = document["url"]
+        if url in changed or previous_ids.get(url) != doc_id:
+            keys.update(shard_key(term) for term in terms)
+    for url, doc_id in previous_ids.items():
+        if url in changed or current_ids.get(url) != doc_id:
+            if url not in old_segments:
+                return None
+            keys.update(shard_key(term) for term in old_segments[url]["terms"])
+    return keys
+
+def update_index(output_dir, documents, changed, old_segments):
+    """
+    Aggiorna l'indice di una lingua riscrivendo solo gli shard toccati dai post
+    cambiati. Restituisce le chiavi degli shard riscritti o rimossi, o None se
+    serve una ricostruzione completa (indice precedente assente o incompleto).
+    """
+    previous = load_manifest(output_dir)
+    if previous is None:
+        return None
+    keys = affected_shards(documents, previous, changed, old_segments)
+    if keys is None:
+        return None
+
+    manifest, shards = build_shards(documents, keys)
+    manifest["shards"] = sorted((set(previous["shards"]) - keys) | set(shards))
+    for key in sorted(keys):
+        path = os.path.join(output_dir, f"{key}.json")
+        if key in shards:
+            write_text_if_changed(path, _dump(shards[key]))
+        elif os.path.exists(path):
+            os.remove(path)
+    write_text_if_changed(os.path.join(output_dir, "manifest.json"), _dump(manifest))
+    return keys
+
+def drop_pages(pages, hugo_dir=None, cache_file=None):
+    """
+    Rimuove i post delle pagine indicate (percorsi in public/) dagli indici già
+    generati, riscrivendo solo gli shard con le loro parole, e ne toglie i
+    segmenti dalla cache. Se la cache non basta a ricostruire gli shard l'indice
+    della lingua viene rimosso: la prossima generazione lo ricostruisce da zero.
+    Restituisce (post rimossi, file riscritti o rimossi).
+    """
+    hugo_dir = hugo_dir or HUGO_DIR
+    config = site_gc.load_site_config(hugo_dir)
+    base_path = output_index.site_base_path(config)
+    urls = {"/" + site_gc.join_path(base_path, page) + "/" for page in pages}
+    segments = load_segments(cache_file)
+    dropped, touched = 0, []
+    for _, _, prefix in sorted(site_gc.site_languages(config)):
+        output_dir = os.path.join(hugo_dir, "public", prefix, SEARCH_INDEX_DIR)
+        previous = load_manifest(output_dir)
+        if previous is None:
+            continue
+        removed = [document["url"] for document in previous["docs"] if document["url"] in urls]
+        if not removed:
+            continue
+        kept = [document for document in previous["docs"] if document["url"] not in urls]
+        keys = None
+        if all(document["url"] in segments for document in kept):
+            documents = [(document, segments[document["url"]]["terms"]) for document in kept]
+            keys = update_index(output_dir, documents, set(), segments)
+        if keys is None:
+            shutil.rmtree(output_dir)
+        else:
+            touched.append(os.path.join(output_dir, "manifest.json"))
+            touched.extend(os.path.join(output_dir, f"{key}.json") for key in sorted(keys))
+        dropped += len(removed)
+    if dropped:
+        save_segments({url: segment for url, segment in segments.items() if url not in urls}, cache_file)
+    return dropped, touched
+
+def index_sizes(output_dir):
+    """Dimensioni dei file di un indice: {nome del file: byte}."""
+    return {name: os.path.getsize(os.path.join(output_dir, name))
+            for name in os.listdir(output_dir) if name.endswith(".json")}
+
+def legacy_index_size(public_dir, prefix):
+    """Dimensione dell'index.json completo del tema per una lingua, se presente."""
+    path = os.path.join(public_dir, prefix, "page", "search", "index.json")
+    if os.path.isfile(path) and output_index.load_search_index(path) is not None:
+        return os.path.getsize(path)
+    return None
+
+def print_size_report(prefix, documents, sizes, legacy_size):
+    """Stampa le dimensioni dell'indice di una lingua e il confronto con index.json."""
+    manifest_size = sizes["manifest.json"]
+    shard_sizes = [size for name, size in sizes.items() if name != "manifest.json"]
+    largest = max(shard_sizes, default=0)
+    first_query = manifest_size + largest
+    label = prefix or "default language"
+    print(f"🔎 Search index ({label}): {len(documents)} post(s), {len(shard_sizes)} shard(s), "
+          f"manifest {format_bytes(manifest_size)}, shards {format_bytes(sum(shard_sizes))} "
+          f"(largest {format_bytes(largest)})")
+    if legacy_size:
+        print(f"   One-word query downloads at most {format_bytes(first_query)} "
+              f"instead of index.json {format_bytes(legacy_size)} "
+              f"({first_query / legacy_size:.0%})")
+
+def build_search_index(hugo_dir=None, include_drafts=False, full=False, cache_file=None):
+    """
+    Genera l'indice di ricerca di ogni lingua in public/. Di default rilegge solo
+    i post il cui index.md è cambiato e riscrive solo gli shard interessati;
+    con full=True ricostruisce tutto. Restituisce il numero di post indicizzati.
+    """
+    hugo_dir = hugo_dir or HUGO_DIR
+    public_dir = os.path.join(hugo_dir, "public")
+    config = site_gc.load_site_config(hugo_dir)
+    old_segments = {} if full else load_segments(cache_file)
+    segments = dict(old_segments)
+    live_urls = set()
+    total = 0
+    for prefix, sources in sorted(collect_sources(hugo_dir, config, include_drafts).items()):
+        output_dir = os.path.join(public_dir, prefix, SEARCH_INDEX_DIR)
+        label = prefix or "default language"
+        documents, changed = update_segments(sources, segments)
+        live_urls.update(url for _, url in sources)
+
+        rewritten = None if full else update_index(output_dir, documents, changed, old_segments)
+        if rewritten is None:
+            manifest, shards = build_shards(documents)
+            write_index(output_dir, manifest, shards)
+            print(f"🔁 Full search index rebuild ({label})")
+        else:
+            print(f"♻️  Search index update ({label}): re-tokenised {len(changed)} of {len(sources)} post(s), "
+                  f"rewrote {len(rewritten)} shard(s)")
+        print_size_report(prefix, documents, index_sizes(output_dir), legacy_index_size(public_dir, prefix))
+        total += len(documents)
+
+    save_segments({url: segment for url, segment in segments.items() if url in live_urls}, cache_file)
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera l'indice di ricerca compatto per lingua in public/")
+    parser.add_argument('--drafts', action='store_true',
+                        help='Indicizza anche i post in draft (come hugo --buildDrafts)')
+    parser.add_argument('--full', action='store_true',
+                        help='Ricostruisce tutto l\'indice invece di aggiornare solo i post cambiati')
+    args = parser.parse_args()
+
+    build_search_index(include_drafts=args.drafts, full=args.full)
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
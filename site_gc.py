@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Rimozione degli output di Hugo non più generati dal content tree attuale.
+
+Hugo non cancella mai da public/ e resources/_gen i file dei post eliminati,
+rinominati o tornati in draft, né le varianti _hu_ delle immagini ridimensionate
+con parametri vecchi. Lo sweeper:
+1. calcola dal content tree e da hugo.yaml gli output vivi: home di ogni lingua,
+   sezioni, pagine (slug come urlize di Hugo), tassonomie e termini usati;
+2. in public/ rimuove le cartelle di pagine e liste non più vive e, nelle
+   pagine vive, le risorse che non sono più nel bundle;
+3. considera vive le varianti _hu_ e i file con fingerprint (es. main.<hash>.js)
+   solo se referenziati dagli HTML/XML/JSON rimasti, e rimuove allo stesso
+   modo la cache delle immagini elaborate in resources/_gen/images.
+Le cartelle che non sono output di pagine (es. scss/, ts/) e i file copiati da
+static/ vengono lasciati, a parte i fingerprint non più referenziati.
+Va eseguito dopo la generazione del sito, quando gli HTML sono aggiornati.
+"""
+
+import argparse
+import os
+import posixpath
+import re
+import shutil
+from urllib.parse import unquote, urlparse
+
+import yaml
+
+from fileutils import format_bytes
+from frontmatter import load_front_matter
+
+# Percorsi
+HUGO_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog"
+
+# Tassonomie predefinite di Hugo (singolare -> plurale)
+DEFAULT_TAXONOMIES = {"tag": "tags", "category": "categories"}
+
+# Caratteri che urlize di Hugo mantiene oltre a lettere e cifre
+URLIZE_REMOVE_REGEX = re.compile(r'[^\w%./\\#+~-]')
+
+# Varianti elaborate (_hu_) e file con fingerprint nel nome
+DERIVED_SUFFIX = r'(?:_hu_[0-9a-f]+|\.[0-9a-f]{32,64})\.[A-Za-z0-9]+'
+DERIVED_REGEX = re.compile(DERIVED_SUFFIX + r'$')
+REFERENCE_REGEX = re.compile(r'[\w.~%/-]*?' + DERIVED_SUFFIX + r'(?![\w.~%/-])')
+
+# Output testuali in cui cercare i riferimenti
+DOCUMENT_REGEX = re.compile(r'\.(?:html|xml|json|css)$', re.IGNORECASE)
+
+# File che identificano la cartella di una pagina o di una lista generata da Hugo
+PAGE_OUTPUT_FILES = ("index.html", "index.xml")
+
+# Copie precompresse scritte accanto agli output
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+def urlize(text):
+    """Percorso come lo genera Hugo: minuscolo, spazi convertiti in trattini, simboli rimossi."""
+    text = re.sub(r'\s', "-", str(text).strip().lower())
+    return URLIZE_REMOVE_REGEX.sub("", text)
+
+def config_value(config, key, default=None):
+    """Legge una chiave di hugo.yaml ignorando maiuscole e minuscole, come Hugo."""
+    for name, value in config.items():
+        if str(name).lower() == key.lower():
+            return value
+    return default
+
+def load_site_config(hugo_dir=None):
+    """Legge hugo.yaml; restituisce {} se manca o non è valido."""
+    path = os.path.join(hugo_dir or HUGO_DIR, "hugo.yaml")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        print(f"⚠️  Unable to read {path}: {e}")
+        return {}
+    return config if isinstance(config, dict) else {}
+
+def site_languages(config):
+    """
+    Lingue del sito come lista di (codice, contentDir, prefisso in public/).
+    La lingua predefinita è alla radice, salvo defaultContentLanguageInSubdir.
+    """
+    default = str(config_value(config, "defaultContentLanguage", "en")).lower()
+    in_subdir = bool(config_value(config, "defaultContentLanguageInSubdir", False))
+    languages = config_value(config, "languages") or {}
+    if not languages:
+        return [(default, config_value(config, "contentDir", "content"), "")]
+
+    result = []
+    for code, settings in languages.items():
+        code = str(code).lower()
+        content_dir = config_value(settings or {}, "contentDir") or config_value(config, "contentDir", "content")
+        prefix = "" if code == default and not in_subdir else code
+        result.append((code, content_dir, prefix))
+    return result
+
+def site_taxonomies(config):
+    """Nomi plurali delle tassonomie del sito (chiavi del front matter e cartelle in public/)."""
+    taxonomies = config_value(config, "taxonomies")
+    if taxonomies is None:
+        taxonomies = DEFAULT_TAXONOMIES
+    return sorted(str(plural).lower() for plural in (taxonomies or {}).values())
+
+def join_path(*parts):
+    """Unisce parti di un percorso relativo di public/ ignorando quelle vuote."""
+    return "/".join(part.strip("/") for part in parts if part and part.strip("/"))
+
+def _terms(value):
+    """Termini di una tassonomia nel front matter: lista o stringa singola."""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [term for term in value if isinstance(term, (str, int, float))]
+    return []
+
+class LiveSite:
+    """
+    Output vivi del sito, come percorsi relativi a public/ senza barre iniziali.
+    sources associa ogni pagina a (lingua, bundle o file markdown di origine).
+    """
+
+    def __init__(self):
+        self.pages = {}
+        self.sources = {}
+        self.lists = set()
+        self.ancestors = set()
+
+    def add_page(self, path, resources, language=None, source=None):
+        self.pages.setdefault(path, set()).update(resources)
+        if source is not None:
+            self.sources[path] = (language, source)
+        self._add_ancestors(path)
+
+    def add_list(self, path):
+        self.lists.add(path)
+        self._add_ancestors(path)
+
+    def _add_ancestors(self, path):
+        while "/" in path:
+            path = path.rsplit("/", 1)[0]
+            self.ancestors.add(path)
+        self.ancestors.add("")
+
+    def is_live_dir(self, path):
+        return path in self.pages or path in self.lists or path in self.ancestors
+
+def _page_paths(front_matter, prefix, section_path, default_slug):
+    """Percorsi di output di una pagina: url, slug o nome del file/bundle."""
+    url = front_matter.get("url")
+    if isinstance(url, str) and url.strip("/"):
+        # url è relativo al baseURL: senza o con il prefisso della lingua
+        path = urlize(url).strip("/")
+        return {path, join_path(prefix, path)}
+    slug = front_matter.get("slug")
+    slug = urlize(slug) if isinstance(slug, (str, int)) and str(slug).strip() else urlize(default_slug)
+    return {join_path(prefix, section_path, slug)}
+
+def _scan_section(site, directory, language, prefix, section_path, taxonomies, terms, include_drafts):
+    """Aggiunge le pagine di una cartella di contenuti e delle sottocartelle."""
+    with os.scandir(directory) as entries:
+        entries = sorted(entries, key=lambda entry: entry.name)
+
+    for entry in entries:
+        if entry.name.startswith(".") or entry.name.startswith("_"):
+            continue
+        if entry.is_dir():
+            index = os.path.join(entry.path, "index.md")
+            if os.path.isfile(index):
+                source, default_slug = index, entry.name
+                resources = {name for name in os.listdir(entry.path)
+                             if name != "index.md" and not name.startswith(".")}
+            else:
+                child_path = join_path(section_path, urlize(entry.name))
+                if os.path.isfile(os.path.join(entry.path, "_index.md")):
+                    site.add_list(join_path(prefix, child_path))
+                _scan_section(site, entry.path, language, prefix, child_path, taxonomies, terms, include_drafts)
+                continue
+        elif entry.name.endswith(".md"):
+            source, default_slug, resources = entry.path, os.path.splitext(entry.name)[0], set()
+        else:
+            continue
+
+        front_matter = load_front_matter(source)
+        if front_matter.get("draft") is True and not include_drafts:
+            continue
+        for path in _page_paths(front_matter, prefix, section_path, default_slug):
+            site.add_page(path, resources, language, entry.path)
+        for taxonomy in taxonomies:
+            for term in _terms(front_matter.get(taxonomy)):
+                terms.add(join_path(prefix, taxonomy, urlize(term)))
+
+def live_outputs(hugo_dir=None, config=None, include_drafts=False):
+    """
+    Calcola gli output che Hugo genera per il content tree attuale.
+    include_drafts corrisponde a hugo --buildDrafts.
+    """
+    hugo_dir = hugo_dir or HUGO_DIR
+    config = load_site_config(hugo_dir) if config is None else config
+    taxonomies = site_taxonomies(config)
+    site = LiveSite()
+
+    languages = site_languages(config)
+    for language, content_dir, prefix in languages:
+        site.add_list(prefix)
+        if not prefix and len(languages) > 1:
+            # Anche la lingua alla radice ha /<lingua>/ con il redirect e la sua sitemap
+            site.add_list(language)
+        for taxonomy in taxonomies:
+            site.add_list(join_path(prefix, taxonomy))
+        content_root = os.path.join(hugo_dir, content_dir)
+        if not os.path.isdir(content_root):
+            continue
+        terms = set()
+        _scan_section(site, content_root, language, prefix, "", taxonomies, terms, include_drafts)
+        # Le cartelle di primo livello sono sezioni anche senza _index.md
+        for entry in os.listdir(content_root):
+            if os.path.isdir(os.path.join(content_root, entry)) and not entry.startswith("."):
+                section = join_path(prefix, urlize(entry))
+                if any(page.startswith(section + "/") for page in site.pages):
+                    site.add_list(section)
+        for term in terms:
+            site.add_list(term)
+    return site
+
+def _has_page_output(path):
+    """True se nella cartella (o sotto) c'è una pagina o una lista generata da Hugo."""
+    for _, _, files in os.walk(path):
+        if any(name in PAGE_OUTPUT_FILES for name in files):
+            return True
+    return False
+
+def _tree_size(path):
+    """Numero di file e byte totali di una cartella."""
+    count = size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            count += 1
+            size += os.path.getsize(os.path.join(root, name))
+    return count, size
+
+class _Scan:
+    """Risultato della scansione di public/."""
+
+    def __init__(self):
+        self.stale = []
+        self.derived = []
+        self.documents = []
+
+def _scan_public(directory, rel, kind, site, static_entries, scan):
+    """
+    Classifica il contenuto di una cartella di public/. kind è "list", "page",
+    "assets" (cartelle che non sono pagine) o "keep" (static/ e paginazione).
+    """
+    with os.scandir(directory) as entries:
+        entries = sorted(entries, key=lambda entry: entry.name)
+    resources = site.pages.get(rel, set()) if kind == "page" else set()
+
+    for entry in entries:
+        child = join_path(rel, entry.name)
+        if entry.is_dir(follow_symlinks=False):
+            if kind == "keep" or (not rel and entry.name in static_entries):
+                _scan_public(entry.path, child, "keep", site, static_entries, scan)
+            elif child in site.pages:
+                _scan_public(entry.path, child, "page", site, static_entries, scan)
+            elif site.is_live_dir(child):
+                _scan_public(entry.path, child, "list", site, static_entries, scan)
+            elif entry.name == "page" and kind == "list":
+                # Cartella della paginazione delle liste (/page/2/)
+                _scan_public(entry.path, child, "list", site, static_entries, scan)
+            elif entry.name.isdigit() and rel.endswith("page"):
+                _scan_public(entry.path, child, "keep", site, static_entries, scan)
+            elif _has_page_output(entry.path):
+                scan.stale.append((entry.path, child + "/", *_tree_size(entry.path)))
+            else:
+                _scan_public(entry.path, child, "assets", site, static_entries, scan)
+            continue
+
+        if DOCUMENT_REGEX.search(entry.name):
+            scan.documents.append((entry.path, rel))
+        if kind == "keep" or (not rel and entry.name in static_entries) or entry.name in resources:
+            continue
+        if entry.name.endswith(COMPRESSED_SUFFIXES) and os.path.exists(os.path.splitext(entry.path)[0]):
+            # Copia .gz/.br di un file ancora presente (precompress.py)
+            continue
+        if DERIVED_REGEX.search(entry.name):
+            scan.derived.append((entry.path, child, entry.stat().st_size))
+        elif kind == "page" and not entry.name.startswith("index.") and not entry.name.startswith("."):
+            # Risorsa non più presente nel bundle
+            scan.stale.append((entry.path, child, 1, entry.stat().st_size))
+
+def collect_references(documents, base_url=""):
+    """
+    Percorsi (relativi a public/) delle varianti e dei fingerprint citati
+    dagli output testuali. documents è una lista di (percorso, cartella relativa).
+    """
+    parsed = urlparse(base_url or "")
+    host = f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else None
+    base_path = parsed.path.strip("/")
+    references = set()
+    for path, rel in documents:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            continue
+        if host:
+            text = text.replace(host, "")
+        for match in REFERENCE_REGEX.finditer(text):
+            link = unquote(match.group(0))
+            if link.startswith("/"):
+                link = link.strip("/")
+                if base_path and link.startswith(base_path + "/"):
+                    link = link[len(base_path) + 1:]
+            else:
+                link = posixpath.normpath(posixpath.join(rel, link))
+            references.add(link)
+    return references
+
+def _scan_generated_images(gen_dir, references):
+    """Immagini in cache in resources/_gen/images non citate da public/."""
+    images_dir = os.path.join(gen_dir, "images")
+    stale = []
+    for root, _, files in os.walk(images_dir):
+        rel = os.path.relpath(root, images_dir).replace(os.sep, "/")
+        for name in sorted(files):
+            if name.startswith("."):
+                continue
+            child = join_path("" if rel == "." else rel, name)
+            if child not in references:
+                path = os.path.join(root, name)
+                stale.append((path, child, 1, os.path.getsize(path)))
+    return stale
+
+def _remove_empty_dirs(directory):
+    """Rimuove le cartelle rimaste vuote dopo lo sweep (esclusa la radice)."""
+    for root, dirs, files in os.walk(directory, topdown=False):
+        if root != directory and not os.listdir(root):
+            os.rmdir(root)
+
+def sweep_outputs(hugo_dir=None, dry_run=False, include_drafts=False):
+    """
+    Rimuove da public/ e resources/_gen gli output non più generati.
+    Con dry_run elenca soltanto. Restituisce (file rimossi, byte recuperati).
+    """
+    hugo_dir = hugo_dir or HUGO_DIR
+    public_dir = os.path.join(hugo_dir, "public")
+    gen_dir = os.path.join(hugo_dir, "resources", "_gen")
+    config = load_site_config(hugo_dir)
+    site = live_outputs(hugo_dir, config, include_drafts)
+
+    static_dir = os.path.join(hugo_dir, "static")
+    static_entries = set(os.listdir(static_dir)) if os.path.isdir(static_dir) else set()
+
+    scan = _Scan()
+    if os.path.isdir(public_dir):
+        _scan_public(public_dir, "", "list", site, static_entries, scan)
+    references = collect_references(scan.documents, str(config_value(config, "baseURL", "")))
+
+    stale = [(public_dir, item) for item in scan.stale]
+    if references:
+        # Senza riferimenti (sito non ancora generato) varianti e fingerprint restano
+        stale += [(public_dir, (path, rel, 1, size)) for path, rel, size in scan.derived if rel not in references]
+        stale += [(gen_dir, item) for item in _scan_generated_images(gen_dir, references)]
+    else:
+        print("ℹ️  No processed image references found in public/, variants left untouched")
+
+    totals = {public_dir: [0, 0], gen_dir: [0, 0]}
+    for root, (path, rel, count, size) in sorted(stale, key=lambda item: item[1][0]):
+        label = ("public/" if root == public_dir else "resources/_gen/images/") + rel
+        if dry_run:
+            print(f"  🧹 Would remove {label} ({format_bytes(size)})")
+        else:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+            print(f"  🗑️  Removed {label} ({format_bytes(size)})")
+        totals[root][0] += count
+        totals[root][1] += size
+
+    if not dry_run:
+        for directory in (public_dir, os.path.join(gen_dir, "images")):
+            if os.path.isdir(directory):
+                _remove_empty_dirs(directory)
+
+    verb = "would be reclaimed" if dry_run else "reclaimed"
+    files = sum(count for count, _ in totals.values())
+    size = sum(size for _, size in totals.values())
+    print(f"🧹 Stale outputs: {totals[public_dir][0]} file(s) ({format_bytes(totals[public_dir][1])}) in public/, "
+          f"{totals[gen_dir][0]} file(s) ({format_bytes(totals[gen_dir][1])}) in resources/_gen, "
+          f"{format_bytes(size)} {verb}")
+    return files, size
+
+def main():
+    parser = argparse.ArgumentParser(description='Rimuove da public/ e resources/_gen gli output non più generati')
+    parser.add_argument('--dry-run', action='store_true', help='Elenca gli output da rimuovere senza cancellarli')
+    parser.add_argument('--drafts', action='store_true',
+                        help='Considera vivi anche i post in draft (come hugo --buildDrafts)')
+    args = parser.parse_args()
+
+    sweep_outputs(dry_run=args.dry_run, include_drafts=args.drafts)
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
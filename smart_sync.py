@@ -10,6 +10,8 @@ import re
 import yaml
 from pathlib import Path
 
+from frontmatter import load_front_matter, load_yaml
+
 # Percorsi
 OBSIDIAN_POST_DIR = "/Users/lorenzo/Library/Mobile Documents/iCloud~md~obsidian/Documents/Ken vault/08 - Blog/"
 HUGO_POST_DIR = "/Users/lorenzo/Documents/GitHub/LolloBlog/content/posts"
@@ -22,7 +24,7 @@ def parse_front_matter(content):
     match = re.match(FRONT_MATTER_REGEX, content, re.DOTALL)
     if match:
         try:
-            front_matter = yaml.safe_load(match.group(1)) or {}
+            front_matter = load_yaml(match.group(1)) or {}
             return front_matter
         except yaml.YAMLError as e:
             print(f"❌ Error parsing YAML front matter: {e}")
@@ -32,10 +34,8 @@ def parse_front_matter(content):
 def is_draft_post(file_path):
     """Controlla se un post è marcato come draft."""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        
-        front_matter = parse_front_matter(content)
+        # Legge solo il blocco di front matter, non l'intera nota
+        front_matter = load_front_matter(file_path)
         return front_matter.get('draft', False)
     except Exception as e:
         print(f"❌ Error reading {file_path}: {e}")
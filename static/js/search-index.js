@@ -0,0 +1,202 @@
+/*
+ * Ricerca sull'indice compatto generato da search_index.py.
+ *
+ * Scarica manifest.json (elenco dei post e degli shard) e, per ogni parola
+ * cercata, solo lo shard del suo prefisso. Le parole vengono normalizzate come
+ * in search_index.py: minuscolo, senza accenti, senza parole vuote.
+ */
+(function () {
+    'use strict';
+
+    const form = document.querySelector('.search-form');
+    if (!form || !form.dataset.index) {
+        return;
+    }
+    const input = form.querySelector('input[name="keyword"]');
+    const resultTitle = document.querySelector('.search-result--title');
+    const resultList = document.querySelector('.search-result--list');
+    const baseUrl = form.dataset.index;
+
+    // Peso extra quando la parola cercata coincide con quella indicizzata
+    const EXACT_BONUS = 2;
+    const DEBOUNCE_MS = 200;
+    const MIN_TERM_LENGTH = 2;
+
+    let manifest = null;
+    let manifestRequest = null;
+    const shards = new Map();
+
+    function fold(text) {
+        return text.toLowerCase().normalize('NFD').replace(/\p{Mn}/gu, '');
+    }
+
+    function tokenize(text, stopwords) {
+        return (fold(text).match(/[\p{L}\p{N}]+/gu) || [])
+            .filter((term) => Array.from(term).length >= MIN_TERM_LENGTH && !stopwords.has(term));
+    }
+
+    function shardKey(term) {
+        const key = Array.from(term).slice(0, manifest.prefix).join('');
+        return /^[a-z0-9]+$/.test(key) ? key : '_';
+    }
+
+    function fetchJson(name) {
+        return fetch(baseUrl + name).then((response) => {
+            if (!response.ok) {
+                throw new Error(response.status + ' ' + name);
+            }
+            return response.json();
+        });
+    }
+
+    function loadManifest() {
+        if (!manifestRequest) {
+            manifestRequest = fetchJson('manifest.json').then((data) => {
+                data.stopwords = new Set(data.stopwords);
+                data.shards = new Set(data.shards);
+                return data;
+            });
+        }
+        return manifestRequest;
+    }
+
+    function loadShard(key) {
+        if (!manifest.shards.has(key)) {
+            return Promise.resolve({});
+        }
+        if (!shards.has(key)) {
+            shards.set(key, fetchJson(key + '.json'));
+        }
+        return shards.get(key);
+    }
+
+    // Punteggio di ogni post per una parola (anche come prefisso di parole più lunghe)
+    function scoreTerm(token, shard) {
+        const scores = new Map();
+        for (const [term, postings] of Object.entries(shard)) {
+            if (!term.startsWith(token)) {
+                continue;
+            }
+            const bonus = term === token ? EXACT_BONUS : 1;
+            for (let i = 0; i < postings.length; i += 2) {
+                const doc = postings[i];
+                scores.set(doc, (scores.get(doc) || 0) + postings[i + 1] * bonus);
+            }
+        }
+        return scores;
+    }
+
+    async function search(query) {
+        manifest = await loadManifest();
+        const tokens = Array.from(new Set(tokenize(query, manifest.stopwords)))
+            .filter((token) => Array.from(token).length >= manifest.prefix);
+        if (!tokens.length) {
+            return [];
+        }
+        const loaded = await Promise.all(tokens.map((token) => loadShard(shardKey(token))));
+
+        // Un post è un risultato solo se contiene tutte le parole cercate
+        let total = null;
+        tokens.forEach((token, i) => {
+            const scores = scoreTerm(token, loaded[i]);
+            if (total === null) {
+                total = scores;
+                return;
+            }
+            for (const [doc, score] of total) {
+                if (scores.has(doc)) {
+                    total.set(doc, score + scores.get(doc));
+                } else {
+                    total.delete(doc);
+                }
+            }
+        });
+        // A parità di punteggio prima i post più recenti (gli id crescono con la data)
+        return Array.from(total)
+            .sort((a, b) => b[1] - a[1] || b[0] - a[0])
+            .map(([doc]) => manifest.docs[doc]);
+    }
+
+    function escapeHtml(text) {
+        const element = document.createElement('div');
+        element.textContent = text;
+        return element.innerHTML;
+    }
+
+    function render(results, seconds) {
+        resultTitle.textContent = (window.searchResultTitleTemplate || '#PAGES_COUNT')
+            .replace('#PAGES_COUNT', results.length)
+            .replace('#TIME_SECONDS', seconds.toFixed(3));
+        resultList.innerHTML = results.map((doc) => `
+            <article${doc.image ? ' class="has-image"' : ''}>
+                <a href="${escapeHtml(doc.url)}">
+                    <div class="article-details">
+                        <h2 class="article-title">${escapeHtml(doc.title)}</h2>
+                        <section class="article-preview">${escapeHtml(doc.summary)}</section>
+                    </div>
+                    ${doc.image ? `<div class="article-image"><img src="${escapeHtml(doc.image)}" loading="lazy"></div>` : ''}
+                </a>
+            </article>`).join('');
+    }
+
+    function clear() {
+        resultTitle.textContent = '';
+        resultList.innerHTML = '';
+    }
+
+    let lastQuery = '';
+    async function run(query) {
+        query = query.trim();
+        if (query === lastQuery) {
+            return;
+        }
+        lastQuery = query;
+        if (!query) {
+            clear();
+            return;
+        }
+        const start = performance.now();
+        try {
+            const results = await search(query);
+            if (query === lastQuery) {
+                render(results, (performance.now() - start) / 1000);
+            }
+        } catch (error) {
+            console.error('Search index:', error);
+            manifestRequest = null;
+            shards.clear();
+            lastQuery = '';
+        }
+    }
+
+    function updateUrl(query) {
+        const url = new URL(window.location.href);
+        if (query) {
+            url.searchParams.set('keyword', query);
+        } else {
+            url.searchParams.delete('keyword');
+        }
+        window.history.replaceState(null, '', url.toString());
+    }
+
+    let timer = null;
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(() => {
+            updateUrl(input.value.trim());
+            run(input.value);
+        }, DEBOUNCE_MS);
+    });
+    form.addEventListener('submit', (event) => {
+        event.preventDefault();
+        clearTimeout(timer);
+        updateUrl(input.value.trim());
+        run(input.value);
+    });
+
+    const keyword = new URLSearchParams(window.location.search).get('keyword');
+    if (keyword) {
+        input.value = keyword;
+        run(keyword);
+    }
+})();
@@ -10,6 +10,9 @@ import re
 import yaml
 from pathlib import Path
 
+import vault_catalog
+from frontmatter import load_yaml
+
 # Percorsi
 OBSIDIAN_POST_DIR = "/Users/lorenzo/Library/Mobile Documents/iCloud~md~obsidian/Documents/Ken vault/08 - Blog/"
 EXCLUDE_FILE = "/Users/lorenzo/Documents/GitHub/LolloBlog/.rsyncexclude"
@@ -22,40 +25,28 @@ def parse_front_matter(content):
     match = re.match(FRONT_MATTER_REGEX, content, re.DOTALL)
     if match:
         try:
-            front_matter = yaml.safe_load(match.group(1)) or {}
+            front_matter = load_yaml(match.group(1)) or {}
             return front_matter
         except yaml.YAMLError as e:
             print(f"❌ Error parsing YAML front matter: {e}")
             return {}
     return {}
 
-def create_exclude_file():
+def create_exclude_file(catalog=None):
     """Crea il file di esclusione per rsync basato sui post draft."""
-    draft_files = []
-    
     if not os.path.exists(OBSIDIAN_POST_DIR):
         print(f"⚠️  Warning: Obsidian directory not found: {OBSIDIAN_POST_DIR}")
         return False
     
     print(f"🔍 Scanning for draft posts in: {OBSIDIAN_POST_DIR}")
     
-    for filename in os.listdir(OBSIDIAN_POST_DIR):
-        if filename.endswith(".md"):
-            file_path = os.path.join(OBSIDIAN_POST_DIR, filename)
-            
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                
-                front_matter = parse_front_matter(content)
-                
-                # Controlla se il post è in draft
-                if front_matter.get('draft', False):
-                    draft_files.append(filename)
-                    print(f"📝 Found draft post: {filename}")
-                    
-            except Exception as e:
-                print(f"❌ Error reading {filename}: {e}")
+    # Il catalogo condiviso analizza ogni nota una sola volta
+    catalog = catalog or vault_catalog.get_catalog()
+    draft_files = []
+    for record in catalog.vault_drafts():
+        filename = os.path.basename(record.path)
+        draft_files.append(filename)
+        print(f"📝 Found draft post: {filename}")
     
     # Crea il file di esclusione
     try:
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Manifest persistente della sincronizzazione Obsidian -> Hugo.
+Per ogni nota sorgente registra dimensione, mtime e hash del contenuto,
+insieme alla lingua rilevata e allo stato del bundle di destinazione,
+così che una nuova esecuzione copi solo le note effettivamente cambiate.
+"""
+
+import os
+import shutil
+
+from fileutils import file_digest, load_json, save_json, stat_signature
+
+# Percorsi
+SYNC_MANIFEST_FILE = "/Users/lorenzo/Documents/GitHub/LolloBlog/.syncmanifest.json"
+
+MANIFEST_VERSION = 1
+
+def empty_manifest():
+    """Restituisce un manifest vuoto."""
+    return {"version": MANIFEST_VERSION, "posts": {}}
+
+def load_manifest(path=None):
+    """Carica il manifest dal disco; un file mancante o di versione diversa vale come vuoto."""
+    manifest = load_json(path or SYNC_MANIFEST_FILE)
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return empty_manifest()
+    manifest.setdefault("posts", {})
+    return manifest
+
+def save_manifest(manifest, path=None):
+    """Salva il manifest sul disco."""
+    save_json(path or SYNC_MANIFEST_FILE, manifest)
+
+def source_unchanged(entry, st):
+    """Controlla se la nota sorgente ha la stessa firma (size, mtime) registrata."""
+    source = entry.get("source") if entry else None
+    if not source:
+        return False
+    return source["size"] == st.st_size and source["mtime_ns"] == st.st_mtime_ns
+
+def target_unchanged(entry):
+    """Controlla se il file di destinazione esiste ancora con la firma registrata."""
+    target = entry.get("target") if entry else None
+    if not target:
+        return False
+    try:
+        st = os.stat(target["path"])
+    except OSError:
+        return False
+    return st.st_size == target["size"] and st.st_mtime_ns == target["mtime_ns"]
+
+def target_matches_hash(entry):
+    """
+    Controlla (rileggendolo) se il file di destinazione ha ancora il contenuto
+    registrato, che può differire dalla sorgente se riscritto da images.py.
+    """
+    target = entry.get("target") if entry else None
+    if not target or not os.path.exists(target["path"]):
+        return False
+    return file_digest(target["path"]) == target["hash"]
+
+def record_post(manifest, filename, source_st, digest, language, target_path, target_hash=None):
+    """
+    Registra nel manifest lo stato corrente di una nota e del suo bundle.
+    target_hash è l'hash del file di destinazione se diverso dalla sorgente
+    (es. index.md già riscritto da images.py); di default è quello della nota copiata.
+    """
+    target_st = os.stat(target_path)
+    manifest["posts"][filename] = {
+        "source": {**stat_signature(source_st), "hash": digest},
+        "language": language,
+        "target": {"path": target_path, **stat_signature(target_st), "hash": target_hash or digest},
+    }
+
+def refresh_targets(manifest, paths):
+    """
+    Aggiorna la firma registrata dei file di destinazione modificati dopo la
+    copia (es. da images.py), così non vengono ricopiati alla prossima esecuzione.
+    Restituisce il numero di voci aggiornate.
+    """
+    paths = set(paths)
+    refreshed = 0
+    for entry in manifest["posts"].values():
+        target = entry.get("target")
+        if target and target["path"] in paths and os.path.exists(target["path"]):
+            target.update(stat_signature(os.stat(target["path"])))
+            target["hash"] = file_digest(target["path"])
+            refreshed += 1
+    return refreshed
+
+def remove_target_bundle(entry):
+    """Rimuove il bundle di destinazione associato a una voce del manifest."""
+    target = entry.get("target") if entry else None
+    if not target:
+        return False
+    bundle_dir = os.path.dirname(target["path"])
+    if os.path.isdir(bundle_dir):
+        shutil.rmtree(bundle_dir)
+        return True
+    if os.path.exists(target["path"]):
+        os.remove(target["path"])
+        return True
+    return False
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare l'indice degli allegati di attachment_index.py
+"""
+
+import os
+import shutil
+import tempfile
+
+from attachment_index import AttachmentIndex
+
+def touch(root, relpath):
+    path = os.path.join(root, relpath)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(relpath.encode("utf-8"))
+    return path
+
+def test_resolution():
+    """Test: risoluzione dei link come Obsidian (percorso più breve e suffisso)"""
+    print("🧪 Test: Risoluzione degli allegati")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        top = touch(temp_dir, "Pasted image.png")
+        nested = touch(temp_dir, "2024/marzo/Pasted image.png")
+        only_nested = touch(temp_dir, "2024/schema.png")
+        touch(temp_dir, ".trash/cestinata.png")
+        
+        index = AttachmentIndex(temp_dir)
+        assert len(index) == 3
+        assert index.scanned_dirs == 3
+        
+        # Nome semplice: l'allegato più vicino alla radice
+        assert index.resolve("Pasted image.png").path == top
+        assert index.resolve("schema.png").path == only_nested
+        assert index.resolve("schema.png").stat.st_size == len("2024/schema.png")
+        
+        # Link con percorso: corrispondenza sul suffisso del percorso
+        assert index.resolve("marzo/Pasted image.png").path == nested
+        assert index.resolve("2024/marzo/Pasted image.png").path == nested
+        assert index.resolve("aprile/Pasted image.png") is None
+        
+        # Cartelle nascoste e file mancanti non vengono trovati
+        assert index.resolve("cestinata.png") is None
+        assert index.resolve("Mancante.png") is None
+        assert len(AttachmentIndex(os.path.join(temp_dir, "inesistente"))) == 0
+        
+        print("✅ Test resolution: SUCCESSO")
+    finally:
+        shutil.rmtree(temp_dir)
+
+def test_vault_and_relative_links():
+    """Test: link dalla radice del vault e relativi alla nota"""
+    print("🧪 Test: Link dal vault e relativi")
+    
+    vault_dir = tempfile.mkdtemp()
+    try:
+        os.makedirs(os.path.join(vault_dir, ".obsidian"))
+        attachments_dir = os.path.join(vault_dir, "99 - Meta", "Clipboard")
+        top = touch(attachments_dir, "Pasted image.png")
+        nested = touch(attachments_dir, "2024/marzo/Pasted image.png")
+        
+        index = AttachmentIndex(attachments_dir)
+        assert index.vault_prefix == "99 - Meta/Clipboard"
+        
+        # Percorso dalla radice del vault
+        assert index.resolve("99 - Meta/Clipboard/2024/marzo/Pasted image.png").path == nested
+        assert index.resolve("99 - Meta/Clipboard/Pasted image.png").path == top
+        # Percorso relativo alla nota (08 - Blog/Post.md) e con './'
+        assert index.resolve("../99 - Meta/Clipboard/2024/marzo/Pasted image.png").path == nested
+        assert index.resolve("./2024/./marzo/Pasted image.png").path == nested
+        assert index.resolve("./Pasted image.png").path == top
+        # Cartella inesistente o fuori dagli allegati
+        assert index.resolve("99 - Meta/Clipboard/2024/aprile/Pasted image.png") is None
+        assert index.resolve("../Altro/Pasted image.png") is None
+        
+        # Radice del vault indicata esplicitamente
+        assert AttachmentIndex(attachments_dir, vault_dir=os.path.join(vault_dir, "99 - Meta")).vault_prefix == "Clipboard"
+        
+        print("✅ Test vault and relative links: SUCCESSO")
+    finally:
+        shutil.rmtree(vault_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per attachment_index.py")
+    print("-" * 50)
+    
+    try:
+        test_resolution()
+        test_vault_and_relative_links()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare l'impronta degli input di Hugo di build_fingerprint.py
+"""
+
+import os
+import shutil
+import tempfile
+
+import build_fingerprint
+
+def write(root, rel, text="x"):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def make_site(root):
+    """Sito minimo con contenuti, tema e output già generati."""
+    write(root, "hugo.yaml", "theme: stack\nbaseurl: https://example.org/\n")
+    write(root, "content/it/post/Primo/index.md", "---\ntitle: Primo\n---\n")
+    write(root, "assets/scss/custom.scss")
+    write(root, "static/favicon.ico")
+    write(root, "themes/stack/layouts/index.html")
+    write(root, "themes/other/layouts/index.html")
+    write(root, "public/index.html")
+
+def test_check_build():
+    """Test: la generazione serve solo quando cambia un input"""
+    print("🧪 Test: Impronta degli input")
+
+    test_dir = tempfile.mkdtemp()
+    state_path = os.path.join(test_dir, ".buildfingerprint.json")
+    try:
+        make_site(test_dir)
+        needed, reason, state = build_fingerprint.check_build(test_dir, state_path)
+        assert needed == True and "no previous" in reason
+        assert sorted(state["files"]) == ["assets/scss/custom.scss", "content/it/post/Primo/index.md",
+                                          "hugo.yaml", "static/favicon.ico", "themes/stack/layouts/index.html"]
+        build_fingerprint.save_state(state, state_path)
+
+        needed, reason, _ = build_fingerprint.check_build(test_dir, state_path)
+        assert needed == False and "unchanged" in reason
+
+        # Output, file nascosti, temi non usati e mtime diversi non contano
+        write(test_dir, "public/index.html", "nuovo")
+        write(test_dir, "content/.DS_Store", "finder")
+        write(test_dir, "themes/other/layouts/index.html", "altro")
+        os.utime(os.path.join(test_dir, "hugo.yaml"), (1, 1))
+        needed, _, state = build_fingerprint.check_build(test_dir, state_path)
+        assert needed == False
+        build_fingerprint.save_state(state, state_path)
+
+        write(test_dir, "content/it/post/Primo/index.md", "---\ntitle: Primo (modificato)\n---\n")
+        write(test_dir, "themes/stack/layouts/404.html")
+        os.remove(os.path.join(test_dir, "static", "favicon.ico"))
+        needed, reason, _ = build_fingerprint.check_build(test_dir, state_path)
+        assert needed == True
+        assert reason == ("inputs changed: 1 added (themes/stack/layouts/404.html); "
+                          "1 modified (content/it/post/Primo/index.md); 1 removed (static/favicon.ico)")
+
+        # Senza public/ il sito va rigenerato anche a input invariati
+        _, _, state = build_fingerprint.check_build(test_dir, state_path)
+        build_fingerprint.save_state(state, state_path)
+        shutil.rmtree(os.path.join(test_dir, "public"))
+        needed, reason, _ = build_fingerprint.check_build(test_dir, state_path)
+        assert needed == True and "public/" in reason
+
+        print("✅ Test check build: SUCCESSO")
+    finally:
+        shutil.rmtree(test_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per build_fingerprint.py")
+    print("-" * 50)
+
+    try:
+        test_check_build()
+
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare la rimozione delle immagini orfane di bundle_gc.py
+"""
+
+import os
+import shutil
+import tempfile
+
+import images
+from attachment_index import AttachmentIndex
+from bundle_gc import AssetGC
+
+def make_bundle(bundle_dir):
+    """Bundle con immagini referenziate in vari modi e due immagini orfane."""
+    os.makedirs(bundle_dir)
+    for name, size in (("embed.png", 10), ("figura.webp", 20), ("Copertina.jpg", 30), ("cover.png", 40),
+                       ("vecchia.png", 100), ("rinominata.gif", 50), ("appunti.pdf", 60)):
+        with open(os.path.join(bundle_dir, name), "wb") as f:
+            f.write(b"x" * size)
+    with open(os.path.join(bundle_dir, "index.md"), "w", encoding="utf-8") as f:
+        f.write("---\ntitle: Post\nimage: copertina.jpg\ncover: cover.png\n---\n"
+                "![embed](embed.png)\n{{< figure src=\"figura.webp\" width=\"400\" >}}\n"
+                "```\n![[rinominata.gif]]\n```\n")
+
+def test_sweep():
+    """Test: dry-run elenca le immagini orfane, la modalità normale le rimuove"""
+    print("🧪 Test: Rimozione delle immagini orfane")
+    
+    test_dir = tempfile.mkdtemp()
+    try:
+        bundle_dir = os.path.join(test_dir, "Post")
+        make_bundle(bundle_dir)
+        markdown_file = os.path.join(bundle_dir, "index.md")
+        attachments = AttachmentIndex(os.path.join(test_dir, "allegati"))
+        lines = []
+        
+        dry_run = AssetGC(dry_run=True)
+        images.process_images_for_post(bundle_dir, markdown_file, attachments=attachments, gc=dry_run, log=lines.append)
+        assert (dry_run.removed_files, dry_run.removed_bytes) == (2, 150)
+        assert "  🧹 Would remove orphaned image: rinominata.gif (50 B)" in lines
+        assert os.path.exists(os.path.join(bundle_dir, "vecchia.png"))
+        
+        gc = AssetGC()
+        images.process_images_for_post(bundle_dir, markdown_file, attachments=attachments, gc=gc, log=lines.append)
+        assert sorted(os.listdir(bundle_dir)) == ["Copertina.jpg", "appunti.pdf", "cover.png",
+                                                  "embed.png", "figura.webp", "index.md"]
+        assert gc.removed_bytes == 150
+        
+        print("✅ Test sweep: SUCCESSO")
+    finally:
+        shutil.rmtree(test_dir)
+
+def test_other_references_kept():
+    """Test: link, riferimenti, link di Obsidian e src/href tengono le immagini nel bundle"""
+    print("🧪 Test: Riferimenti non riscritti dagli embed")
+    
+    test_dir = tempfile.mkdtemp()
+    try:
+        bundle_dir = os.path.join(test_dir, "Post")
+        os.makedirs(bundle_dir)
+        names = ("full.png", "ref.png", "wiki.png", "Wiki-spazi.png", "scarica.jpg", "sorgente.webp",
+                 "piccola.png", "Grande-2x.png", "nel-codice.png")
+        for name in names:
+            with open(os.path.join(bundle_dir, name), "wb") as f:
+                f.write(b"x" * 10)
+        markdown_file = os.path.join(bundle_dir, "index.md")
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write("---\ntitle: Post\n---\n"
+                    "[Versione completa](full.png)\n"
+                    "![Immagine][ref]\n\n[ref]: ref.png \"titolo\"\n\n"
+                    "Vedi [[wiki.png]] e [[Wiki spazi.png|alias]].\n"
+                    "<a href=\"scarica.jpg\">scarica</a> <video src='sorgente.webp'></video>\n"
+                    "<img srcset=\"piccola.png 480w, Grande 2x.png 1024w\">\n"
+                    "[remota](https://example.com/full.png) `[codice](nel-codice.png)`\n")
+        
+        gc = AssetGC()
+        images.process_images_for_post(bundle_dir, markdown_file, attachments=AttachmentIndex(os.path.join(test_dir, "allegati")),
+                                       gc=gc, log=lambda line: None)
+        assert sorted(os.listdir(bundle_dir)) == sorted(set(names) - {"nel-codice.png"} | {"index.md"})
+        assert gc.removed_files == 1
+        
+        print("✅ Test other references kept: SUCCESSO")
+    finally:
+        shutil.rmtree(test_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per bundle_gc.py")
+    print("-" * 50)
+    
+    try:
+        test_sweep()
+        test_other_references_kept()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare il manifest delle differenze di delta_manifest.py
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+import delta_manifest
+
+def write(root, rel, text="x"):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def git(root, *args):
+    return subprocess.run(["git", *args], cwd=root, check=True, capture_output=True, text=True).stdout
+
+def make_site(root):
+    """Repository con contenuti e output già pubblicati."""
+    write(root, "content/it/post/Primo/index.md", "primo")
+    write(root, "content/it/post/Secondo/index.md", "secondo")
+    write(root, "public/index.html", "home")
+    write(root, "public/post/primo/index.html", "primo")
+    write(root, "public/post/secondo/index.html", "secondo")
+    write(root, "hugo.yaml", "theme: stack\n")
+    git(root, "init", "-q")
+    git(root, "add", ".")
+    git(root, "-c", "user.name=test", "-c", "user.email=test@example.org", "commit", "-q", "-m", "init")
+
+def publish_changes(root):
+    """Modifiche tipiche di una pubblicazione, più un file fuori da content/ e public/."""
+    write(root, "content/it/post/Primo/index.md", "primo modificato")
+    write(root, "content/it/post/Terzo/index.md", "terzo")
+    shutil.rmtree(os.path.join(root, "content", "it", "post", "Secondo"))
+    write(root, "public/index.html", "home aggiornata")
+    write(root, "public/post/terzo/index.html", "terzo")
+    shutil.rmtree(os.path.join(root, "public", "post", "secondo"))
+    write(root, "hugo.yaml", "theme: altro\n")
+
+def test_stage_delta():
+    """Test: vengono aggiunti al commit solo i file cambiati di content/ e public/"""
+    print("🧪 Test: Staging del delta")
+
+    test_dir = tempfile.mkdtemp()
+    state_path = os.path.join(test_dir, ".deltastate.json")
+    try:
+        make_site(test_dir)
+        delta, state = delta_manifest.compute_delta(test_dir, state_path)
+        assert len(delta["added"]) == 5 and delta["modified"] == [] and delta["deleted"] == []
+        delta_manifest.save_state(state, state_path)
+
+        # Senza cambiamenti il delta è vuoto
+        delta, _ = delta_manifest.compute_delta(test_dir, state_path)
+        assert delta_manifest.delta_paths(delta) == []
+
+        publish_changes(test_dir)
+        delta, state = delta_manifest.compute_delta(test_dir, state_path)
+        assert delta["added"] == ["content/it/post/Terzo/index.md", "public/post/terzo/index.html"]
+        assert delta["modified"] == ["content/it/post/Primo/index.md", "public/index.html"]
+        assert delta["deleted"] == ["content/it/post/Secondo/index.md", "public/post/secondo/index.html"]
+
+        assert delta_manifest.stage_delta(delta, test_dir) == True
+        staged = git(test_dir, "diff", "--cached", "--name-status").split("\n")
+        assert sorted(line for line in staged if line) == [
+            "A\tcontent/it/post/Terzo/index.md",
+            "A\tpublic/post/terzo/index.html",
+            "D\tcontent/it/post/Secondo/index.md",
+            "D\tpublic/post/secondo/index.html",
+            "M\tcontent/it/post/Primo/index.md",
+            "M\tpublic/index.html",
+        ]
+        # hugo.yaml non fa parte del delta
+        assert git(test_dir, "diff", "--name-only") == "hugo.yaml\n"
+
+        print("✅ Test stage delta: SUCCESSO")
+    finally:
+        shutil.rmtree(test_dir)
+
+def test_deploy_public():
+    """Test: la cartella di deploy riceve solo i file di public/ cambiati dal suo ultimo deploy"""
+    print("🧪 Test: Deploy di public/")
+    
+    test_dir = tempfile.mkdtemp()
+    deploy_dir = os.path.join(test_dir, "deploy")
+    state_path = os.path.join(test_dir, ".deltastate.json")
+    deploy_state = os.path.join(test_dir, ".deploystate.json")
+    try:
+        make_site(test_dir)
+        # Cartella senza manifest: copia completa
+        _, state = delta_manifest.compute_delta(test_dir, state_path)
+        assert delta_manifest.deploy_public(deploy_dir, test_dir, state["files"], deploy_state) == (3, 0)
+        delta_manifest.save_state(state, state_path)
+        assert sorted(delta_manifest.load_deploy_manifest(deploy_dir, deploy_state)) == [
+            "public/index.html", "public/post/primo/index.html", "public/post/secondo/index.html"]
+        # File già presente nella destinazione e non cambiato
+        os.utime(os.path.join(deploy_dir, "post", "primo", "index.html"), (1, 1))
+        
+        publish_changes(test_dir)
+        _, state = delta_manifest.compute_delta(test_dir, state_path)
+        assert delta_manifest.deploy_public(deploy_dir, test_dir, state["files"], deploy_state) == (2, 1)
+        
+        deployed = sorted(os.path.relpath(os.path.join(root, name), deploy_dir)
+                          for root, _, names in os.walk(deploy_dir) for name in names)
+        assert deployed == ["index.html", "post/primo/index.html", "post/terzo/index.html"]
+        assert not os.path.exists(os.path.join(deploy_dir, "post", "secondo"))
+        assert os.path.getmtime(os.path.join(deploy_dir, "post", "primo", "index.html")) == 1
+        with open(os.path.join(deploy_dir, "index.html"), encoding="utf-8") as f:
+            assert f.read() == "home aggiornata"
+        
+        print("✅ Test deploy public: SUCCESSO")
+    finally:
+        shutil.rmtree(test_dir)
+
+def test_deploy_targets_in_sync():
+    """Test: una cartella nuova, rimasta indietro o incompleta torna allineata"""
+    print("🧪 Test: Allineamento delle cartelle di deploy")
+    
+    test_dir = tempfile.mkdtemp()
+    state_path = os.path.join(test_dir, ".deltastate.json")
+    deploy_state = os.path.join(test_dir, ".deploystate.json")
+    first = os.path.join(test_dir, "deploy-a")
+    second = os.path.join(test_dir, "deploy-b")
+    try:
+        make_site(test_dir)
+        _, state = delta_manifest.compute_delta(test_dir, state_path)
+        delta_manifest.save_state(state, state_path)
+        assert delta_manifest.deploy_public(first, test_dir, state["files"], deploy_state) == (3, 0)
+        
+        # Pubblicazione mentre la seconda cartella non riceve deploy
+        publish_changes(test_dir)
+        delta, state = delta_manifest.compute_delta(test_dir, state_path)
+        delta_manifest.save_state(state, state_path)
+        assert delta_manifest.deploy_public(first, test_dir, state["files"], deploy_state) == (2, 1)
+        
+        # Il delta dell'ultimo commit è vuoto, ma la cartella nuova riceve tutto
+        delta, state = delta_manifest.compute_delta(test_dir, state_path)
+        assert delta_manifest.delta_paths(delta) == []
+        assert delta_manifest.deploy_public(second, test_dir, state["files"], deploy_state) == (3, 0)
+        # Nessuna differenza per nessuna delle due
+        assert delta_manifest.deploy_public(first, test_dir, None, deploy_state) == (0, 0)
+        assert delta_manifest.deploy_public(second, test_dir, None, deploy_state) == (0, 0)
+        
+        # File perso nella destinazione (deploy interrotto o cancellato a mano): viene ricopiato
+        os.remove(os.path.join(first, "post", "terzo", "index.html"))
+        assert delta_manifest.deploy_public(first, test_dir, None, deploy_state) == (1, 0)
+        assert os.path.exists(os.path.join(first, "post", "terzo", "index.html"))
+        
+        # Cartella cancellata: il manifest non conta più, copia completa
+        shutil.rmtree(second)
+        assert delta_manifest.deploy_public(second, test_dir, None, deploy_state) == (3, 0)
+        
+        print("✅ Test deploy targets in sync: SUCCESSO")
+    finally:
+        shutil.rmtree(test_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per delta_manifest.py")
+    print("-" * 50)
+
+    try:
+        test_stage_delta()
+        test_deploy_public()
+        test_deploy_targets_in_sync()
+
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
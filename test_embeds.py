@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare la riscrittura delle immagini di embeds.py
+"""
+
+from embeds import Asset, rewrite_embeds
+
+def test_obsidian_embeds():
+    """Test: embed di Obsidian con tutte le estensioni e le dimensioni"""
+    print("🧪 Test: Embed di Obsidian")
+    
+    body = ("![[Pasted image 1.png]]\n"
+            "![[foto.JPG]] ![[animazione.gif|didascalia]]\n"
+            "![[schema.webp|400]]\n"
+            "![[sotto/diagramma.svg|400x300]]\n"
+            "![[Nota collegata]] ![[documento.pdf]]\n")
+    new_body, assets = rewrite_embeds(body)
+    
+    assert new_body == ("![Pasted-image-1.png](Pasted-image-1.png)\n"
+                        "![foto.JPG](foto.JPG) ![didascalia](animazione.gif)\n"
+                        "![schema.webp|400](schema.webp)\n"
+                        "![diagramma.svg|400|400x300](diagramma.svg)\n"
+                        "![[Nota collegata]] ![[documento.pdf]]\n")
+    assert assets == [
+        Asset("Pasted image 1.png", "Pasted-image-1.png"),
+        Asset("foto.JPG", "foto.JPG"),
+        Asset("animazione.gif", "animazione.gif"),
+        Asset("schema.webp", "schema.webp"),
+        Asset("sotto/diagramma.svg", "diagramma.svg"),
+    ]
+    
+    print("✅ Test obsidian embeds: SUCCESSO")
+
+def test_markdown_images_and_code():
+    """Test: immagini markdown locali, immagini remote e codice lasciato invariato"""
+    print("🧪 Test: Immagini markdown e codice")
+    
+    body = ("![alt](<Pasted image 2.png> \"titolo\")\n"
+            "![già ok](Pasted-image-3.png)\n"
+            "![spazio](Pasted%20image%204.jpeg)\n"
+            "![remota](https://example.com/a.png)\n"
+            "`![[inline.png]]`\n"
+            "```\n![[nel codice.png]]\n```\n"
+            "![[Pasted image 1.png]] ![[Pasted image 1.png]]\n")
+    new_body, assets = rewrite_embeds(body)
+    
+    assert new_body == ("![alt](Pasted-image-2.png \"titolo\")\n"
+                        "![già ok](Pasted-image-3.png)\n"
+                        "![spazio](Pasted-image-4.jpeg)\n"
+                        "![remota](https://example.com/a.png)\n"
+                        "`![[inline.png]]`\n"
+                        "```\n![[nel codice.png]]\n```\n"
+                        "![Pasted-image-1.png](Pasted-image-1.png) ![Pasted-image-1.png](Pasted-image-1.png)\n")
+    # Un allegato referenziato più volte compare una sola volta
+    assert [asset.link for asset in assets] == ["Pasted image 2.png", "Pasted-image-3.png",
+                                                "Pasted image 4.jpeg", "Pasted image 1.png"]
+    
+    print("✅ Test markdown images and code: SUCCESSO")
+
+def test_existing_references():
+    """Test: shortcode e tag <img> restano invariati ma contano come allegati"""
+    print("🧪 Test: Riferimenti già convertiti")
+    
+    body = ('{{< figure src="schema.webp" width="400" >}}\n'
+            "<img src='Foto 1.jpg' alt='foto'>\n"
+            '{{< youtube id="abc" >}}\n')
+    new_body, assets = rewrite_embeds(body)
+    
+    assert new_body == body
+    assert assets == [Asset("schema.webp", "schema.webp"), Asset("Foto 1.jpg", "Foto 1.jpg")]
+    
+    print("✅ Test existing references: SUCCESSO")
+
+def test_size_hints_stay_markdown():
+    """Test: larghezza, dimensioni e colore finiscono nel testo alternativo, mai in uno shortcode"""
+    print("🧪 Test: Dimensioni come immagini markdown")
+    
+    info = {"Pasted image 1.png": {"width": 1600, "height": 900, "color": "#d0d4da"},
+            "schema.webp": {"width": 800, "height": 400, "color": None}}
+    body = ("![[Pasted image 1.png]]\n![[Pasted image 1.png| 640 x 480 ]]\n"
+            "![[schema.webp|schema \"grande\"]]\n![[foto.png|]]\n![[foto.png|300x200]]\n![già](già.png)\n")
+    new_body, assets = rewrite_embeds(body, info.get)
+    
+    assert new_body == ("![Pasted-image-1.png|1600x900|#d0d4da](Pasted-image-1.png)\n"
+                        "![Pasted-image-1.png|640|1600x900|#d0d4da](Pasted-image-1.png)\n"
+                        '![schema "grande"|800x400](schema.webp)\n'
+                        "![foto.png](foto.png)\n"
+                        "![foto.png|300|300x200](foto.png)\n"
+                        "![già](già.png)\n")
+    assert "figure" not in new_body
+    assert len(assets) == 4
+    
+    print("✅ Test size hints stay markdown: SUCCESSO")
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per embeds.py")
+    print("-" * 50)
+    
+    try:
+        test_obsidian_embeds()
+        test_markdown_images_and_code()
+        test_existing_references()
+        test_size_hints_stay_markdown()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare la lettura e l'analisi del front matter di frontmatter.py
+"""
+
+import os
+import re
+import shutil
+import tempfile
+
+import yaml
+
+from frontmatter import read_front_matter_block, load_front_matter, load_yaml, parse_flat_yaml, patch_front_matter_value, set_front_matter_value
+
+# Regex usata dagli script prima del lettore a blocchi
+FRONT_MATTER_REGEX = r'^---\s*\n(.*?)\n---\s*\n'
+
+SAMPLES = {
+    "normal.md": "---\ntitle: \"Test Post\"\ndraft: true\ntags: [\"a\", \"b\"]\n---\n\n# Content\n",
+    "crlf.md": "---\r\ntitle: Windows\r\ndraft: false\r\n---\r\nBody\r\n",
+    "trailing-space.md": "--- \ntitle: Spazi\n---  \nBody\n",
+    "no-front-matter.md": "# Solo testo\n---\ntitle: no\n---\n",
+    "unclosed.md": "---\ntitle: Aperto\nBody senza chiusura\n",
+    "no-newline.md": "---\ntitle: Fine\n---",
+    "empty.md": "",
+}
+
+# Front matter per il confronto tra parser veloce e PyYAML
+YAML_SAMPLES = [
+    'title: "Test Post"\ndate: 2025-08-25\ndraft: false\ntags: ["test", "blog"]',
+    "title: 'Da TradingView a MT5: Automazione'\ndate: 2025-07-02 22:00:00\nlanguage: it\ntags:\n- Trading",
+    "description: 'Una descrizione lunga:\n  su più righe, con l''apostrofo\n  e altro testo.'\nimage: Pasted-image.png",
+    "description: testo semplice\n  che continua\nweight: 3\nmath: on",
+    "categories:\n  - Blog\n  - Python\nempty:\nnumbers: [1, 2.5, null]",
+    "title: C# e F#\ncount: 0x1F\nversion: 1.0.2\nold: 012",
+    # Costrutti che il parser veloce deve lasciare a PyYAML
+    "on: x",
+    "menu:\n    main:\n        weight: 30",
+    "text: |\n  blocco letterale",
+    "k: \"con \\n escape\"",
+    "k: -5",
+    "k: [a, [b]]",
+    "k: x\n\n  y",
+    "# solo un commento",
+]
+
+def regex_front_matter(content):
+    """Risultato atteso secondo la vecchia implementazione con regex."""
+    match = re.match(FRONT_MATTER_REGEX, content, re.DOTALL)
+    if match:
+        return yaml.safe_load(match.group(1)) or {}
+    return {}
+
+def test_matches_regex_behaviour():
+    """Test equivalenza con la regex FRONT_MATTER_REGEX"""
+    print("🧪 Test: Equivalenza con la regex")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        for filename, content in SAMPLES.items():
+            path = os.path.join(temp_dir, filename)
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(content)
+            assert load_front_matter(path) == regex_front_matter(content), filename
+        
+        print("✅ Test regex equivalence: SUCCESSO")
+    finally:
+        shutil.rmtree(temp_dir)
+
+def test_body_not_loaded():
+    """Test: il corpo della nota e i file senza front matter non vengono letti"""
+    print("🧪 Test: Corpo non caricato")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        # Nota con un corpo enorme oltre il limite in byte
+        big_post = os.path.join(temp_dir, "big.md")
+        with open(big_post, "w", encoding="utf-8") as f:
+            f.write("---\ndraft: true\n---\n")
+            f.write("x" * (2 * 1024 * 1024))
+        assert read_front_matter_block(big_post, max_bytes=1024) == "draft: true\n"
+        assert load_front_matter(big_post, max_bytes=1024) == {"draft": True}
+        
+        # Front matter non chiuso entro il limite
+        unbounded = os.path.join(temp_dir, "unbounded.md")
+        with open(unbounded, "w", encoding="utf-8") as f:
+            f.write("---\n")
+            f.write("key: value\n" * 1000)
+        assert read_front_matter_block(unbounded, max_bytes=1024) is None
+        
+        # Nota senza front matter: scartata dopo la prima riga
+        plain = os.path.join(temp_dir, "plain.md")
+        with open(plain, "w", encoding="utf-8") as f:
+            f.write("Testo\n" + "---\ndraft: true\n---\n")
+        assert read_front_matter_block(plain) is None
+        
+        print("✅ Test body not loaded: SUCCESSO")
+    finally:
+        shutil.rmtree(temp_dir)
+
+def test_fast_parser_matches_pyyaml():
+    """Test: parser veloce e catena di loader danno gli stessi risultati di yaml.safe_load"""
+    print("🧪 Test: Parser veloce identico a PyYAML")
+    
+    for sample in YAML_SAMPLES:
+        expected = yaml.safe_load(sample)
+        fast = parse_flat_yaml(sample)
+        assert fast is None or fast == expected, sample
+        assert load_yaml(sample) == expected, sample
+    
+    # I casi semplici devono effettivamente usare il percorso veloce
+    assert parse_flat_yaml(YAML_SAMPLES[0]) is not None
+    assert parse_flat_yaml(YAML_SAMPLES[2]) is not None
+    assert parse_flat_yaml("on: x") is None
+    
+    print("✅ Test fast parser: SUCCESSO")
+
+def test_patch_front_matter_value():
+    """Test: la modifica di una chiave lascia invariato il resto del documento"""
+    print("🧪 Test: Modifica mirata del front matter")
+    
+    content = ("---\ntitle: 'Un titolo lungo che\n  va a capo'\nimage: Pasted image 1.png\n"
+               "tags:\n- blog\ndate: 2024-03-01\n---\nimage: nel corpo non cambia\n")
+    patched = patch_front_matter_value(content, "image", "Pasted-image-1.png")
+    assert patched == content.replace("image: Pasted image 1.png", "image: Pasted-image-1.png")
+    
+    # Lo stile degli apici viene mantenuto, i valori ambigui vengono quotati
+    assert patch_front_matter_value("---\nimage: 'a b.png'\n---\n", "image", "a-b.png") == "---\nimage: 'a-b.png'\n---\n"
+    assert patch_front_matter_value("---\nimage: a\n---\n", "image", "yes") == '---\nimage: "yes"\n---\n'
+    
+    # Continuazioni del valore originale sostituite insieme alla chiave
+    folded = "---\nimage: Pasted image\n  2024.png\ntitle: T\n---\n"
+    assert patch_front_matter_value(folded, "image", "x.png") == "---\nimage: x.png\ntitle: T\n---\n"
+    
+    # Casi non gestiti: nessuna modifica
+    assert patch_front_matter_value("---\ntitle: T\n---\n", "image", "x.png") is None
+    assert patch_front_matter_value("---\nimage: a # nota\n---\n", "image", "x.png") is None
+    assert patch_front_matter_value("---\nimage:\n  - a\n---\n", "image", "x.png") is None
+    assert patch_front_matter_value("Nessun front matter\n", "image", "x.png") is None
+    
+    # Chiave mancante: aggiunta in fondo al front matter; se esiste viene aggiornata
+    added = set_front_matter_value("---\ntitle: T\n---\nCorpo\n", "imageWidth", 800)
+    assert added == "---\ntitle: T\nimageWidth: 800\n---\nCorpo\n"
+    assert set_front_matter_value(added, "imageWidth", 640) == "---\ntitle: T\nimageWidth: 640\n---\nCorpo\n"
+    assert set_front_matter_value("Nessun front matter\n", "imageWidth", 800) is None
+    
+    print("✅ Test patch front matter: SUCCESSO")
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per frontmatter.py")
+    print("-" * 50)
+    
+    try:
+        test_matches_regex_behaviour()
+        test_body_not_loaded()
+        test_fast_parser_matches_pyyaml()
+        test_patch_front_matter_value()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare la copia delle immagini basata sul contenuto di image_cache.py
+"""
+
+import os
+import shutil
+import tempfile
+
+import image_cache
+
+def write_bytes(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+def test_place_file():
+    """Test: copia solo se il contenuto della destinazione è diverso"""
+    print("🧪 Test: Copia delle immagini basata sul contenuto")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        src = os.path.join(temp_dir, "Pasted image.png")
+        dst = os.path.join(temp_dir, "Pasted-image.png")
+        write_bytes(src, b"\x89PNG immagine")
+        
+        cache = image_cache.ImageCache(os.path.join(temp_dir, "cache.json"))
+        stats = image_cache.new_copy_stats()
+        
+        assert image_cache.place_file(src, dst, cache, stats) == True
+        assert image_cache.place_file(src, dst, cache, stats) == False
+        assert stats == {"copied": 1, "copied_bytes": 13, "skipped": 1, "skipped_bytes": 13}
+        # La sorgente viene letta una sola volta, la copia non viene mai riletta
+        assert cache.hashed_count == 1
+        
+        # Destinazione modificata con la stessa dimensione: viene ricopiata
+        write_bytes(dst, b"\x89PNG modifica")
+        assert image_cache.place_file(src, dst, cache, stats) == True
+        with open(dst, "rb") as f:
+            assert f.read() == b"\x89PNG immagine"
+        
+        print("✅ Test place file: SUCCESSO")
+    finally:
+        shutil.rmtree(temp_dir)
+
+def test_cache_persistence():
+    """Test: gli hash salvati evitano di rileggere i file nelle esecuzioni successive"""
+    print("🧪 Test: Persistenza della cache delle immagini")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        cache_file = os.path.join(temp_dir, "cache.json")
+        src = os.path.join(temp_dir, "a.png")
+        dst = os.path.join(temp_dir, "b.png")
+        gone = os.path.join(temp_dir, "gone.png")
+        write_bytes(src, b"contenuto")
+        write_bytes(gone, b"temporaneo")
+        
+        cache = image_cache.ImageCache(cache_file)
+        image_cache.place_file(src, dst, cache)
+        cache.digest(gone)
+        os.remove(gone)
+        cache.save()
+        
+        reloaded = image_cache.ImageCache(cache_file)
+        assert sorted(reloaded.files) == [src, dst]
+        assert image_cache.place_file(src, dst, reloaded) == False
+        assert reloaded.hashed_count == 0
+        
+        print("✅ Test cache persistence: SUCCESSO")
+    finally:
+        shutil.rmtree(temp_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per image_cache.py")
+    print("-" * 50)
+    
+    try:
+        test_place_file()
+        test_cache_persistence()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare la lettura dei metadati delle immagini di image_metadata.py
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+
+import image_metadata
+
+def png_header(width, height):
+    """Intestazione PNG minima: firma e chunk IHDR."""
+    return b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+
+def jpeg_header(width, height):
+    """JPEG minimo: SOI, un segmento APP0 da saltare e il frame SOF0."""
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    sof0 = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, height, width, 1) + b"\x01\x11\x00"
+    return b"\xff\xd8" + app0 + sof0 + b"\xff\xd9"
+
+def webp_header(chunk, payload):
+    return b"RIFF" + struct.pack("<I", 4 + 8 + len(payload)) + b"WEBP" + chunk + struct.pack("<I", len(payload)) + payload
+
+SAMPLES = {
+    "a.png": (png_header(1280, 720), (1280, 720)),
+    "b.gif": (b"GIF89a" + struct.pack("<HH", 320, 200) + b"\x00" * 8, (320, 200)),
+    "c.jpg": (jpeg_header(800, 600), (800, 600)),
+    "d.webp": (webp_header(b"VP8 ", b"\x00\x00\x00\x9d\x01\x2a" + struct.pack("<HH", 640, 480) + b"\x00" * 4), (640, 480)),
+    "e.webp": (webp_header(b"VP8L", b"\x2f" + (399 | 299 << 14).to_bytes(4, "little") + b"\x00" * 4), (400, 300)),
+    "f.webp": (webp_header(b"VP8X", b"\x00" * 4 + (1919).to_bytes(3, "little") + (1079).to_bytes(3, "little")), (1920, 1080)),
+    "g.svg": (b"<svg xmlns='http://www.w3.org/2000/svg'/>", None),
+}
+
+def test_read_dimensions():
+    """Test: dimensioni lette dalle intestazioni di PNG, GIF, JPEG e WebP"""
+    print("🧪 Test: Lettura delle dimensioni")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        for name, (data, expected) in SAMPLES.items():
+            path = os.path.join(temp_dir, name)
+            with open(path, "wb") as f:
+                f.write(data)
+            dimensions = image_metadata.read_dimensions(path)
+            assert (tuple(dimensions) if dimensions else None) == expected, name
+        
+        print("✅ Test read dimensions: SUCCESSO")
+    finally:
+        shutil.rmtree(temp_dir)
+
+def test_metadata_cache():
+    """Test: metadati calcolati una volta per hash e salvati su disco"""
+    print("🧪 Test: Cache dei metadati delle immagini")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(temp_dir, "a.png")
+        with open(path, "wb") as f:
+            f.write(png_header(1280, 720))
+        cache_file = os.path.join(temp_dir, "meta.json")
+        
+        cache = image_metadata.ImageMetadataCache(cache_file)
+        metadata = cache.get(path, "hash-a")
+        assert (metadata["width"], metadata["height"], metadata["size"]) == (1280, 720, 29)
+        cache.get(path, "hash-a")
+        assert cache.computed_count == 1
+        cache.save()
+        
+        # Stesso hash da un'altra posizione: nessun nuovo calcolo
+        reloaded = image_metadata.ImageMetadataCache(cache_file)
+        assert reloaded.get("/percorso/inesistente.png", "hash-a")["width"] == 1280
+        assert reloaded.computed_count == 0
+        
+        print("✅ Test metadata cache: SUCCESSO")
+    finally:
+        shutil.rmtree(temp_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per image_metadata.py")
+    print("-" * 50)
+    
+    try:
+        test_read_dimensions()
+        test_metadata_cache()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare l'ottimizzazione delle PNG di image_optimizer.py
+"""
+
+import os
+import shutil
+import tempfile
+from unittest import SkipTest
+
+import image_optimizer
+from fileutils import file_digest
+
+def test_disabled_without_pillow():
+    """Test: senza Pillow (o con enabled=False) lo stage non fa nulla"""
+    print("🧪 Test: Ottimizzazione disattivata")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        optimizer = image_optimizer.ImageOptimizer(os.path.join(temp_dir, "cache"), enabled=False)
+        assert optimizer.handles("immagine.png") == False
+        assert optimizer.run() == (0, 0, 0)
+        assert not os.path.exists(os.path.join(temp_dir, "cache"))
+        
+        print("✅ Test disabled without pillow: SUCCESSO")
+    finally:
+        shutil.rmtree(temp_dir)
+
+def test_optimize_and_cache():
+    """Test: PNG ridimensionata una sola volta e ritrovata in cache per hash"""
+    print("🧪 Test: Ottimizzazione e cache per hash")
+    
+    if image_optimizer.Image is None:
+        # Saltato in modo esplicito: pytest lo riporta come skip, non come successo
+        raise SkipTest("Pillow non installato")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        src = os.path.join(temp_dir, "Pasted image.png")
+        image_optimizer.Image.new("RGB", (3200, 400), (250, 250, 250)).save(src, format="PNG")
+        digest = file_digest(src)
+        cache_dir = os.path.join(temp_dir, "cache")
+        
+        optimizer = image_optimizer.ImageOptimizer(cache_dir, max_width=800)
+        assert optimizer.handles(src)
+        assert optimizer.lookup(digest) == (False, None)
+        optimizer.defer(src, digest, os.path.join(temp_dir, "b", "Pasted-image.png"))
+        optimizer.defer(src, digest, os.path.join(temp_dir, "a", "Pasted-image.png"))
+        
+        count, before, after = optimizer.run(workers=1)
+        assert count == 1 and after < before
+        known, optimized = optimizer.lookup(digest)
+        assert known and optimized is not None
+        with image_optimizer.Image.open(optimized) as img:
+            assert img.size == (800, 100)
+        # Copie rimandate ordinate per destinazione
+        assert [os.path.basename(os.path.dirname(item[0])) for item in optimizer.deferred()] == ["a", "b"]
+        
+        # Una nuova istanza ritrova il risultato senza rielaborare
+        reloaded = image_optimizer.ImageOptimizer(cache_dir, max_width=800)
+        assert reloaded.lookup(digest) == (True, optimized)
+        assert reloaded.run() == (0, 0, 0)
+        
+        print("✅ Test optimize and cache: SUCCESSO")
+    finally:
+        shutil.rmtree(temp_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per image_optimizer.py")
+    print("-" * 50)
+    
+    try:
+        test_disabled_without_pillow()
+        skipped = []
+        try:
+            test_optimize_and_cache()
+        except SkipTest as e:
+            print(f"⏭️  Test optimize and cache: SALTATO ({e})")
+            skipped.append("test_optimize_and_cache")
+        
+        print("-" * 50)
+        if skipped:
+            print(f"⚠️  Test passati, {len(skipped)} saltato/i: {', '.join(skipped)}")
+        else:
+            print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare l'elaborazione dei bundle di images.py
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import struct
+import tempfile
+
+import image_cache
+import image_metadata
+import images
+import sync_manifest
+from vault_catalog import VaultCatalog
+
+def make_site(test_dir, bundle_count=12):
+    """Crea allegati e bundle di prova; restituisce (allegati, cartelle dei post)."""
+    attachments = os.path.join(test_dir, "attachments")
+    it_dir = os.path.join(test_dir, "content", "it", "post")
+    en_dir = os.path.join(test_dir, "content", "en", "post")
+    os.makedirs(attachments)
+    for index in range(bundle_count):
+        with open(os.path.join(attachments, f"Cover {index}.png"), "wb") as f:
+            f.write(b"\x89PNG" + bytes([index]) * 100)
+        with open(os.path.join(attachments, f"Pasted image {index}.png"), "wb") as f:
+            f.write(b"\x89PNG" + bytes([index]) * 50)
+        bundle = os.path.join(it_dir if index % 3 else en_dir, f"Post {index}")
+        os.makedirs(bundle)
+        with open(os.path.join(bundle, "index.md"), "w", encoding="utf-8") as f:
+            f.write(f"---\ntitle: Post {index}\nimage: Cover {index}.png\n---\n"
+                    f"Testo\n![[Pasted image {index}.png]]\n![[Mancante.png]]\n")
+    os.makedirs(os.path.join(it_dir, "Senza index"))
+    return attachments, [it_dir, en_dir]
+
+def run_images(workers):
+    """Esegue process_multilingual_posts catturando l'output."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        processed = images.process_multilingual_posts(VaultCatalog(cache=None), workers=workers, optimize=False)
+    return processed, output.getvalue()
+
+def test_parallel_matches_serial():
+    """Test: con più thread output e conteggi sono identici alla modalità seriale"""
+    print("🧪 Test: Elaborazione parallela dei bundle")
+    
+    originals = (images.ATTACHMENTS_DIR, images.HUGO_POST_DIRS, image_cache.IMAGE_CACHE_FILE,
+                 sync_manifest.SYNC_MANIFEST_FILE, image_metadata.IMAGE_METADATA_FILE)
+    serial_dir = tempfile.mkdtemp()
+    parallel_dir = tempfile.mkdtemp()
+    try:
+        results = []
+        for test_dir, workers in ((serial_dir, 1), (parallel_dir, 4)):
+            images.ATTACHMENTS_DIR, images.HUGO_POST_DIRS = make_site(test_dir)
+            image_cache.IMAGE_CACHE_FILE = os.path.join(test_dir, ".imagecache.json")
+            sync_manifest.SYNC_MANIFEST_FILE = os.path.join(test_dir, ".syncmanifest.json")
+            image_metadata.IMAGE_METADATA_FILE = os.path.join(test_dir, ".imagemeta.json")
+            first = run_images(workers)
+            second = run_images(workers)
+            results.append((first, second))
+            # I percorsi temporanei differiscono tra le due esecuzioni
+            results[-1] = tuple((count, text.replace(test_dir, "<site>")) for count, text in results[-1])
+        
+        serial, parallel = results
+        assert serial == parallel
+        assert serial[0][0] == 12
+        assert "Images copied: 24 (1.9 KB), unchanged: 0" in serial[0][1]
+        # Seconda esecuzione: le immagini, già rinominate nel front matter e nei
+        # link markdown, vengono ritrovate tramite la cache e non ricopiate
+        assert "Images copied: 0 (0 B), unchanged: 24 (1.9 KB)" in serial[1][1]
+        assert "No index.md found" in serial[0][1]
+        # index.md riscritto solo alla prima esecuzione
+        assert "Bundles modified: 12 of 12" in serial[0][1]
+        assert "Bundles modified: 0 of 12" in serial[1][1]
+        
+        bundle = os.path.join(parallel_dir, "content", "it", "post", "Post 1")
+        assert os.path.exists(os.path.join(bundle, "Pasted-image-1.png"))
+        with open(os.path.join(bundle, "index.md"), encoding="utf-8") as f:
+            content = f.read()
+        assert "![Pasted-image-1.png](Pasted-image-1.png)" in content
+        # Solo la riga 'image' del front matter viene modificata
+        assert content.startswith("---\ntitle: Post 1\nimage: Cover-1.png\n---\n")
+        
+        print("✅ Test parallel matches serial: SUCCESSO")
+    finally:
+        (images.ATTACHMENTS_DIR, images.HUGO_POST_DIRS, image_cache.IMAGE_CACHE_FILE,
+         sync_manifest.SYNC_MANIFEST_FILE, image_metadata.IMAGE_METADATA_FILE) = originals
+        shutil.rmtree(serial_dir)
+        shutil.rmtree(parallel_dir)
+
+def test_unchanged_post_not_rewritten():
+    """Test: un index.md senza immagini da convertire non viene riscritto"""
+    print("🧪 Test: Nessuna riscrittura senza modifiche")
+    
+    test_dir = tempfile.mkdtemp()
+    try:
+        markdown_file = os.path.join(test_dir, "index.md")
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write("---\ntitle: Post\n---\nSolo testo\n")
+        os.utime(markdown_file, ns=(1_000_000_000, 1_000_000_000))
+        
+        attachments = images.AttachmentIndex(os.path.join(test_dir, "allegati"))
+        assert images.process_images_for_post(test_dir, markdown_file, attachments=attachments, log=lambda line: None) == False
+        assert os.stat(markdown_file).st_mtime_ns == 1_000_000_000
+        
+        print("✅ Test unchanged post not rewritten: SUCCESSO")
+    finally:
+        shutil.rmtree(test_dir)
+
+def test_image_metadata_hints():
+    """Test: dimensioni dalla cache negli embed markdown e nel front matter dell'immagine in evidenza"""
+    print("🧪 Test: Dimensioni delle immagini")
+    
+    test_dir = tempfile.mkdtemp()
+    try:
+        attachments_dir = os.path.join(test_dir, "allegati")
+        os.makedirs(attachments_dir)
+        header = b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">IIBBBBB", 1200, 800, 8, 2, 0, 0, 0)
+        with open(os.path.join(attachments_dir, "Pasted image.png"), "wb") as f:
+            f.write(header)
+        markdown_file = os.path.join(test_dir, "index.md")
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write("---\ntitle: Post\nimage: Pasted image.png\n---\n"
+                    "![[Pasted image.png]]\n![[Pasted image.png|400]]\n![[Mancante.png]]\n")
+        
+        metadata = image_metadata.ImageMetadataCache(os.path.join(test_dir, "meta.json"))
+        images.process_images_for_post(test_dir, markdown_file, attachments=images.AttachmentIndex(attachments_dir),
+                                       metadata=metadata, log=lambda line: None)
+        with open(markdown_file, encoding="utf-8") as f:
+            content = f.read()
+        # Sempre immagini markdown: l'hook render-image legge le dimensioni dal testo alternativo
+        assert content == ("---\ntitle: Post\nimage: Pasted-image.png\nimageWidth: 1200\nimageHeight: 800\n---\n"
+                           "![Pasted-image.png|1200x800](Pasted-image.png)\n"
+                           "![Pasted-image.png|400|1200x800](Pasted-image.png)\n"
+                           "![Mancante.png](Mancante.png)\n")
+        # Una sola lettura dell'intestazione per hash
+        assert metadata.computed_count == 1
+        
+        # Senza cache dei metadati gli embed restano senza dimensioni
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write("---\ntitle: Post\n---\n![[Pasted image.png]]\n")
+        images.process_images_for_post(test_dir, markdown_file, attachments=images.AttachmentIndex(attachments_dir),
+                                       log=lambda line: None)
+        with open(markdown_file, encoding="utf-8") as f:
+            assert f.read() == "---\ntitle: Post\n---\n![Pasted-image.png](Pasted-image.png)\n"
+        
+        print("✅ Test image metadata hints: SUCCESSO")
+    finally:
+        shutil.rmtree(test_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per images.py")
+    print("-" * 50)
+    
+    try:
+        test_parallel_matches_serial()
+        test_unchanged_post_not_rewritten()
+        test_image_metadata_hints()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare la preparazione del campione e le regole di
+fallback di language_detect.py
+"""
+
+import sys
+import types
+
+import language_detect
+from language_detect import build_sample, detect_language, detect_sample, detect_samples
+
+class StubDetector:
+    """langdetect finto: restituisce la lingua indicata o solleva l'errore indicato."""
+    
+    def __init__(self, results):
+        self.results = results
+        self.module = types.ModuleType("langdetect")
+        self.module.DetectorFactory = types.SimpleNamespace(seed=None)
+        self.module.detect_langs = self.detect_langs
+    
+    def detect_langs(self, sample):
+        result = self.results[sample.split()[0]]
+        if isinstance(result, Exception):
+            raise result
+        lang, prob = result
+        return [types.SimpleNamespace(lang=lang, prob=prob)]
+    
+    def __enter__(self):
+        self.original = sys.modules.get("langdetect")
+        sys.modules["langdetect"] = self.module
+        return self
+    
+    def __exit__(self, *exc):
+        if self.original is None:
+            del sys.modules["langdetect"]
+        else:
+            sys.modules["langdetect"] = self.original
+
+def test_build_sample():
+    """Test pulizia del markdown e limite sulla lunghezza del campione"""
+    print("🧪 Test: Costruzione del campione")
+    
+    content = """---
+title: Post
+---
+Testo introduttivo con `codice inline` e un [link](https://example.com).
+
+```python
+print("codice da ignorare")
+```
+
+![immagine](immagine.png) ![[Pasted image 1.png]]
+Fine del testo.
+"""
+    sample = build_sample(content)
+    assert sample == "Testo introduttivo con e un . Fine del testo."
+    
+    # Campione limitato e blocco di codice troncato dalla finestra scartato
+    long_content = "parola " * 5000
+    assert len(build_sample(long_content)) == language_detect.SAMPLE_CHARS
+    truncated = "Testo prima del codice.\n```\n" + "x = 1\n" * 5000
+    assert build_sample(truncated) == "Testo prima del codice."
+    
+    print("✅ Test build sample: SUCCESSO")
+
+def test_declared_and_fallback_languages():
+    """Test lingua dal front matter e fallback alla lingua di default"""
+    print("🧪 Test: Lingua dichiarata e fallback")
+    
+    assert detect_language("Body", {"lang": "EN"}) == ("en", 1.0)
+    assert detect_language("Body", {"language": "it"}) == ("it", 1.0)
+    
+    # Testo troppo breve: lingua di default senza confidenza
+    assert detect_language("---\ntitle: x\n---\nCiao", {}) == ("it", 0.0)
+    assert detect_language("Hi", {}, default="en") == ("en", 0.0)
+    
+    print("✅ Test declared and fallback: SUCCESSO")
+
+def test_detect_samples():
+    """Test rilevamento sui campioni con un detector finto: confidenza bassa ed errori"""
+    print("🧪 Test: Rilevamento dei campioni")
+    
+    padding = " testo" * language_detect.MIN_SAMPLE_CHARS
+    stub = StubDetector({
+        "sicuro": ("en", 0.99),
+        "incerto": ("en", language_detect.MIN_CONFIDENCE - 0.1),
+        "errore": ValueError("No features in text."),
+    })
+    with stub:
+        assert detect_sample("sicuro" + padding) == ("en", 0.99)
+        assert stub.module.DetectorFactory.seed == language_detect.DETECTOR_SEED
+        # Confidenza insufficiente: lingua di default con la confidenza rilevata
+        assert detect_sample("incerto" + padding) == ("it", language_detect.MIN_CONFIDENCE - 0.1)
+        assert detect_sample("incerto" + padding, default="en") == ("en", language_detect.MIN_CONFIDENCE - 0.1)
+        # Errore del detector: lingua di default senza confidenza
+        assert detect_sample("errore" + padding) == ("it", 0.0)
+        
+        results = detect_samples({
+            "a.md": "sicuro" + padding,
+            "b.md": "incerto" + padding,
+            "c.md": "errore" + padding,
+            "d.md": "Corto",
+        }, workers=1, default="en")
+        assert results == {"a.md": ("en", 0.99), "b.md": ("en", language_detect.MIN_CONFIDENCE - 0.1),
+                           "c.md": ("en", 0.0), "d.md": ("en", 0.0)}
+    
+    print("✅ Test detect samples: SUCCESSO")
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per language_detect.py")
+    print("-" * 50)
+    
+    try:
+        test_build_sample()
+        test_declared_and_fallback_languages()
+        test_detect_samples()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare la cache persistente di metadata_cache.py
+"""
+
+import datetime
+import os
+import shutil
+import tempfile
+
+from fileutils import file_digest
+from metadata_cache import MetadataCache
+from vault_catalog import VaultCatalog
+
+def test_cache_invalidation():
+    """Test validità, invalidazione e rivalidazione per hash delle voci"""
+    print("🧪 Test: Invalidazione della cache")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        post = os.path.join(temp_dir, "Post.md")
+        with open(post, "w", encoding="utf-8") as f:
+            f.write("---\ntitle: Post\ndate: 2025-08-25\n---\nCiao")
+        
+        cache = MetadataCache(os.path.join(temp_dir, "cache.sqlite"))
+        front_matter = {"title": "Post", "date": datetime.date(2025, 8, 25)}
+        digest = file_digest(post)
+        cache.put(post, os.stat(post), front_matter, digest, "it", 0.99)
+        cache.close()
+        
+        # La cache sopravvive tra un'esecuzione e l'altra
+        cache = MetadataCache(os.path.join(temp_dir, "cache.sqlite"))
+        entry = cache.get(post, os.stat(post))
+        assert entry["front_matter"] == front_matter
+        assert (entry["language"], entry["confidence"]) == ("it", 0.99)
+        
+        # Solo mtime cambiato: invalida, ma l'hash identico rivalida la voce
+        os.utime(post, ns=(0, 0))
+        assert cache.get(post, os.stat(post)) is None
+        assert cache.get(post, os.stat(post), digest) is not None
+        assert cache.get(post, os.stat(post)) is not None
+        
+        # Contenuto cambiato: la voce non è più valida
+        with open(post, "a", encoding="utf-8") as f:
+            f.write(" mondo")
+        assert cache.get(post, os.stat(post), file_digest(post)) is None
+        cache.close()
+        
+        print("✅ Test cache invalidation: SUCCESSO")
+    finally:
+        shutil.rmtree(temp_dir)
+
+def test_warm_catalog_skips_parsing():
+    """Test: un catalogo con cache calda non rianalizza le note"""
+    print("🧪 Test: Catalogo con cache calda")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        vault_dir = os.path.join(temp_dir, "vault")
+        os.makedirs(vault_dir)
+        for name, draft in (("Uno", "false"), ("Due", "true")):
+            with open(os.path.join(vault_dir, f"{name}.md"), "w", encoding="utf-8") as f:
+                f.write(f"---\ntitle: {name}\ndraft: {draft}\n---\nTesto")
+        cache_path = os.path.join(temp_dir, "cache.sqlite")
+        
+        cold = VaultCatalog(vault_dir, cache=MetadataCache(cache_path))
+        assert [record.bundle_name for record in cold.vault_drafts()] == ["Due"]
+        assert cold.parsed_count == 2
+        cold.cache.close()
+        
+        warm = VaultCatalog(vault_dir, cache=MetadataCache(cache_path))
+        assert [record.bundle_name for record in warm.vault_drafts()] == ["Due"]
+        assert warm.parsed_count == 0
+        warm.cache.close()
+        
+        print("✅ Test warm catalog: SUCCESSO")
+    finally:
+        shutil.rmtree(temp_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per metadata_cache.py")
+    print("-" * 50)
+    
+    try:
+        test_cache_invalidation()
+        test_warm_catalog_skips_parsing()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
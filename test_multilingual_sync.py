@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare la sincronizzazione diretta di multilingual_sync.py
+"""
+
+import os
+import shutil
+import tempfile
+
+import metadata_cache
+import multilingual_sync
+import sync_manifest
+from vault_catalog import VaultCatalog
+
+def write_note(path, front_matter, body="Contenuto del post.\n"):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"---\n{front_matter}\n---\n{body}")
+
+def test_direct_sync():
+    """Test: le note vengono scritte direttamente in content/<lingua>/post/<bundle>/index.md"""
+    print("🧪 Test: Sincronizzazione diretta nei bundle multilingua")
+    
+    test_dir = tempfile.mkdtemp()
+    originals = (multilingual_sync.OBSIDIAN_POST_DIR, multilingual_sync.HUGO_IT_POST_DIR,
+                 multilingual_sync.HUGO_EN_POST_DIR, multilingual_sync.EXCLUDE_FILE,
+                 sync_manifest.SYNC_MANIFEST_FILE, metadata_cache._shared_cache)
+    
+    try:
+        obsidian_dir = os.path.join(test_dir, "obsidian")
+        content_dir = os.path.join(test_dir, "content")
+        os.makedirs(obsidian_dir)
+        multilingual_sync.OBSIDIAN_POST_DIR = obsidian_dir
+        multilingual_sync.HUGO_IT_POST_DIR = os.path.join(content_dir, "it", "post")
+        multilingual_sync.HUGO_EN_POST_DIR = os.path.join(content_dir, "en", "post")
+        multilingual_sync.EXCLUDE_FILE = os.path.join(test_dir, ".rsyncexclude")
+        sync_manifest.SYNC_MANIFEST_FILE = os.path.join(test_dir, ".syncmanifest.json")
+        metadata_cache._shared_cache = metadata_cache.MetadataCache(os.path.join(test_dir, "cache.sqlite"))
+        
+        write_note(os.path.join(obsidian_dir, "Post Italiano.md"), "title: Ciao\nlang: it\ndraft: false")
+        write_note(os.path.join(obsidian_dir, "English Post.md"), "title: Hello\nlang: en")
+        write_note(os.path.join(obsidian_dir, "Bozza.md"), "title: Bozza\nlang: it\ndraft: true")
+        
+        assert multilingual_sync.sync_posts(catalog=VaultCatalog(obsidian_dir=obsidian_dir))
+        
+        it_index = os.path.join(content_dir, "it", "post", "Post Italiano", "index.md")
+        en_index = os.path.join(content_dir, "en", "post", "English Post", "index.md")
+        assert os.path.exists(it_index)
+        assert os.path.exists(en_index)
+        assert not os.path.exists(os.path.join(content_dir, "it", "post", "Bozza"))
+        assert not os.path.exists(os.path.join(content_dir, "posts"))
+        
+        # Stesso contenuto e stesso mtime della nota, come con copy2
+        source = os.path.join(obsidian_dir, "English Post.md")
+        with open(source, "rb") as f, open(en_index, "rb") as g:
+            assert f.read() == g.read()
+        assert os.stat(source).st_mtime_ns == os.stat(en_index).st_mtime_ns
+        
+        # Bundle riscritto da images.py e nota solo toccata: il bundle non viene ricopiato
+        with open(it_index, "a", encoding="utf-8") as f:
+            f.write("![foto.png|1200x800](foto.png)\n")
+        manifest = sync_manifest.load_manifest()
+        sync_manifest.refresh_targets(manifest, [it_index])
+        sync_manifest.save_manifest(manifest)
+        with open(it_index, "rb") as f:
+            rewritten = f.read()
+        os.utime(os.path.join(obsidian_dir, "Post Italiano.md"))
+        os.utime(it_index, ns=(0, 0))
+        assert multilingual_sync.sync_posts(catalog=VaultCatalog(obsidian_dir=obsidian_dir))
+        with open(it_index, "rb") as f:
+            assert f.read() == rewritten
+        entry = sync_manifest.load_manifest()["posts"]["Post Italiano.md"]
+        assert sync_manifest.target_unchanged(entry)
+        
+        # La nota tornata in draft viene rimossa dal bundle pubblicato
+        write_note(source, "title: Hello\nlang: en\ndraft: true")
+        assert multilingual_sync.sync_posts(catalog=VaultCatalog(obsidian_dir=obsidian_dir))
+        assert not os.path.exists(os.path.dirname(en_index))
+        assert os.path.exists(it_index)
+        
+        print("✅ Test direct sync: SUCCESSO")
+        
+    finally:
+        if metadata_cache._shared_cache is not originals[5]:
+            metadata_cache._shared_cache.close()
+        (multilingual_sync.OBSIDIAN_POST_DIR, multilingual_sync.HUGO_IT_POST_DIR,
+         multilingual_sync.HUGO_EN_POST_DIR, multilingual_sync.EXCLUDE_FILE,
+         sync_manifest.SYNC_MANIFEST_FILE, metadata_cache._shared_cache) = originals
+        shutil.rmtree(test_dir)
+
+def test_full_sync():
+    """Test: --full ricopia tutte le note e rimuove comunque i bundle delle note eliminate"""
+    print("🧪 Test: Sincronizzazione completa")
+    
+    test_dir = tempfile.mkdtemp()
+    originals = (multilingual_sync.OBSIDIAN_POST_DIR, multilingual_sync.HUGO_IT_POST_DIR,
+                 multilingual_sync.HUGO_EN_POST_DIR, multilingual_sync.EXCLUDE_FILE,
+                 sync_manifest.SYNC_MANIFEST_FILE, metadata_cache._shared_cache)
+    
+    try:
+        obsidian_dir = os.path.join(test_dir, "obsidian")
+        content_dir = os.path.join(test_dir, "content")
+        os.makedirs(obsidian_dir)
+        multilingual_sync.OBSIDIAN_POST_DIR = obsidian_dir
+        multilingual_sync.HUGO_IT_POST_DIR = os.path.join(content_dir, "it", "post")
+        multilingual_sync.HUGO_EN_POST_DIR = os.path.join(content_dir, "en", "post")
+        multilingual_sync.EXCLUDE_FILE = os.path.join(test_dir, ".rsyncexclude")
+        sync_manifest.SYNC_MANIFEST_FILE = os.path.join(test_dir, ".syncmanifest.json")
+        metadata_cache._shared_cache = metadata_cache.MetadataCache(os.path.join(test_dir, "cache.sqlite"))
+        
+        write_note(os.path.join(obsidian_dir, "Primo.md"), "title: Primo\nlang: it")
+        write_note(os.path.join(obsidian_dir, "Second.md"), "title: Second\nlang: en")
+        write_note(os.path.join(obsidian_dir, "Terzo.md"), "title: Terzo\nlang: it")
+        # Senza lingua dichiarata: rilevamento dal campione, poi scrittura
+        write_note(os.path.join(obsidian_dir, "Quarto.md"), "title: Quarto")
+        assert multilingual_sync.sync_posts(catalog=VaultCatalog(obsidian_dir=obsidian_dir))
+        assert os.path.exists(os.path.join(content_dir, "it", "post", "Quarto", "index.md"))
+        
+        primo_index = os.path.join(content_dir, "it", "post", "Primo", "index.md")
+        os.utime(primo_index, ns=(1_000_000_000, 1_000_000_000))
+        # Nota eliminata e nota tornata in draft prima di una sincronizzazione completa
+        os.remove(os.path.join(obsidian_dir, "Second.md"))
+        write_note(os.path.join(obsidian_dir, "Terzo.md"), "title: Terzo\nlang: it\ndraft: true")
+        
+        assert multilingual_sync.sync_posts(force=True, catalog=VaultCatalog(obsidian_dir=obsidian_dir))
+        assert not os.path.exists(os.path.join(content_dir, "en", "post", "Second"))
+        assert not os.path.exists(os.path.join(content_dir, "it", "post", "Terzo"))
+        # Anche la nota invariata viene ricopiata
+        assert os.stat(primo_index).st_mtime_ns == os.stat(os.path.join(obsidian_dir, "Primo.md")).st_mtime_ns
+        assert sorted(sync_manifest.load_manifest()["posts"]) == ["Primo.md", "Quarto.md"]
+        
+        print("✅ Test full sync: SUCCESSO")
+        
+    finally:
+        if metadata_cache._shared_cache is not originals[5]:
+            metadata_cache._shared_cache.close()
+        (multilingual_sync.OBSIDIAN_POST_DIR, multilingual_sync.HUGO_IT_POST_DIR,
+         multilingual_sync.HUGO_EN_POST_DIR, multilingual_sync.EXCLUDE_FILE,
+         sync_manifest.SYNC_MANIFEST_FILE, metadata_cache._shared_cache) = originals
+        shutil.rmtree(test_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per multilingual_sync.py")
+    print("-" * 50)
+    
+    try:
+        test_direct_sync()
+        test_full_sync()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
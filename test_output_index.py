@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare l'indice inverso bundle -> output di output_index.py
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import output_index
+import remove_posts
+import search_index
+
+CONFIG = """baseurl: https://example.org/
+DefaultContentLanguage: it
+languages:
+    it:
+        contentDir: content/it
+    en:
+        contentDir: content/en
+"""
+
+FEED = """<rss><channel>
+    <item>
+      <title>Primo</title>
+      <link>https://example.org/post/primo/</link>
+    </item>
+    <item>
+      <title>Secondo</title>
+      <link>https://example.org/post/secondo/</link>
+    </item>
+</channel></rss>
+"""
+
+def write(root, rel, text="x"):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def make_site(root):
+    """Due post italiani e uno inglese con lo stesso nome del primo."""
+    write(root, "hugo.yaml", CONFIG)
+    write(root, "content/it/post/Primo/index.md", "---\ntitle: Primo\ntags: [Python]\n---\n")
+    write(root, "content/it/post/Primo/foto.png")
+    write(root, "content/it/post/Secondo/index.md", "---\ntitle: Secondo\n---\n")
+    write(root, "content/en/post/Primo/index.md", "---\ntitle: First\n---\n")
+
+    write(root, "public/index.xml", FEED)
+    write(root, "public/post/index.xml", FEED)
+    write(root, "public/tags/python/index.xml", FEED.replace("secondo", "altro"))
+    write(root, "public/page/search/index.json", json.dumps([
+        {"title": "Primo", "permalink": "https://example.org/post/primo/"},
+        {"title": "Secondo", "permalink": "https://example.org/post/secondo/"},
+    ]))
+    write(root, "public/post/primo/index.html")
+    write(root, "public/post/primo/foto.png")
+    write(root, "public/post/primo/foto_hu_aaa.png")
+    write(root, "public/post/secondo/index.html")
+    write(root, "public/en/post/primo/index.html")
+    write(root, "resources/_gen/images/post/primo/foto_hu_aaa.png")
+
+def test_build_index():
+    """Test: ogni bundle viene associato a HTML, immagini, feed e indici di ricerca"""
+    print("🧪 Test: Costruzione dell'indice inverso")
+    
+    test_dir = tempfile.mkdtemp()
+    try:
+        make_site(test_dir)
+        index = output_index.build_output_index(test_dir)
+        
+        assert sorted(index["bundles"]) == ["content/en/post/Primo", "content/it/post/Primo", "content/it/post/Secondo"]
+        entry = index["bundles"]["content/it/post/Primo"]
+        assert entry["language"] == "it"
+        assert entry["pages"] == ["post/primo"]
+        assert entry["html"] == ["public/post/primo/index.html"]
+        assert entry["images"] == ["public/post/primo/foto.png", "public/post/primo/foto_hu_aaa.png"]
+        assert entry["generated"] == ["resources/_gen/images/post/primo/foto_hu_aaa.png"]
+        assert entry["feeds"] == ["public/index.xml", "public/post/index.xml", "public/tags/python/index.xml"]
+        assert entry["search"] == ["public/page/search/index.json"]
+        
+        assert output_index.find_bundles(index, "Primo") == ["content/en/post/Primo", "content/it/post/Primo"]
+        assert output_index.find_bundles(index, "Primo", "it") == ["content/it/post/Primo"]
+        
+        print("✅ Test build index: SUCCESSO")
+    finally:
+        shutil.rmtree(test_dir)
+
+def test_invalidate_bundle():
+    """Test: la rimozione di un post invalida solo i suoi output"""
+    print("🧪 Test: Invalidazione mirata degli output")
+    
+    test_dir = tempfile.mkdtemp()
+    originals = (output_index.HUGO_DIR, search_index.SEARCH_INDEX_CACHE_FILE)
+    try:
+        make_site(test_dir)
+        output_index.HUGO_DIR = test_dir
+        search_index.SEARCH_INDEX_CACHE_FILE = os.path.join(test_dir, ".searchindex.json")
+        search_index.build_search_index(test_dir)
+        # Copie compresse (precompress.py) di una pagina e di un feed
+        write(test_dir, "public/post/primo/index.html.gz")
+        write(test_dir, "public/post/index.xml.gz")
+        index = output_index.build_output_index(test_dir)
+        
+        assert remove_posts.remove_generated_outputs("Primo", index, "it") == True
+        assert "content/it/post/Primo" not in index["bundles"]
+        assert "content/en/post/Primo" in index["bundles"]
+        assert not os.path.exists(os.path.join(test_dir, "public", "post", "primo"))
+        assert not os.path.exists(os.path.join(test_dir, "resources", "_gen", "images", "post", "primo"))
+        assert os.path.exists(os.path.join(test_dir, "public", "en", "post", "primo", "index.html"))
+        assert os.path.exists(os.path.join(test_dir, "public", "post", "secondo", "index.html"))
+        
+        with open(os.path.join(test_dir, "public", "post", "index.xml"), encoding="utf-8") as f:
+            feed = f.read()
+        assert "post/primo/" not in feed and "<title>Secondo</title>" in feed
+        with open(os.path.join(test_dir, "public", "page", "search", "index.json"), encoding="utf-8") as f:
+            assert [item["title"] for item in json.load(f)] == ["Secondo"]
+        
+        # Post tolto dagli shard di search_index.py e dalla sua cache
+        search_dir = os.path.join(test_dir, "public", search_index.SEARCH_INDEX_DIR)
+        manifest = search_index.load_manifest(search_dir)
+        assert [document["url"] for document in manifest["docs"]] == ["/post/secondo/"]
+        for key in manifest["shards"]:
+            with open(os.path.join(search_dir, f"{key}.json"), encoding="utf-8") as f:
+                assert "primo" not in json.load(f)
+        assert "/post/primo/" not in search_index.load_segments()
+        assert "/en/post/primo/" in search_index.load_segments()
+        # Stesso risultato di una ricostruzione senza il post
+        shutil.rmtree(os.path.join(test_dir, "content", "it", "post", "Primo"))
+        rebuilt = os.path.join(test_dir, "rebuilt")
+        shutil.copytree(search_dir, rebuilt)
+        search_index.build_search_index(test_dir, full=True, cache_file=os.path.join(test_dir, "full.json"))
+        assert sorted(os.listdir(rebuilt)) == sorted(os.listdir(search_dir))
+        for name in os.listdir(search_dir):
+            with open(os.path.join(rebuilt, name), encoding="utf-8") as f, \
+                    open(os.path.join(search_dir, name), encoding="utf-8") as g:
+                assert json.load(f) == json.load(g)
+        
+        # Nessuna copia compressa obsoleta dei file rimossi o riscritti
+        assert not os.path.exists(os.path.join(test_dir, "public", "post", "index.xml.gz"))
+        
+        # Post sconosciuto all'indice
+        assert remove_posts.remove_generated_outputs("Terzo", index) == False
+        
+        print("✅ Test invalidate bundle: SUCCESSO")
+    finally:
+        output_index.HUGO_DIR, search_index.SEARCH_INDEX_CACHE_FILE = originals
+        shutil.rmtree(test_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per output_index.py")
+    print("-" * 50)
+    
+    try:
+        test_build_index()
+        test_invalidate_bundle()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
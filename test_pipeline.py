@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare l'esecuzione degli step di pipeline.py
+"""
+
+import os
+import shutil
+import tempfile
+
+import build_fingerprint
+import delta_manifest
+import pipeline
+
+def test_fail_fast():
+    """Test: gli step vengono eseguiti in ordine e la pipeline si ferma al primo errore"""
+    print("🧪 Test: Interruzione al primo errore")
+    
+    executed = []
+    
+    def make_step(number, success):
+        def step(context):
+            executed.append(number)
+            assert context["catalog"] == "catalogo"
+            return success
+        return step
+    
+    original_steps = pipeline.STEPS
+    try:
+        pipeline.STEPS = [
+            (1, "Primo", make_step(1, True), "errore 1", "ok 1"),
+            (2, "Secondo", make_step(2, False), "errore 2", "ok 2"),
+            (3, "Terzo", make_step(3, True), "errore 3", "ok 3"),
+        ]
+        success, timings = pipeline.run_pipeline(catalog="catalogo")
+        assert success == False
+        assert executed == [1, 2]
+        assert list(timings) == [1, 2]
+        
+        # Con 'until' gli step successivi non vengono eseguiti
+        executed.clear()
+        success, timings = pipeline.run_pipeline(until=1, catalog="catalogo")
+        assert success == True
+        assert executed == [1]
+        
+        print("✅ Test fail fast: SUCCESSO")
+    finally:
+        pipeline.STEPS = original_steps
+
+def test_direct_mode():
+    """Test: in modalità diretta lo step 2 viene sostituito e gli step 3, 4 e 7 saltati"""
+    print("🧪 Test: Modalità diretta")
+    
+    executed = []
+    
+    def make_step(name):
+        def step(context):
+            executed.append(name)
+            return True
+        return step
+    
+    original_steps = pipeline.STEPS
+    original_direct = pipeline.DIRECT_STEPS
+    try:
+        pipeline.STEPS = [(number, f"Step {number}", make_step(number), "errore", "ok") for number in range(1, 9)]
+        pipeline.DIRECT_STEPS = {2: ("Diretto", make_step("diretto"), "errore", "ok")}
+        success, timings = pipeline.run_pipeline(catalog="catalogo", direct=True)
+        assert success == True
+        assert executed == [1, "diretto", 5, 6, 8]
+        assert list(timings) == [1, 2, 5, 6, 8]
+        
+        # Senza --direct vengono eseguiti tutti gli step originali
+        executed.clear()
+        pipeline.run_pipeline(catalog="catalogo")
+        assert executed == list(range(1, 9))
+        
+        print("✅ Test direct mode: SUCCESSO")
+    finally:
+        pipeline.STEPS = original_steps
+        pipeline.DIRECT_STEPS = original_direct
+
+def test_step_numbering():
+    """Test: la numerazione degli step corrisponde a updateblog.sh"""
+    print("🧪 Test: Numerazione degli step")
+    
+    assert [step[0] for step in pipeline.STEPS] == list(range(1, 12))
+    
+    print("✅ Test step numbering: SUCCESSO")
+
+def test_build_skipped():
+    """Test: senza input cambiati non vengono eseguiti né Hugo né il commit"""
+    print("🧪 Test: Generazione saltata a input invariati")
+    
+    commands = []
+    staged = []
+    saved = []
+    original_run_command = pipeline.run_command
+    original_check_build = build_fingerprint.check_build
+    original_save_state = build_fingerprint.save_state
+    original_stage_delta = delta_manifest.stage_delta
+    original_save_delta_state = delta_manifest.save_state
+    try:
+        pipeline.run_command = lambda args: commands.append(args[:2]) or True
+        build_fingerprint.check_build = lambda hugo_dir=None: (False, "inputs unchanged", {"fingerprint": "abc"})
+        build_fingerprint.save_state = lambda state, path=None: saved.append(state)
+        delta_manifest.stage_delta = lambda delta, hugo_dir=None: staged.append(delta_manifest.delta_paths(delta)) or True
+        delta_manifest.save_state = lambda state, path=None: saved.append(state)
+        
+        context = {}
+        assert pipeline.step_hugo(context) == True
+        assert pipeline.step_commit(context) == True
+        assert commands == [] and staged == [] and saved == []
+        
+        # Dopo una generazione vengono aggiunti solo i file del delta;
+        # impronta e hash vengono salvati solo se il commit riesce
+        delta = {"added": ["public/nuovo.html"], "modified": ["content/it/post/a/index.md"], "deleted": []}
+        context = {"build_state": {"fingerprint": "def"}, "delta": delta, "delta_state": {"files": {}}}
+        assert pipeline.step_commit(context) == True
+        assert staged == [["content/it/post/a/index.md", "public/nuovo.html"]]
+        assert commands == [["git", "commit"]]
+        assert saved == [{"fingerprint": "def"}, {"files": {}}]
+        
+        pipeline.run_command = lambda args: args[1] != "commit"
+        assert pipeline.step_commit(context) == False
+        assert len(saved) == 2
+        
+        # Nessun file cambiato: niente commit, ma la pubblicazione viene registrata
+        context["delta"] = {"added": [], "modified": [], "deleted": []}
+        assert pipeline.step_commit(context) == True
+        assert len(staged) == 2 and len(saved) == 4
+        
+        print("✅ Test build skipped: SUCCESSO")
+    finally:
+        pipeline.run_command = original_run_command
+        build_fingerprint.check_build = original_check_build
+        build_fingerprint.save_state = original_save_state
+        delta_manifest.stage_delta = original_stage_delta
+        delta_manifest.save_state = original_save_delta_state
+
+def test_compare_shell_restores_state():
+    """Test: il confronto con updateblog.sh lascia contenuti e cache come li ha trovati"""
+    print("🧪 Test: Stato ripristinato dopo il confronto shell")
+    
+    test_dir = tempfile.mkdtemp()
+    original_hugo_dir = pipeline.HUGO_DIR
+    original_paths = pipeline.shell_comparison_paths
+    original_time_shell_stages = pipeline.time_shell_stages
+    try:
+        manifest = os.path.join(test_dir, ".syncmanifest.json")
+        bundle = os.path.join(test_dir, "content", "it", "post", "Primo", "index.md")
+        os.makedirs(os.path.dirname(bundle))
+        for path, text in ((manifest, "{}"), (bundle, "primo")):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        os.utime(bundle, ns=(1_000_000_000, 1_000_000_000))
+        pipeline.HUGO_DIR = test_dir
+        pipeline.shell_comparison_paths = lambda: [os.path.join(test_dir, "content"), manifest,
+                                                   os.path.join(test_dir, ".imagecache.json")]
+        
+        def fake_shell_stages(until):
+            # Gli step shell aggiornano manifest, bundle e cache
+            with open(manifest, "w", encoding="utf-8") as f:
+                f.write('{"files": 1}')
+            with open(bundle, "w", encoding="utf-8") as f:
+                f.write("modificato")
+            os.makedirs(os.path.join(test_dir, "content", "en", "post", "Nuovo"))
+            with open(os.path.join(test_dir, ".imagecache.json"), "w", encoding="utf-8") as f:
+                f.write("{}")
+            return 1.5
+        pipeline.time_shell_stages = fake_shell_stages
+        
+        assert pipeline.compare_shell_stages(7) == 1.5
+        with open(manifest, encoding="utf-8") as f:
+            assert f.read() == "{}"
+        with open(bundle, encoding="utf-8") as f:
+            assert f.read() == "primo"
+        assert os.stat(bundle).st_mtime_ns == 1_000_000_000
+        assert not os.path.exists(os.path.join(test_dir, "content", "en"))
+        assert not os.path.exists(os.path.join(test_dir, ".imagecache.json"))
+        
+        print("✅ Test compare shell restores state: SUCCESSO")
+    finally:
+        pipeline.HUGO_DIR = original_hugo_dir
+        pipeline.shell_comparison_paths = original_paths
+        pipeline.time_shell_stages = original_time_shell_stages
+        shutil.rmtree(test_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per pipeline.py")
+    print("-" * 50)
+    
+    try:
+        test_fail_fast()
+        test_direct_mode()
+        test_step_numbering()
+        test_build_skipped()
+        test_compare_shell_restores_state()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare la precompressione di public/ di precompress.py
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+
+import precompress
+
+PAGE = "<html><body>" + "<p>Testo del post</p>" * 100 + "</body></html>"
+
+def write(root, rel, data):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+def test_precompress_public():
+    """Test: copie .gz solo per i file di testo cambiati, rimozione di quelle orfane"""
+    print("🧪 Test: Precompressione incrementale")
+
+    test_dir = tempfile.mkdtemp()
+    public_dir = os.path.join(test_dir, "public")
+    cache_file = os.path.join(test_dir, ".precompress.json")
+    try:
+        write(public_dir, "index.html", PAGE.encode())
+        write(public_dir, "post/primo/index.html", PAGE.replace("post", "primo").encode())
+        write(public_dir, "index.xml", b"<rss>" + b"<item>feed</item>" * 50 + b"</rss>")
+        write(public_dir, "small.json", b"{}")
+        write(public_dir, "foto.png", b"\x89PNG" * 200)
+        # Contenuto che non si comprime: nessuna copia
+        write(public_dir, "random.js", os.urandom(2048))
+        # Copia orfana di una build precedente e file .gz non generato dallo stage
+        write(public_dir, "vecchio.html.gz", b"old")
+        write(public_dir, "archivio.tar.gz", b"tar")
+
+        report, compressed = precompress.precompress_public(test_dir, workers=1, cache_file=cache_file)
+        assert compressed == 4
+        assert sorted(report) == [".html", ".js", ".xml"]
+        assert report[".html"][0] == 2
+        assert report[".html"][2] < report[".html"][1] / 10
+        assert report[".js"][2] == report[".js"][1]
+
+        with open(os.path.join(public_dir, "index.html.gz"), "rb") as f:
+            assert gzip.decompress(f.read()) == PAGE.encode()
+        assert os.path.exists(os.path.join(public_dir, "index.xml.gz"))
+        for name in ("small.json.gz", "foto.png.gz", "random.js.gz", "vecchio.html.gz"):
+            assert not os.path.exists(os.path.join(public_dir, name))
+        assert os.path.exists(os.path.join(public_dir, "archivio.tar.gz"))
+
+        # Hugo riscrive i file con lo stesso contenuto: nessuna ricompressione
+        write(public_dir, "index.html", PAGE.encode())
+        os.utime(os.path.join(public_dir, "index.html"), (1, 1))
+        _, compressed = precompress.precompress_public(test_dir, workers=1, cache_file=cache_file)
+        assert compressed == 0
+
+        # Contenuto cambiato, copia cancellata e file rimosso
+        write(public_dir, "index.html", (PAGE + "<!-- nuovo -->").encode())
+        os.remove(os.path.join(public_dir, "index.xml.gz"))
+        os.remove(os.path.join(public_dir, "post", "primo", "index.html"))
+        report, compressed = precompress.precompress_public(test_dir, workers=1, cache_file=cache_file)
+        assert compressed == 2
+        assert report[".html"][0] == 1
+        assert not os.path.exists(os.path.join(public_dir, "post", "primo", "index.html.gz"))
+        with open(os.path.join(public_dir, "index.html.gz"), "rb") as f:
+            assert gzip.decompress(f.read()).endswith(b"<!-- nuovo -->")
+
+        print("✅ Test precompress public: SUCCESSO")
+    finally:
+        shutil.rmtree(test_dir)
+
+def test_refresh_compressed():
+    """Test: le copie di un file riscritto fuori dalla generazione vengono ricompresse o rimosse"""
+    print("🧪 Test: Riallineamento delle copie compresse")
+
+    test_dir = tempfile.mkdtemp()
+    try:
+        page = os.path.join(test_dir, "index.html")
+        write(test_dir, "index.html", PAGE.encode())
+        # Nessuna copia presente: il file non viene compresso qui
+        assert precompress.refresh_compressed(page) == 0
+        assert not os.path.exists(page + ".gz")
+
+        precompress.compress_file(page, ["gzip"])
+        write(test_dir, "index.html", (PAGE + "<!-- nuovo -->").encode())
+        assert precompress.refresh_compressed(page) == 1
+        with open(page + ".gz", "rb") as f:
+            assert gzip.decompress(f.read()).endswith(b"<!-- nuovo -->")
+
+        # File rimosso o diventato troppo piccolo: copie cancellate
+        write(test_dir, "index.html", b"{}")
+        assert precompress.refresh_compressed(page) == 1
+        assert not os.path.exists(page + ".gz")
+        write(test_dir, "index.html.gz", b"old")
+        os.remove(page)
+        assert precompress.refresh_compressed(page) == 1
+        assert not os.path.exists(page + ".gz")
+
+        print("✅ Test refresh compressed: SUCCESSO")
+    finally:
+        shutil.rmtree(test_dir)
+
+def test_deterministic_output():
+    """Test: la stessa pagina produce sempre lo stesso .gz (nessun mtime nell'intestazione)"""
+    print("🧪 Test: Output deterministico")
+
+    assert precompress.compress(PAGE.encode(), "gzip") == precompress.compress(PAGE.encode(), "gzip")
+    assert precompress.is_compressible("index.HTML")
+    assert not precompress.is_compressible("index.html.gz")
+
+    print("✅ Test deterministic output: SUCCESSO")
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per precompress.py")
+    print("-" * 50)
+
+    try:
+        test_precompress_public()
+        test_refresh_compressed()
+        test_deterministic_output()
+
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare la rimozione dei post draft di remove_drafts.py
+"""
+
+import os
+import shutil
+import tempfile
+
+import yaml
+
+import output_index
+import remove_drafts
+import site_gc
+from vault_catalog import VaultCatalog
+
+CONFIG = """baseurl: https://example.org/
+DefaultContentLanguage: it
+languages:
+    it:
+        contentDir: content/it
+    en:
+        contentDir: content/en
+"""
+
+def write(root, rel, text="x"):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def test_post_dir_language():
+    """Test: la lingua viene dal contentDir, non da una sottostringa del percorso"""
+    print("🧪 Test: Lingua della cartella dei post")
+    
+    languages = site_gc.site_languages(yaml.safe_load(CONFIG))
+    assert remove_drafts.post_dir_language("/Users/lorenzo/Documents/GitHub/LolloBlog/content/en/post", languages) == "en"
+    assert remove_drafts.post_dir_language("/Users/lorenzo/Documents/GitHub/LolloBlog/content/it/post/", languages) == "it"
+    # Lingua non configurata: nome della cartella di content
+    assert remove_drafts.post_dir_language("/srv/sito/content/fr/post", languages) == "fr"
+    
+    print("✅ Test post dir language: SUCCESSO")
+
+def test_remove_english_draft():
+    """Test: un draft inglese in un percorso con "GitHub" invalida solo gli output inglesi"""
+    print("🧪 Test: Rimozione di un draft inglese")
+    
+    test_dir = tempfile.mkdtemp()
+    originals = (remove_drafts.HUGO_POST_DIRS, output_index.HUGO_DIR, output_index.OUTPUT_INDEX_FILE, site_gc.HUGO_DIR)
+    try:
+        site = os.path.join(test_dir, "GitHub", "LolloBlog")
+        notes_dir = os.path.join(test_dir, "notes")
+        write(site, "hugo.yaml", CONFIG)
+        write(site, "content/it/post/Primo/index.md", "---\ntitle: Primo\n---\n")
+        write(site, "content/en/post/Primo/index.md", "---\ntitle: First\n---\n")
+        write(site, "public/post/primo/index.html")
+        write(site, "public/en/post/primo/index.html")
+        write(notes_dir, "Primo.md", "---\ntitle: First\nlang: en\ndraft: true\n---\n")
+        
+        remove_drafts.HUGO_POST_DIRS = [os.path.join(site, "content", "en", "post")]
+        output_index.HUGO_DIR = site_gc.HUGO_DIR = site
+        output_index.OUTPUT_INDEX_FILE = os.path.join(site, ".outputindex.json")
+        output_index.save_output_index(output_index.build_output_index(site))
+        
+        assert remove_drafts.remove_draft_posts(VaultCatalog(notes_dir, cache=None)) == 1
+        assert not os.path.exists(os.path.join(site, "content", "en", "post", "Primo"))
+        assert not os.path.exists(os.path.join(site, "public", "en", "post", "primo"))
+        # Il post italiano con lo stesso nome e i suoi output restano
+        assert os.path.exists(os.path.join(site, "public", "post", "primo", "index.html"))
+        assert sorted(output_index.load_output_index()["bundles"]) == ["content/it/post/Primo"]
+        
+        print("✅ Test remove english draft: SUCCESSO")
+    finally:
+        (remove_drafts.HUGO_POST_DIRS, output_index.HUGO_DIR, output_index.OUTPUT_INDEX_FILE, site_gc.HUGO_DIR) = originals
+        shutil.rmtree(test_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per remove_drafts.py")
+    print("-" * 50)
+    
+    try:
+        test_post_dir_language()
+        test_remove_english_draft()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
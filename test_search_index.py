@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare l'indice di ricerca compatto di search_index.py
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+import search_index
+
+CONFIG = """baseurl: https://example.org/
+DefaultContentLanguage: it
+languages:
+    it:
+        contentDir: content/it
+    en:
+        contentDir: content/en
+"""
+
+def write(root, rel, text="x"):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def read_tree(directory):
+    """Contenuto di tutti i file di una cartella: {percorso relativo: byte}."""
+    files = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                files[os.path.relpath(path, directory)] = f.read()
+    return files
+
+def make_site(root):
+    """Due post italiani (uno in draft escluso) e uno inglese."""
+    write(root, "hugo.yaml", CONFIG)
+    write(root, "content/it/post/Vim/index.md",
+          "---\ntitle: Configurare Vim\ndate: 2025-08-25\ntags: [Editor]\nimage: cover.png\n---\n"
+          "Vim è un editor. Perché usarlo? Vim in città.\n")
+    write(root, "content/it/post/Python/index.md",
+          "---\ntitle: Python\ndate: 2025-09-01\ndescription: Appunti su Python\n---\nUn editor per Python.\n")
+    write(root, "content/it/post/Bozza/index.md", "---\ntitle: Bozza\ndraft: true\n---\nVim\n")
+    write(root, "content/it/page/search/index.md", "---\ntitle: Cerca\n---\n")
+    write(root, "content/en/post/Vim/index.md", "---\ntitle: Vim setup\n---\nAn editor.\n")
+
+def test_tokenize():
+    """Test: parole in minuscolo, senza accenti, senza parole vuote e sintassi markdown"""
+    print("🧪 Test: Normalizzazione delle parole")
+
+    assert search_index.fold("Perché È così") == "perche e cosi"
+    assert search_index.tokenize("Perché l'Università è così? Il C++ e_mail 2024") == \
+        ["universita", "cosi", "mail", "2024"]
+    assert search_index.shard_key("universita") == "un"
+    assert search_index.shard_key("ñu") == "_"
+
+    text = search_index.plain_text(
+        "## Titolo\n```python\nprint()\n```\nVedi [la guida](https://example.org) e **Vim**.\n"
+        "![[foto.png]] ![alt](foto.png) {{< figure src=\"a.png\" >}} <b>HTML</b>"
+    )
+    assert text == "Titolo print() Vedi la guida e Vim. alt HTML"
+
+    print("✅ Test tokenize: SUCCESSO")
+
+def test_build_search_index():
+    """Test: un manifest e gli shard per lingua, solo per i post pubblicati"""
+    print("🧪 Test: Generazione dell'indice per lingua")
+
+    test_dir = tempfile.mkdtemp()
+    cache_file = os.path.join(test_dir, ".searchindex.json")
+    try:
+        make_site(test_dir)
+        write(test_dir, "public/page/search/index.json", json.dumps([
+            {"title": "Vim", "permalink": "https://example.org/post/vim/", "content": "x" * 4000},
+        ]))
+        # Shard di una build precedente
+        write(test_dir, "public/search-index/zz.json", "{}")
+
+        assert search_index.build_search_index(test_dir, cache_file=cache_file) == 3
+
+        output_dir = os.path.join(test_dir, "public", "search-index")
+        manifest = read_json(os.path.join(output_dir, "manifest.json"))
+        # Dal più vecchio, senza draft e pagine fuori da mainSections
+        assert [doc["title"] for doc in manifest["docs"]] == ["Configurare Vim", "Python"]
+        assert manifest["docs"][1]["summary"] == "Appunti su Python"
+        assert manifest["docs"][0]["url"] == "/post/vim/"
+        assert manifest["docs"][0]["image"] == "/post/vim/cover.png"
+        assert manifest["prefix"] == search_index.PREFIX_LENGTH
+        assert not os.path.exists(os.path.join(output_dir, "zz.json"))
+        assert sorted(os.listdir(output_dir)) == sorted(["manifest.json"] + [f"{key}.json" for key in manifest["shards"]])
+
+        # Peso: titolo + testo, tag + testo; parole senza accenti e senza parole vuote
+        assert read_json(os.path.join(output_dir, "vi.json"))["vim"] == [0, search_index.TITLE_WEIGHT + 2]
+        assert read_json(os.path.join(output_dir, "ed.json"))["editor"] == [0, 1 + search_index.TAG_WEIGHT, 1, 1]
+        assert read_json(os.path.join(output_dir, "ci.json")) == {"citta": [0, 1]}
+        assert not os.path.exists(os.path.join(output_dir, "pe.json"))
+        assert not os.path.exists(os.path.join(output_dir, "bo.json"))
+
+        en_manifest = read_json(os.path.join(test_dir, "public", "en", "search-index", "manifest.json"))
+        assert [doc["url"] for doc in en_manifest["docs"]] == ["/en/post/vim/"]
+
+        # Una seconda generazione non riscrive i file
+        mtime = os.path.getmtime(os.path.join(output_dir, "vi.json"))
+        os.utime(os.path.join(output_dir, "vi.json"), (mtime - 100, mtime - 100))
+        search_index.build_search_index(test_dir, cache_file=cache_file)
+        assert os.path.getmtime(os.path.join(output_dir, "vi.json")) == mtime - 100
+
+        print("✅ Test build search index: SUCCESSO")
+    finally:
+        shutil.rmtree(test_dir)
+
+def test_incremental_matches_full():
+    """Test: l'aggiornamento incrementale produce gli stessi byte della ricostruzione completa"""
+    print("🧪 Test: Indice incrementale identico a quello completo")
+
+    test_dir = tempfile.mkdtemp()
+    cache_file = os.path.join(test_dir, ".searchindex.json")
+    try:
+        make_site(test_dir)
+        search_index.build_search_index(test_dir, cache_file=cache_file)
+        public_dir = os.path.join(test_dir, "public")
+        untouched = os.path.join(public_dir, "en", "search-index", "se.json")
+        os.utime(untouched, (1, 1))
+
+        # Post modificato, post nuovo, post retrodatato (cambia gli id) e post rimosso
+        write(test_dir, "content/it/post/Vim/index.md",
+              "---\ntitle: Configurare Neovim\ndate: 2025-08-25\ntags: [Editor, Lua]\n---\nNeovim e plugin.\n")
+        write(test_dir, "content/it/post/Nuovo/index.md",
+              "---\ntitle: Nuovo post\ndate: 2025-10-01\n---\nAncora Python.\n")
+        write(test_dir, "content/it/post/Vecchio/index.md",
+              "---\ntitle: Vecchio post\ndate: 2024-01-01\n---\nUn editor del passato.\n")
+        shutil.rmtree(os.path.join(test_dir, "content", "it", "post", "Python"))
+
+        reads = []
+        original_read_document = search_index.read_document
+        original_write_index = search_index.write_index
+        search_index.read_document = lambda *args: reads.append(args[1]) or original_read_document(*args)
+        search_index.write_index = None
+        try:
+            assert search_index.build_search_index(test_dir, cache_file=cache_file) == 4
+        finally:
+            search_index.read_document = original_read_document
+            search_index.write_index = original_write_index
+        # Solo i post cambiati vengono riletti, nessuna ricostruzione completa
+        assert sorted(reads) == ["/post/nuovo/", "/post/vecchio/", "/post/vim/"]
+        assert os.path.getmtime(untouched) == 1
+        incremental = read_tree(public_dir)
+
+        search_index.build_search_index(test_dir, full=True, cache_file=cache_file)
+        assert read_tree(public_dir) == incremental
+        assert read_json(os.path.join(public_dir, "search-index", "py.json")) == {"python": [2, 1]}
+
+        # Senza manifest precedente si ricostruisce tutto
+        os.remove(os.path.join(public_dir, "search-index", "manifest.json"))
+        search_index.build_search_index(test_dir, cache_file=cache_file)
+        assert read_tree(public_dir) == incremental
+
+        print("✅ Test incremental matches full: SUCCESSO")
+    finally:
+        shutil.rmtree(test_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per search_index.py")
+    print("-" * 50)
+
+    try:
+        test_tokenize()
+        test_build_search_index()
+        test_incremental_matches_full()
+
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
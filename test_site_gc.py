@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare la pulizia degli output di Hugo di site_gc.py
+"""
+
+import os
+import shutil
+import tempfile
+
+import site_gc
+
+CONFIG = """baseurl: https://example.org/
+DefaultContentLanguage: it
+languages:
+    it:
+        contentDir: content/it
+    en:
+        contentDir: content/en
+"""
+
+def write(root, rel, text="x"):
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def make_site(root):
+    """Sito con un post per lingua e output vecchi in public/ e resources/_gen."""
+    write(root, "hugo.yaml", CONFIG)
+    write(root, "content/it/post/Il Mio Post/index.md", "---\ntitle: Post\ntags:\n- Python\n---\nTesto\n")
+    write(root, "content/it/post/Il Mio Post/foto.png")
+    write(root, "content/it/post/Bozza/index.md", "---\ntitle: Bozza\ndraft: true\n---\n")
+    write(root, "content/en/post/Hello/index.md", "---\ntitle: Hello\nslug: hello-world\n---\n")
+    write(root, "static/favicon.ico")
+
+    page = ('<img src="/post/il-mio-post/foto_hu_aaa.png" srcset="https://example.org/post/il-mio-post/foto_hu_bbb.png 2x">'
+            '<script src="/ts/main.' + "1" * 64 + '.js"></script>')
+    write(root, "public/index.html", page)
+    write(root, "public/favicon.ico")
+    write(root, "public/post/index.html")
+    write(root, "public/post/il-mio-post/index.html", page)
+    write(root, "public/post/il-mio-post/foto.png")
+    write(root, "public/post/il-mio-post/foto.png.gz")
+    write(root, "public/post/il-mio-post/foto_hu_aaa.png")
+    write(root, "public/post/il-mio-post/foto_hu_bbb.png")
+    write(root, "public/post/il-mio-post/foto_hu_old.png", "old")
+    write(root, "public/post/il-mio-post/rimossa.png", "rimossa")
+    write(root, "public/post/bozza/index.html", "bozza")
+    write(root, "public/posts/vecchio/index.html", "vecchio")
+    write(root, "public/page/2/index.html")
+    write(root, "public/tags/python/index.html")
+    write(root, "public/tags/vecchio-tag/index.xml", "tag")
+    write(root, "public/ts/main." + "1" * 64 + ".js")
+    write(root, "public/ts/main." + "2" * 64 + ".js", "js")
+    write(root, "public/ts/search.js")
+    write(root, "public/it/sitemap.xml")
+    write(root, "public/it/posts/vecchio/index.html", "it")
+    write(root, "public/en/index.html")
+    write(root, "public/en/post/hello-world/index.html")
+    write(root, "public/en/post/hello/index.html", "hello")
+    write(root, "resources/_gen/images/post/il-mio-post/foto_hu_aaa.png")
+    write(root, "resources/_gen/images/post/il-mio-post/foto_hu_old.png", "old")
+    write(root, "resources/_gen/images/posts/vecchio/foto_hu_aaa.png", "vecchio")
+
+def list_files(root):
+    return sorted(os.path.relpath(os.path.join(base, name), root)
+                  for base, _, files in os.walk(root) for name in files)
+
+def test_urlize():
+    """Test: slug come li genera Hugo"""
+    print("🧪 Test: urlize")
+    
+    assert site_gc.urlize("BlogPost - 20250703") == "blogpost---20250703"
+    assert site_gc.urlize("Perché C++?") == "perché-c++"
+    
+    print("✅ Test urlize: SUCCESSO")
+
+def test_sweep_outputs():
+    """Test: dry-run non cancella, lo sweep rimuove solo gli output non più generati"""
+    print("🧪 Test: Pulizia di public/ e resources/_gen")
+    
+    test_dir = tempfile.mkdtemp()
+    try:
+        make_site(test_dir)
+        before = list_files(test_dir)
+        
+        files, size = site_gc.sweep_outputs(test_dir, dry_run=True)
+        assert (files, size) == (10, 44)
+        assert list_files(test_dir) == before
+        
+        assert site_gc.sweep_outputs(test_dir) == (10, 44)
+        public = list_files(os.path.join(test_dir, "public"))
+        assert public == sorted([
+            "favicon.ico", "index.html", "page/2/index.html", "post/index.html",
+            "post/il-mio-post/index.html", "post/il-mio-post/foto.png", "post/il-mio-post/foto.png.gz",
+            "post/il-mio-post/foto_hu_aaa.png", "post/il-mio-post/foto_hu_bbb.png",
+            "tags/python/index.html", "ts/main." + "1" * 64 + ".js", "ts/search.js",
+            "it/sitemap.xml", "en/index.html", "en/post/hello-world/index.html",
+        ])
+        assert list_files(os.path.join(test_dir, "resources")) == ["_gen/images/post/il-mio-post/foto_hu_aaa.png"]
+        assert not os.path.exists(os.path.join(test_dir, "public", "posts"))
+        
+        # Con --buildDrafts la bozza resta
+        write(test_dir, "public/post/bozza/index.html", "bozza")
+        assert site_gc.sweep_outputs(test_dir, include_drafts=True) == (0, 0)
+        
+        print("✅ Test sweep outputs: SUCCESSO")
+    finally:
+        shutil.rmtree(test_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per site_gc.py")
+    print("-" * 50)
+    
+    try:
+        test_urlize()
+        test_sweep_outputs()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
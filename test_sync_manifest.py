@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare il manifest incrementale di sync_manifest.py
+"""
+
+import os
+import shutil
+import tempfile
+
+import sync_manifest
+from fileutils import file_digest
+
+def test_manifest_round_trip():
+    """Test salvataggio e caricamento del manifest"""
+    print("🧪 Test: Salvataggio e caricamento manifest")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        manifest_path = os.path.join(temp_dir, ".syncmanifest.json")
+        
+        # Un manifest mancante vale come vuoto
+        assert sync_manifest.load_manifest(manifest_path) == sync_manifest.empty_manifest()
+        
+        source = os.path.join(temp_dir, "Post.md")
+        bundle_dir = os.path.join(temp_dir, "it", "Post")
+        os.makedirs(bundle_dir)
+        target = os.path.join(bundle_dir, "index.md")
+        with open(source, "w", encoding="utf-8") as f:
+            f.write("---\ntitle: Post\n---\nCiao")
+        shutil.copy2(source, target)
+        
+        manifest = sync_manifest.empty_manifest()
+        sync_manifest.record_post(manifest, "Post.md", os.stat(source), file_digest(source), "it", target)
+        sync_manifest.save_manifest(manifest, manifest_path)
+        
+        loaded = sync_manifest.load_manifest(manifest_path)
+        assert loaded == manifest
+        assert loaded["posts"]["Post.md"]["language"] == "it"
+        
+        print("✅ Test manifest round trip: SUCCESSO")
+    finally:
+        shutil.rmtree(temp_dir)
+
+def test_change_detection():
+    """Test rilevamento modifiche della sorgente e della destinazione"""
+    print("🧪 Test: Rilevamento modifiche")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(temp_dir, "Post.md")
+        bundle_dir = os.path.join(temp_dir, "it", "Post")
+        os.makedirs(bundle_dir)
+        target = os.path.join(bundle_dir, "index.md")
+        with open(source, "w", encoding="utf-8") as f:
+            f.write("---\ntitle: Post\n---\nCiao")
+        shutil.copy2(source, target)
+        
+        manifest = sync_manifest.empty_manifest()
+        digest = file_digest(source)
+        sync_manifest.record_post(manifest, "Post.md", os.stat(source), digest, "it", target)
+        entry = manifest["posts"]["Post.md"]
+        
+        assert sync_manifest.source_unchanged(entry, os.stat(source))
+        assert sync_manifest.target_unchanged(entry)
+        
+        # Modifica della sorgente
+        with open(source, "a", encoding="utf-8") as f:
+            f.write(" mondo!")
+        assert not sync_manifest.source_unchanged(entry, os.stat(source))
+        
+        # Solo mtime cambiato sulla destinazione: l'hash coincide ancora
+        os.utime(target, ns=(0, 0))
+        assert not sync_manifest.target_unchanged(entry)
+        assert sync_manifest.target_matches_hash(entry)
+        
+        # Destinazione modificata dopo la copia (es. da images.py): firma aggiornata
+        with open(target, "a", encoding="utf-8") as f:
+            f.write("\n![img](img.png)")
+        assert not sync_manifest.target_unchanged(entry)
+        assert not sync_manifest.target_matches_hash(entry)
+        assert sync_manifest.refresh_targets(manifest, [target]) == 1
+        assert sync_manifest.target_unchanged(entry)
+        assert sync_manifest.target_matches_hash(entry)
+        
+        # Sorgente solo toccata: il bundle riscritto tiene il proprio hash
+        rewritten_hash = entry["target"]["hash"]
+        assert rewritten_hash != digest
+        os.utime(target, ns=(0, 0))
+        sync_manifest.record_post(manifest, "Post.md", os.stat(source), digest, "it", target, rewritten_hash)
+        entry = manifest["posts"]["Post.md"]
+        assert entry["target"]["hash"] == rewritten_hash
+        assert sync_manifest.target_unchanged(entry)
+        assert sync_manifest.target_matches_hash(entry)
+        
+        # Rimozione del bundle
+        assert sync_manifest.remove_target_bundle(entry)
+        assert not os.path.exists(bundle_dir)
+        
+        print("✅ Test change detection: SUCCESSO")
+    finally:
+        shutil.rmtree(temp_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per sync_manifest.py")
+    print("-" * 50)
+    
+    try:
+        test_manifest_round_trip()
+        test_change_detection()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare il catalogo condiviso di vault_catalog.py
+"""
+
+import os
+import shutil
+import tempfile
+
+from vault_catalog import VaultCatalog
+
+def write_post(path, front_matter, body="Contenuto del post"):
+    """Scrive un post markdown con il front matter indicato."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"---\n{front_matter}\n---\n{body}\n")
+
+def test_vault_records():
+    """Test record del vault: draft, lingua e immagini"""
+    print("🧪 Test: Record del vault")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        write_post(os.path.join(temp_dir, "Pubblicato.md"), "title: Pubblicato\nlanguage: en\nimage: Pasted image 1.png")
+        write_post(os.path.join(temp_dir, "Bozza.md"), "title: Bozza\ndraft: true")
+        
+        catalog = VaultCatalog(temp_dir)
+        
+        published = catalog.vault_post("Pubblicato")
+        assert published.draft == False
+        assert published.language == "en"
+        assert published.images == {"image": "Pasted image 1.png"}
+        assert [record.bundle_name for record in catalog.vault_drafts()] == ["Bozza"]
+        assert catalog.vault_post("Mancante") is None
+        
+        print("✅ Test vault records: SUCCESSO")
+    finally:
+        shutil.rmtree(temp_dir)
+
+def test_single_parse_across_stages():
+    """Test: copia e spostamento dei file non causano nuove analisi"""
+    print("🧪 Test: Un'unica analisi per nota")
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        vault_dir = os.path.join(temp_dir, "vault")
+        posts_dir = os.path.join(temp_dir, "posts")
+        os.makedirs(vault_dir)
+        os.makedirs(posts_dir)
+        write_post(os.path.join(vault_dir, "Post.md"), "title: Post\nlanguage: it")
+        
+        catalog = VaultCatalog(vault_dir)
+        catalog.vault_posts()
+        assert catalog.parsed_count == 1
+        
+        # Copia come rsync -a (mantiene mtime) e conversione in page bundle
+        shutil.copy2(os.path.join(vault_dir, "Post.md"), os.path.join(posts_dir, "Post.md"))
+        records = catalog.posts_in(posts_dir)
+        assert len(records) == 1 and not records[0].is_bundle
+        
+        os.makedirs(os.path.join(posts_dir, "Post"))
+        shutil.move(os.path.join(posts_dir, "Post.md"), os.path.join(posts_dir, "Post", "index.md"))
+        records = catalog.posts_in(posts_dir)
+        assert records[0].is_bundle
+        assert records[0].language == "it"
+        assert catalog.parsed_count == 1
+        
+        # Un file modificato viene invece rianalizzato
+        write_post(os.path.join(posts_dir, "Post", "index.md"), "title: Post\nlanguage: en", body="Nuovo contenuto")
+        assert catalog.posts_in(posts_dir)[0].language == "en"
+        assert catalog.parsed_count == 2
+        
+        print("✅ Test single parse: SUCCESSO")
+    finally:
+        shutil.rmtree(temp_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per vault_catalog.py")
+    print("-" * 50)
+    
+    try:
+        test_vault_records()
+        test_single_parse_across_stages()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
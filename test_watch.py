@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test script per verificare la modalità watch di watch.py
+"""
+
+import os
+import shutil
+import tempfile
+
+import image_cache
+import image_metadata
+import images
+import metadata_cache
+import multilingual_sync
+import sync_manifest
+import watch
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb" if isinstance(data, bytes) else "w") as f:
+        f.write(data)
+
+def test_debounce():
+    """Test: i salvataggi ravvicinati vengono raggruppati fino alla fine della finestra"""
+    print("🧪 Test: Debounce delle modifiche")
+    
+    test_dir = tempfile.mkdtemp()
+    try:
+        notes_dir = os.path.join(test_dir, "notes")
+        attachments_dir = os.path.join(test_dir, "allegati")
+        write(os.path.join(notes_dir, "Esistente.md"), "---\ntitle: A\n---\n")
+        os.makedirs(attachments_dir)
+        
+        now = [0.0]
+        watcher = watch.ChangeWatcher(notes_dir, attachments_dir, debounce=2.0, clock=lambda: now[0])
+        assert watcher.poll() is None
+        
+        write(os.path.join(notes_dir, "Nuova.md"), "---\ntitle: B\n---\n")
+        write(os.path.join(notes_dir, "appunti.txt"), "ignorato")
+        assert watcher.poll() is None
+        
+        now[0] = 1.0
+        write(os.path.join(notes_dir, "Esistente.md"), "---\ntitle: A modificato\n---\n")
+        write(os.path.join(attachments_dir, "sub", "foto.png"), b"png")
+        assert watcher.poll() is None
+        
+        now[0] = 2.5
+        assert watcher.poll() is None
+        
+        now[0] = 3.0
+        notes, attachments = watcher.poll()
+        assert [os.path.basename(path) for path in notes] == ["Esistente.md", "Nuova.md"]
+        assert attachments == [os.path.join(attachments_dir, "sub", "foto.png")]
+        
+        # Gruppo consegnato: nessuna nuova modifica, nessun nuovo gruppo
+        now[0] = 10.0
+        assert watcher.poll() is None
+        
+        os.remove(os.path.join(notes_dir, "Nuova.md"))
+        assert watcher.poll() is None
+        now[0] = 12.0
+        assert watcher.poll() == ([os.path.join(notes_dir, "Nuova.md")], [])
+        
+        print("✅ Test debounce: SUCCESSO")
+    finally:
+        shutil.rmtree(test_dir)
+
+def test_run_batch():
+    """Test: vengono rielaborati solo i bundle delle note e degli allegati toccati"""
+    print("🧪 Test: Stage eseguiti per un gruppo di modifiche")
+    
+    test_dir = tempfile.mkdtemp()
+    originals = (multilingual_sync.OBSIDIAN_POST_DIR, multilingual_sync.HUGO_IT_POST_DIR,
+                 multilingual_sync.HUGO_EN_POST_DIR, sync_manifest.SYNC_MANIFEST_FILE,
+                 metadata_cache._shared_cache, images.ATTACHMENTS_DIR, images.HUGO_POST_DIRS,
+                 image_cache.IMAGE_CACHE_FILE, image_metadata.IMAGE_METADATA_FILE)
+    try:
+        notes_dir = os.path.join(test_dir, "notes")
+        attachments_dir = os.path.join(test_dir, "allegati")
+        it_dir = os.path.join(test_dir, "content", "it", "post")
+        en_dir = os.path.join(test_dir, "content", "en", "post")
+        multilingual_sync.OBSIDIAN_POST_DIR = notes_dir
+        multilingual_sync.HUGO_IT_POST_DIR = it_dir
+        multilingual_sync.HUGO_EN_POST_DIR = en_dir
+        sync_manifest.SYNC_MANIFEST_FILE = os.path.join(test_dir, ".syncmanifest.json")
+        metadata_cache._shared_cache = metadata_cache.MetadataCache(os.path.join(test_dir, "cache.sqlite"))
+        images.ATTACHMENTS_DIR = attachments_dir
+        images.HUGO_POST_DIRS = [it_dir, en_dir]
+        image_cache.IMAGE_CACHE_FILE = os.path.join(test_dir, ".imagecache.json")
+        image_metadata.IMAGE_METADATA_FILE = os.path.join(test_dir, ".imagemeta.json")
+        
+        write(os.path.join(attachments_dir, "Foto uno.png"), b"uno")
+        write(os.path.join(attachments_dir, "due.png"), b"due")
+        write(os.path.join(notes_dir, "Primo.md"), "---\ntitle: Primo\nlang: it\n---\n![[Foto uno.png]]\n")
+        write(os.path.join(notes_dir, "Second.md"), "---\ntitle: Second\nlang: en\n---\n![[due.png]]\n")
+        
+        bundles = watch.run_batch([os.path.join(notes_dir, "Primo.md"), os.path.join(notes_dir, "Second.md")],
+                                  [], optimize=False)
+        assert bundles == {os.path.join(it_dir, "Primo"), os.path.join(en_dir, "Second")}
+        with open(os.path.join(it_dir, "Primo", "Foto-uno.png"), "rb") as f:
+            assert f.read() == b"uno"
+        
+        # Allegato modificato: solo il bundle che lo referenzia
+        write(os.path.join(attachments_dir, "Foto uno.png"), b"uno nuovo")
+        bundles = watch.run_batch([], [os.path.join(attachments_dir, "Foto uno.png")], optimize=False)
+        assert bundles == {os.path.join(it_dir, "Primo")}
+        with open(os.path.join(it_dir, "Primo", "Foto-uno.png"), "rb") as f:
+            assert f.read() == b"uno nuovo"
+        
+        # Nota eliminata: il bundle viene rimosso e non ci sono immagini da elaborare
+        os.remove(os.path.join(notes_dir, "Second.md"))
+        assert watch.run_batch([os.path.join(notes_dir, "Second.md")], [], optimize=False) == set()
+        assert not os.path.exists(os.path.join(en_dir, "Second"))
+        
+        print("✅ Test run batch: SUCCESSO")
+    finally:
+        if metadata_cache._shared_cache is not originals[4]:
+            metadata_cache._shared_cache.close()
+        (multilingual_sync.OBSIDIAN_POST_DIR, multilingual_sync.HUGO_IT_POST_DIR,
+         multilingual_sync.HUGO_EN_POST_DIR, sync_manifest.SYNC_MANIFEST_FILE,
+         metadata_cache._shared_cache, images.ATTACHMENTS_DIR, images.HUGO_POST_DIRS,
+         image_cache.IMAGE_CACHE_FILE, image_metadata.IMAGE_METADATA_FILE) = originals
+        shutil.rmtree(test_dir)
+
+def main():
+    """Esegui tutti i test"""
+    print("🔧 Avvio test per watch.py")
+    print("-" * 50)
+    
+    try:
+        test_debounce()
+        test_run_batch()
+        
+        print("-" * 50)
+        print("🎉 Tutti i test sono passati con successo!")
+        
+    except Exception as e:
+        print(f"❌ Test fallito: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
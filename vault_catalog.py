@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Catalogo in memoria dei post del vault Obsidian e dell'albero content/ di Hugo.
+Ogni nota viene letta e il suo front matter analizzato una sola volta per processo:
+gli script di sincronizzazione interrogano il catalogo invece di rileggere i file.
+"""
+
+import os
+
+import metadata_cache
+from fileutils import file_digest
+from frontmatter import load_front_matter
+
+# Percorsi
+OBSIDIAN_POST_DIR = "/Users/lorenzo/Library/Mobile Documents/iCloud~md~obsidian/Documents/Ken vault/08 - Blog/"
+
+# Campi del front matter che contengono immagini
+IMAGE_FIELDS = ("image", "cover")
+
+class PostRecord:
+    """Record compatto con i metadati di un post (nota .md o page bundle)."""
+
+    __slots__ = ("path", "bundle_name", "draft", "language", "images", "size", "mtime_ns", "_hash")
+
+    def __init__(self, path, bundle_name, draft, language, images, size, mtime_ns, hash=None):
+        self.path = path
+        self.bundle_name = bundle_name
+        self.draft = draft
+        self.language = language
+        self.images = images
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self._hash = hash
+
+    @property
+    def hash(self):
+        """Hash del contenuto, calcolato solo al primo accesso."""
+        if self._hash is None:
+            self._hash = file_digest(self.path)
+        return self._hash
+
+    @property
+    def is_bundle(self):
+        """True se il record punta all'index.md di un page bundle."""
+        return os.path.basename(self.path) == "index.md"
+
+    def __repr__(self):
+        return f"PostRecord({self.bundle_name!r}, draft={self.draft!r}, language={self.language!r})"
+
+def _make_record(path, bundle_name, st, front_matter, digest=None):
+    """Crea il record di un file a partire dal suo front matter."""
+    images = {field: front_matter[field] for field in IMAGE_FIELDS if front_matter.get(field)}
+    return PostRecord(
+        path=path,
+        bundle_name=bundle_name,
+        draft=bool(front_matter.get('draft', False)),
+        language=front_matter.get('language') or front_matter.get('lang'),
+        images=images,
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        hash=digest,
+    )
+
+class VaultCatalog:
+    """
+    Catalogo condiviso dei post.
+    I record sono indicizzati per (nome, dimensione, mtime): quando un file viene
+    copiato con rsync/copy2 o spostato con shutil.move mantiene la stessa firma,
+    quindi le nuove scansioni di content/ riusano il record già analizzato.
+    Con una MetadataCache il front matter dei file non modificati non viene
+    rianalizzato neanche tra un'esecuzione e l'altra.
+    """
+
+    def __init__(self, obsidian_dir=None, cache=None):
+        self.obsidian_dir = obsidian_dir or OBSIDIAN_POST_DIR
+        self.cache = cache
+        self._by_signature = {}
+        self._vault = None
+        self.parsed_count = 0
+
+    def record_for(self, path, bundle_name):
+        """Restituisce il record di un file, analizzandolo solo se non è già noto."""
+        st = os.stat(path)
+        key = (bundle_name, st.st_size, st.st_mtime_ns)
+        known = self._by_signature.get(key)
+        if known is not None:
+            if known.path == path:
+                return known
+            return PostRecord(path, bundle_name, known.draft, known.language,
+                              known.images, known.size, known.mtime_ns, known._hash)
+        entry = self.cache.get(path, st) if self.cache is not None else None
+        if entry is not None:
+            record = _make_record(path, bundle_name, st, entry["front_matter"], entry["hash"])
+        else:
+            # Legge solo il blocco di front matter, non l'intera nota
+            front_matter = load_front_matter(path)
+            self.parsed_count += 1
+            if self.cache is not None:
+                self.cache.put(path, st, front_matter)
+            record = _make_record(path, bundle_name, st, front_matter)
+        self._by_signature[key] = record
+        return record
+
+    def vault_posts(self):
+        """Restituisce i record delle note nel vault Obsidian (scansionato una volta)."""
+        if self._vault is None:
+            self._vault = {}
+            if os.path.exists(self.obsidian_dir):
+                for filename in sorted(os.listdir(self.obsidian_dir)):
+                    if not filename.endswith(".md"):
+                        continue
+                    path = os.path.join(self.obsidian_dir, filename)
+                    try:
+                        self._vault[filename[:-3]] = self.record_for(path, filename[:-3])
+                    except Exception as e:
+                        print(f"❌ Error reading {filename}: {e}")
+        return list(self._vault.values())
+
+    def vault_post(self, bundle_name):
+        """Restituisce il record della nota Obsidian con questo nome, o None."""
+        self.vault_posts()
+        return self._vault.get(bundle_name)
+
+    def vault_drafts(self):
+        """Restituisce i record delle note del vault marcate come draft."""
+        return [record for record in self.vault_posts() if record.draft]
+
+    def posts_in(self, directory):
+        """
+        Elenca i post presenti in una cartella di content/: file .md singoli
+        e page bundle con index.md. La cartella viene solo elencata, i file
+        già noti al catalogo non vengono riletti.
+        """
+        records = []
+        if not os.path.exists(directory):
+            return records
+        for item in sorted(os.listdir(directory)):
+            if item.startswith('.'):
+                continue
+            item_path = os.path.join(directory, item)
+            if item.endswith(".md") and os.path.isfile(item_path):
+                path, bundle_name = item_path, item[:-3]
+            elif os.path.isdir(item_path) and os.path.exists(os.path.join(item_path, "index.md")):
+                path, bundle_name = os.path.join(item_path, "index.md"), item
+            else:
+                continue
+            try:
+                records.append(self.record_for(path, bundle_name))
+            except Exception as e:
+                print(f"❌ Error reading {path}: {e}")
+        return records
+
+# Catalogo condiviso dagli stage eseguiti nello stesso processo
+_shared_catalog = None
+
+def get_catalog():
+    """Restituisce il catalogo condiviso, creandolo al primo utilizzo."""
+    global _shared_catalog
+    if _shared_catalog is None:
+        _shared_catalog = VaultCatalog(cache=metadata_cache.get_cache())
+    return _shared_catalog
+
+def reset_catalog():
+    """Scarta il catalogo condiviso (utile nei test o dopo modifiche esterne)."""
+    global _shared_catalog
+    _shared_catalog = None
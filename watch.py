@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Modalità watch: sincronizza le note mentre vengono salvate.
+
+Controlla periodicamente (polling, senza dipendenze esterne) la cartella dei
+post di Obsidian e quella degli allegati. I salvataggi ravvicinati vengono
+raggruppati: un gruppo di modifiche viene elaborato solo quando non arrivano
+altre modifiche per la finestra di debounce. Per ogni gruppo:
+- se sono cambiate note, la sincronizzazione diretta nei bundle (solo le note
+  cambiate vengono riscritte grazie al manifest);
+- l'elaborazione delle immagini solo per i bundle delle note toccate e per
+  quelli che referenziano gli allegati cambiati.
+"""
+
+import argparse
+import os
+import time
+
+import images
+import metadata_cache
+import multilingual_sync
+import sync_manifest
+import vault_catalog
+from embeds import bundle_name as bundle_file_name
+
+# Intervallo di polling e finestra di debounce (secondi)
+POLL_INTERVAL = 1.0
+DEBOUNCE_SECONDS = 2.0
+
+def snapshot(directory, recursive=False, suffix=None):
+    """
+    Firma (dimensione, mtime) dei file di una cartella, esclusi quelli nascosti.
+    Restituisce {} se la cartella non esiste.
+    """
+    files = {}
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append(entry.path)
+                    elif suffix is None or entry.name.endswith(suffix):
+                        try:
+                            st = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        files[entry.path] = (st.st_size, st.st_mtime_ns)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return files
+
+def changed_paths(old, new):
+    """Percorsi aggiunti, modificati o rimossi tra due snapshot."""
+    return {path for path in old.keys() | new.keys() if old.get(path) != new.get(path)}
+
+class ChangeWatcher:
+    """
+    Raccoglie le modifiche alle note e agli allegati e le restituisce a gruppi,
+    quando non ne arrivano altre per 'debounce' secondi.
+    """
+
+    def __init__(self, notes_dir, attachments_dir, debounce=DEBOUNCE_SECONDS, clock=time.monotonic):
+        self.notes_dir = notes_dir
+        self.attachments_dir = attachments_dir
+        self.debounce = debounce
+        self.clock = clock
+        self.notes = snapshot(notes_dir, suffix=".md")
+        self.attachments = snapshot(attachments_dir, recursive=True)
+        self.pending_notes = set()
+        self.pending_attachments = set()
+        self.last_change = None
+
+    def poll(self):
+        """
+        Confronta le cartelle con l'ultimo snapshot. Restituisce (note, allegati)
+        cambiati quando il gruppo è stabile, altrimenti None.
+        """
+        notes = snapshot(self.notes_dir, suffix=".md")
+        attachments = snapshot(self.attachments_dir, recursive=True)
+        changed_notes = changed_paths(self.notes, notes)
+        changed_attachments = changed_paths(self.attachments, attachments)
+        self.notes, self.attachments = notes, attachments
+
+        now = self.clock()
+        if changed_notes or changed_attachments:
+            self.pending_notes |= changed_notes
+            self.pending_attachments |= changed_attachments
+            self.last_change = now
+            return None
+        if self.last_change is None or now - self.last_change < self.debounce:
+            return None
+
+        batch = (sorted(self.pending_notes), sorted(self.pending_attachments))
+        self.pending_notes, self.pending_attachments = set(), set()
+        self.last_change = None
+        return batch
+
+def bundles_for_notes(notes, manifest):
+    """Bundle pubblicati per le note indicate, secondo il manifest della sincronizzazione."""
+    bundles = set()
+    for path in notes:
+        entry = manifest["posts"].get(os.path.basename(path))
+        if entry and os.path.exists(entry["target"]["path"]):
+            bundles.add(os.path.dirname(entry["target"]["path"]))
+    return bundles
+
+def bundles_for_attachments(attachments, post_dirs):
+    """Bundle il cui index.md cita uno degli allegati (con il nome originale o quello nel bundle)."""
+    names = set()
+    for path in attachments:
+        name = os.path.basename(path)
+        names.update((name, bundle_file_name(name)))
+    bundles = set()
+    if not names:
+        return bundles
+    for post_dir in post_dirs:
+        if not os.path.isdir(post_dir):
+            continue
+        for item in sorted(os.listdir(post_dir)):
+            markdown_file = os.path.join(post_dir, item, "index.md")
+            if item.startswith(".") or not os.path.isfile(markdown_file):
+                continue
+            with open(markdown_file, "r", encoding="utf-8") as f:
+                content = f.read()
+            if any(name in content for name in names):
+                bundles.add(os.path.dirname(markdown_file))
+    return bundles
+
+def run_batch(notes, attachments, workers=1, optimize=True):
+    """
+    Esegue gli stage necessari per un gruppo di modifiche.
+    Restituisce l'insieme dei bundle rielaborati.
+    """
+    if notes:
+        print(f"📝 {len(notes)} note(s) changed: " + ", ".join(os.path.basename(path) for path in notes))
+        # Catalogo nuovo a ogni gruppo: i draft riflettono le note appena salvate
+        catalog = vault_catalog.VaultCatalog(obsidian_dir=multilingual_sync.OBSIDIAN_POST_DIR,
+                                             cache=metadata_cache.get_cache())
+        if not multilingual_sync.sync_posts(catalog=catalog):
+            return set()
+    if attachments:
+        print(f"📎 {len(attachments)} attachment(s) changed")
+
+    bundles = bundles_for_notes(notes, sync_manifest.load_manifest())
+    bundles |= bundles_for_attachments(attachments, images.HUGO_POST_DIRS)
+    if bundles:
+        catalog = vault_catalog.VaultCatalog(obsidian_dir=multilingual_sync.OBSIDIAN_POST_DIR,
+                                             cache=metadata_cache.get_cache())
+        images.process_multilingual_posts(catalog, workers=workers, optimize=optimize, bundles=bundles)
+    else:
+        print("ℹ️  No published bundle affected")
+    return bundles
+
+def watch(interval=POLL_INTERVAL, debounce=DEBOUNCE_SECONDS, workers=1, optimize=True):
+    """Ciclo principale: attende le modifiche ed elabora un gruppo alla volta fino a Ctrl+C."""
+    watcher = ChangeWatcher(multilingual_sync.OBSIDIAN_POST_DIR, images.ATTACHMENTS_DIR, debounce)
+    print(f"👀 Watching {multilingual_sync.OBSIDIAN_POST_DIR} and {images.ATTACHMENTS_DIR} "
+          f"(poll {interval:g}s, debounce {debounce:g}s). Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(interval)
+            batch = watcher.poll()
+            if batch is None:
+                continue
+            start = time.perf_counter()
+            bundles = run_batch(*batch, workers=workers, optimize=optimize)
+            print(f"✅ Updated {len(bundles)} bundle(s) in {time.perf_counter() - start:.2f}s\n")
+    except KeyboardInterrupt:
+        print("\n👋 Watch stopped.")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description='Sincronizza le note e le immagini mentre vengono salvate')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help='Secondi tra due controlli delle cartelle')
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS,
+                        help='Secondi senza nuove modifiche prima di elaborare un gruppo')
+    parser.add_argument('--workers', type=int, default=1, help='Thread per elaborare i bundle (default: 1, seriale)')
+    parser.add_argument('--no-optimize', action='store_true', help='Non ottimizzare le PNG')
+    args = parser.parse_args()
+
+    return watch(args.interval, args.debounce, args.workers, optimize=not args.no_optimize)
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)